@@ -8,6 +8,71 @@ import random
 import math
 import os
 import json
+import zlib
+
+from texture_cache import shared_texture_cache
+from disk_texture_cache import DiskTextureStore, source_hash
+from perf_stats import shared_perf_stats
+
+
+# Richtungs-Mapping für Flüsse (inkl. Diagonale!)
+WATER_DIRECTIONS = {
+    "right": (1, 0),
+    "left": (-1, 0),
+    "down": (0, 1),
+    "up": (0, -1),
+    "down-right": (1, 1),
+    "down-left": (-1, 1),
+    "up-right": (1, -1),
+    "up-left": (-1, -1)
+}
+
+
+# Version der prozeduralen Generatoren für den Disk-Cache
+GENERATOR_VERSION = source_hash(__file__)
+
+# Basis-Auflösung der Mip-Pyramide (größte Tile-Größe im Projektor)
+MIP_BASE_SIZE = 64
+
+
+def texture_seed(material_id, size, variant=0):
+    """
+    Stabiler Seed aus (Material, Größe, Variante)
+    crc32 statt hash(): gleich in jedem Prozess und jedem Lauf
+    """
+    return zlib.crc32(f"{material_id}:{size}:{variant}".encode("utf-8"))
+
+
+def texture_rngs(material_id, size, variant=0):
+    """
+    Lokale Zufallsgeneratoren eines Generator-Aufrufs: (random.Random, np.random.Generator)
+    Kein globaler Zustand -> sicher in Threads und Prozessen
+    """
+    seed = texture_seed(material_id, size, variant)
+    return random.Random(seed), np.random.default_rng(seed)
+
+
+def _varied_layer(rng, shape, base, low, high, spread, pattern=None):
+    """
+    Basis-Schicht als Array: Grundfarbe + gleichverteilte Variation (-spread..spread),
+    optional plus festes Muster, pro Kanal geklemmt - ersetzt die draw.point-Schleifen
+    spread 0: kein Rauschen ziehen (nur Muster)
+    """
+    if spread:
+        variation = rng.integers(-spread, spread + 1, size=shape)
+        if pattern is not None:
+            variation = variation + pattern
+    elif pattern is not None:
+        variation = pattern
+    else:
+        variation = np.zeros(shape, dtype=np.int64)
+    channels = [np.clip(b + variation, lo, hi) for b, lo, hi in zip(base, low, high)]
+    return np.stack(channels, axis=-1).astype(np.uint8)
+
+
+def _blocks_to_pixels(layer, size, block=2):
+    """Block-Schicht (eine Farbe pro block x block Pixel) auf Pixel-Auflösung bringen"""
+    return layer.repeat(block, axis=0).repeat(block, axis=1)[:size, :size]
 
 
 class AdvancedTextureRenderer:
@@ -17,11 +82,19 @@ class AdvancedTextureRenderer:
     """
     
     def __init__(self):
-        self.texture_cache = {}
+        # Gemeinsamer LRU-Cache mit Speicher-Budget (siehe texture_cache.py)
+        self.texture_cache = shared_texture_cache.namespace("advanced")
         self.animation_frames = {}
         self.custom_textures = {}
         self.animation_time = 0
         
+        # Persistenter Disk-Cache - Version = Hash dieses Quellcodes,
+        # jede Änderung an den Generatoren macht alte Einträge ungültig
+        self.disk_cache = DiskTextureStore(GENERATOR_VERSION)
+        
+        # Wasser-Kernel: "numpy" (vektorisiert) oder "python" (alter Pixel-Loop zum Vergleich)
+        self.water_kernel = "numpy"
+        
         # Basis-Materialien mit professionellen Farben
         self.base_materials = {
             "grass": {
@@ -214,33 +287,112 @@ class AdvancedTextureRenderer:
                 return self.load_and_scale_texture(material["texture_path"], size)
         
         # Animierte Texturen (prozedural)
-        # Water mit Richtung hat separaten Cache
-        if material_id == "water":
-            cache_key = f"{material_id}_{size}_{animation_frame}_{river_direction}"
-        elif material and material.get("animated", False):
-            cache_key = f"{material_id}_{size}_{animation_frame}"
-        else:
-            cache_key = f"{material_id}_{size}"
+        cache_key = self.texture_cache_key(material_id, size, animation_frame, river_direction)
         
         # Cache-Check (auch für animierte Texturen - Performance!)
-        if cache_key in self.texture_cache:
-            return self.texture_cache[cache_key]
-        
-        # Generiere neue Textur (mit river_direction für water)
-        texture = self.generate_professional_texture(material_id, size, animation_frame, river_direction)
+        texture = self.texture_cache.get(cache_key)
+        if texture is not None:
+            return texture
         
-        # Cache-Management: Begrenze Cache-Größe (max 200 Einträge)
-        if len(self.texture_cache) > 200:
-            # Entferne älteste Einträge (FIFO)
-            keys_to_remove = list(self.texture_cache.keys())[:50]
-            for key in keys_to_remove:
-                del self.texture_cache[key]
+        # Disk-Cache oder neu generieren (mit river_direction für water)
+        texture = self.render_texture(material_id, size, animation_frame, river_direction)
         
-        # Textur cachen (auch animierte für bessere Performance!)
+        # Textur cachen - LRU-Verdrängung nach Speicher-Budget übernimmt der Cache
         self.texture_cache[cache_key] = texture
         
         return texture
     
+    def texture_cache_key(self, material_id, size, animation_frame=0, river_direction="right"):
+        """Schlüssel im Speicher-Cache - Water mit Richtung hat separaten Cache"""
+        material = self.custom_textures.get(material_id) or self.base_materials.get(material_id)
+        if material_id == "water":
+            return f"{material_id}_{size}_{animation_frame}_{river_direction}"
+        if material and material.get("animated", False):
+            return f"{material_id}_{size}_{animation_frame}"
+        return f"{material_id}_{size}"
+    
+    def render_texture(self, material_id, size, animation_frame=0, river_direction="right"):
+        """
+        Textur ohne Speicher-Cache: erst Disk-Cache, sonst generieren und auf Disk ablegen
+        Nur Basis-Materialien werden persistiert (Custom-Materialien hängen von custom_materials.json ab)
+        """
+        if material_id not in self.base_materials or material_id in self.custom_textures:
+            return self.generate_professional_texture(material_id, size, animation_frame, river_direction)
+        
+        frame, direction = self.disk_cache_key(material_id, animation_frame, river_direction)
+        
+        texture = self.disk_cache.load(material_id, size, frame, direction)
+        if texture is None:
+            texture = self.generate_professional_texture(material_id, size, animation_frame, river_direction)
+            self.disk_cache.save(material_id, size, frame, direction, texture)
+        
+        return texture
+    
+    def disk_cache_key(self, material_id, animation_frame, river_direction):
+        """(frame, direction) wie im Speicher-Cache: statische Materialien ignorieren beides"""
+        if material_id == "water":
+            return animation_frame, river_direction
+        if self.base_materials.get(material_id, {}).get("animated", False):
+            return animation_frame, "-"
+        return 0, "-"
+    
+    def preload_disk_cache(self, size):
+        """
+        Bulk-Load aller statischen Tiles (Frame 0) einer Größe in den Speicher-Cache
+        Aufruf beim Start des Projektors - ersetzt die Generierung durch einen Disk-Read
+        """
+        loaded = 0
+        for (material_id, direction), texture in self.disk_cache.load_size(size, 0).items():
+            if material_id not in self.base_materials or material_id in self.custom_textures:
+                continue
+            
+            cache_key = self.texture_cache_key(material_id, size, 0, direction)
+            if cache_key not in self.texture_cache:
+                self.texture_cache[cache_key] = texture
+                loaded += 1
+        
+        return loaded
+    
+    def get_mip_level(self, material_id, level_size, animation_frame=0, river_direction="right"):
+        """
+        Eine Stufe der Mip-Pyramide (MIP_BASE_SIZE, /2, /4, ...)
+        Nur die Basis wird gerendert, kleinere Stufen entstehen durch Halbierung
+        """
+        cache_key = f"{material_id}_mip{level_size}_{animation_frame}_{river_direction}"
+        texture = self.texture_cache.get(cache_key)
+        if texture is not None:
+            return texture
+        
+        if level_size >= MIP_BASE_SIZE:
+            texture = self.get_texture(material_id, MIP_BASE_SIZE, animation_frame, river_direction)
+        else:
+            texture = self.get_mip_level(material_id, level_size * 2, animation_frame, river_direction).reduce(2)
+        
+        self.texture_cache[cache_key] = texture
+        return texture
+    
+    def get_scaled_texture(self, material_id, size, animation_frame=0, river_direction="right"):
+        """
+        Schnelle Textur für beliebige Größen (Zoom-Vorschau)
+        Skaliert die nächstgrößere Mip-Stufe statt die Textur neu zu generieren
+        """
+        level_size = MIP_BASE_SIZE
+        while level_size // 2 >= size and level_size > 1:
+            level_size //= 2
+        
+        texture = self.get_mip_level(material_id, level_size, animation_frame, river_direction)
+        if level_size == size:
+            return texture
+        
+        cache_key = f"{material_id}_scaled{size}_{animation_frame}_{river_direction}"
+        scaled = self.texture_cache.get(cache_key)
+        if scaled is None:
+            # Village ist 3x so groß -> Faktor statt fester Zielgröße
+            scaled = texture.resize((texture.width * size // level_size, texture.height * size // level_size),
+                                    Image.BILINEAR)
+            self.texture_cache[cache_key] = scaled
+        return scaled
+    
     def load_and_scale_texture(self, image_path, size):
         """Lädt und skaliert eine importierte Textur"""
         try:
@@ -270,53 +422,47 @@ class AdvancedTextureRenderer:
             "dirt": self.render_dirt
         }
         
-        if material_id in generators:
-            return generators[material_id](size, animation_frame)
-        
-        # Fallback für custom materials
-        material = self.custom_textures.get(material_id)
-        if material:
-            return self.render_custom_material(material, size, animation_frame)
+        with shared_perf_stats.time("texture_generation"):
+            if material_id in generators:
+                return generators[material_id](size, animation_frame)
+            
+            # Fallback für custom materials
+            material = self.custom_textures.get(material_id)
+            if material:
+                return self.render_custom_material(material, size, animation_frame)
         
         # Default
         return Image.new('RGB', (size, size), (128, 128, 128))
     
     def render_grass(self, size, frame):
         """Professionelles Gras mit organischer Struktur und Wind-Animation"""
-        img = Image.new('RGB', (size, size), (126, 179, 86))
+        # Organische Basis-Variation in 2x2-Blöcken (vektorisiert)
+        rnd, rng = texture_rngs("grass", size)
+        coords = np.arange(0, size, 2)
+        ys, xs = np.meshgrid(coords, coords, indexing='ij')
+        # Perlin-ähnliche Variation
+        noise = np.trunc(np.sin(xs * 0.1) * np.cos(ys * 0.1) * 10).astype(int)
+        
+        layer = _varied_layer(rng, noise.shape, (126, 179, 86), (110, 165, 75), (140, 190, 95), 5, noise)
+        img = Image.fromarray(_blocks_to_pixels(layer, size))
         draw = ImageDraw.Draw(img)
         
-        # Organische Basis-Variation
-        random.seed(size * 1000)
-        for y in range(0, size, 2):
-            for x in range(0, size, 2):
-                # Perlin-ähnliche Variation
-                noise = math.sin(x * 0.1) * math.cos(y * 0.1) * 10
-                variation = int(noise) + random.randint(-5, 5)
-                
-                color = (
-                    max(110, min(140, 126 + variation)),
-                    max(165, min(190, 179 + variation)),
-                    max(75, min(95, 86 + variation))
-                )
-                draw.rectangle([(x, y), (x+2, y+2)], fill=color)
-        
         # Grasbüschel mit Textur
         for _ in range(size // 6):
-            x = random.randint(0, size-4)
-            y = random.randint(0, size-4)
+            x = rnd.randint(0, size-4)
+            y = rnd.randint(0, size-4)
             
             # Organische Büschel-Form
             grass_color = (
-                random.randint(100, 120),
-                random.randint(150, 170),
-                random.randint(70, 90)
+                rnd.randint(100, 120),
+                rnd.randint(150, 170),
+                rnd.randint(70, 90)
             )
             
             # Mehrere überlappende Striche für Grasbüschel
             for i in range(3):
-                offset_x = random.randint(-1, 1)
-                offset_y = random.randint(-2, 0)
+                offset_x = rnd.randint(-1, 1)
+                offset_y = rnd.randint(-2, 0)
                 draw.line(
                     [(x + offset_x, y), (x + offset_x, y + offset_y + 3)],
                     fill=grass_color,
@@ -325,12 +471,10 @@ class AdvancedTextureRenderer:
         
         # Highlights für Tiefe
         for _ in range(size // 10):
-            x = random.randint(0, size-1)
-            y = random.randint(0, size-1)
+            x = rnd.randint(0, size-1)
+            y = rnd.randint(0, size-1)
             draw.point((x, y), fill=(150, 200, 110))
         
-        random.seed()
-        
         # Professioneller Smooth-Effekt
         img = img.filter(ImageFilter.SMOOTH_MORE)
         
@@ -345,6 +489,97 @@ class AdvancedTextureRenderer:
         Professioneller animierter Fluss mit Richtung
         direction: "right", "left", "up", "down", "down-right", "down-left", "up-right", "up-left"
         PERFEKT nahtlose Tiles - keine sichtbaren Ränder!
+        Kernel wählbar über self.water_kernel ("numpy" oder "python")
+        """
+        if self.water_kernel == "python":
+            return self.render_water_python(size, frame, direction)
+        return self.render_water_numpy(size, frame, direction)
+    
+    def render_water_frames(self, size, frames, direction="right"):
+        """
+        Rendert mehrere Wasser-Frames auf einmal (ein Array-Durchlauf für alle Frames)
+        Gibt eine Liste von PIL Images in der Reihenfolge von frames zurück
+        """
+        frames = list(frames)
+        if self.water_kernel == "python":
+            return [self.render_water_python(size, f, direction) for f in frames]
+        
+        pixels = self._water_pixels(size, np.asarray(frames, dtype=np.float64), direction)
+        return [Image.fromarray(pixels[i], 'RGB') for i in range(len(frames))]
+    
+    def render_water_numpy(self, size, frame, direction="right"):
+        """
+        NumPy-Kernel für render_water: berechnet das komplette Wellenfeld als Array
+        Pixel-identisch zum Python-Kernel (render_water_python)
+        """
+        pixels = self._water_pixels(size, np.array([frame], dtype=np.float64), direction)
+        return Image.fromarray(pixels[0], 'RGB')
+    
+    def _water_pixels(self, size, frames, direction):
+        """Berechnet (frames, size, size, 3) uint8 Pixel für Wasser-Tiles"""
+        WATER_BASE = (65, 155, 230)
+        dx, dy = WATER_DIRECTIONS.get(direction, (1, 0))
+        wave_freq = (2.0 * math.pi) / size
+        
+        # Achsen: frame (F,1,1), y (1,H,1), x (1,1,W)
+        flow_speed = (frames * 0.4)[:, None, None]
+        ys = np.arange(size, dtype=np.float64)[None, :, None]
+        xs = np.arange(size, dtype=np.float64)[None, None, :]
+        
+        pos_x = xs + flow_speed * dx
+        pos_y = ys + flow_speed * dy
+        
+        # Hauptwelle in Flussrichtung (gleiche Gewichtung wie Python-Kernel)
+        if dx != 0 and dy != 0:
+            main_wave_pos = (pos_x + pos_y) * 0.707
+        elif dx != 0:
+            main_wave_pos = pos_x
+        else:
+            main_wave_pos = pos_y
+        
+        wave1 = np.sin(main_wave_pos * wave_freq * 2.5) * 8
+        wave2 = np.sin(main_wave_pos * wave_freq * 3.7 + (xs + ys) * 0.03) * 5
+        cross_wave = np.sin(xs * wave_freq * 4.2) * 2
+        cross_wave = cross_wave + np.sin(ys * wave_freq * 4.2) * 2
+        
+        # int() schneidet Richtung 0 ab, // rundet wie in Python nach unten
+        brightness = np.trunc(wave1 + wave2 + cross_wave).astype(np.int32)
+        
+        pixels = np.empty(brightness.shape + (3,), dtype=np.int32)
+        pixels[..., 0] = np.clip(WATER_BASE[0] + brightness // 3, 50, 80)
+        pixels[..., 1] = np.clip(WATER_BASE[1] + brightness // 2, 135, 170)
+        pixels[..., 2] = np.clip(WATER_BASE[2] + brightness // 3, 205, 235)
+        
+        # Glanzlichter - gleiche deterministische Positionen wie im Python-Kernel
+        num_highlights = max(3, size // 12)
+        offsets = np.arange(-1, 2)
+        dist = np.sqrt(offsets[:, None] ** 2 + offsets[None, :] ** 2)
+        fade = np.maximum(0, 1 - dist / 1.5)
+        
+        for index, frame in enumerate(frames):
+            frame_flow = frame * 0.4
+            for i in range(num_highlights):
+                angle = (i * 2.4 + frame * 0.02) % (2 * math.pi)
+                radius = (size * 0.3) + (i % 3) * 5
+                center_x = size / 2 + math.cos(angle) * radius
+                center_y = size / 2 + math.sin(angle) * radius
+                x = int((center_x + frame_flow * dx * 0.3) % size)
+                y = int((center_y + frame_flow * dy * 0.3) % size)
+                
+                if 2 <= x < size - 2 and 2 <= y < size - 2:
+                    local_intensity = ((20 + i * 3) * fade).astype(np.int32)
+                    patch = pixels[index, y - 1:y + 2, x - 1:x + 2]
+                    patch[..., 0] = np.minimum(255, patch[..., 0] + local_intensity)
+                    patch[..., 1] = np.minimum(255, patch[..., 1] + local_intensity)
+                    patch[..., 2] = np.minimum(255, patch[..., 2] + local_intensity // 2)
+        
+        return pixels.astype(np.uint8)
+    
+    def render_water_python(self, size, frame, direction="right"):
+        """
+        Ursprünglicher Pixel-für-Pixel Wasser-Kernel (zum Vergleich mit render_water_numpy)
+        direction: "right", "left", "up", "down", "down-right", "down-left", "up-right", "up-left"
+        PERFEKT nahtlose Tiles - keine sichtbaren Ränder!
         """
         WATER_BASE = (65, 155, 230)  # Klares helles Blau
         img = Image.new('RGB', (size, size), WATER_BASE)
@@ -451,58 +686,48 @@ class AdvancedTextureRenderer:
     
     def render_mountain(self, size, frame):
         """Professioneller Fels mit realistischer Struktur"""
-        img = Image.new('RGB', (size, size), (139, 125, 107))
-        draw = ImageDraw.Draw(img)
+        # Fels-Grundstruktur mit Perlin-ähnlichem Noise (vektorisiert)
+        rnd, rng = texture_rngs("mountain", size)
+        ys, xs = np.mgrid[0:size, 0:size]
+        # Komplexes Noise-Pattern
+        noise = (
+            np.sin(xs * 0.15) * np.cos(ys * 0.15) * 15 +
+            np.sin(xs * 0.3 + ys * 0.2) * 8
+        )
+        noise = np.trunc(noise + rng.integers(-5, 6, size=noise.shape)).astype(int)
         
-        # Fels-Grundstruktur mit Perlin-ähnlichem Noise
-        random.seed(size * 2000)
-        for y in range(size):
-            for x in range(size):
-                # Komplexes Noise-Pattern
-                noise = (
-                    math.sin(x * 0.15) * math.cos(y * 0.15) * 15 +
-                    math.sin(x * 0.3 + y * 0.2) * 8
-                )
-                noise += random.randint(-5, 5)
-                
-                brightness = int(noise)
-                color = (
-                    max(100, min(160, 139 + brightness)),
-                    max(90, min(145, 125 + brightness)),
-                    max(80, min(125, 107 + brightness))
-                )
-                draw.point((x, y), fill=color)
+        layer = _varied_layer(rng, noise.shape, (139, 125, 107), (100, 90, 80), (160, 145, 125), 0, noise)
+        img = Image.fromarray(layer)
+        draw = ImageDraw.Draw(img)
         
         # Felsrisse und Spalten
         for _ in range(size // 8):
-            start_x = random.randint(0, size-1)
-            start_y = random.randint(0, size-1)
+            start_x = rnd.randint(0, size-1)
+            start_y = rnd.randint(0, size-1)
             
             # Organischer Riss
             current_x, current_y = start_x, start_y
-            for step in range(random.randint(5, 15)):
-                next_x = current_x + random.randint(-2, 2)
-                next_y = current_y + random.randint(-1, 2)
+            for step in range(rnd.randint(5, 15)):
+                next_x = current_x + rnd.randint(-2, 2)
+                next_y = current_y + rnd.randint(-1, 2)
                 
                 if 0 <= next_x < size and 0 <= next_y < size:
                     draw.line(
                         [(current_x, current_y), (next_x, next_y)],
                         fill=(90, 80, 65),
-                        width=random.randint(1, 2)
+                        width=rnd.randint(1, 2)
                     )
                     current_x, current_y = next_x, next_y
         
         # Highlights für Lichtreflexionen
         for _ in range(size // 15):
-            x = random.randint(0, size-3)
-            y = random.randint(0, size-3)
+            x = rnd.randint(0, size-3)
+            y = rnd.randint(0, size-3)
             draw.ellipse(
                 [(x, y), (x+2, y+2)],
                 fill=(170, 150, 130)
             )
         
-        random.seed()
-        
         # Schärfe für Felsstruktur
         img = img.filter(ImageFilter.EDGE_ENHANCE)
         img = img.filter(ImageFilter.SMOOTH)
@@ -514,20 +739,11 @@ class AdvancedTextureRenderer:
         Professioneller Wald mit animiertem Blätterrauschen
         SMOOTH WACKELN - langsame, sanfte Wind-Bewegung
         """
-        img = Image.new('RGB', (size, size), (46, 90, 28))
-        draw = ImageDraw.Draw(img)
-        
         # Waldbodenstruktur - sehr langsame Wechselgeschwindigkeit
-        random.seed(size * 3000 + frame // 40)  # // 40 für sehr langsame Änderungen
-        for y in range(size):
-            for x in range(size):
-                variation = random.randint(-8, 8)
-                color = (
-                    max(35, min(55, 46 + variation)),
-                    max(75, min(105, 90 + variation)),
-                    max(20, min(38, 28 + variation))
-                )
-                draw.point((x, y), fill=color)
+        rnd, rng = texture_rngs("forest", size, frame // 40)  # // 40 für sehr langsame Änderungen
+        layer = _varied_layer(rng, (size, size), (46, 90, 28), (35, 75, 20), (55, 105, 38), 8)
+        img = Image.fromarray(layer)
+        draw = ImageDraw.Draw(img)
         
         # Baumkronen mit SMOOTH Animation (Wind) - sehr langsame Geschwindigkeit
         # frame * 0.008 für extrem sanfte, kaum merkliche Bewegung
@@ -535,14 +751,14 @@ class AdvancedTextureRenderer:
         
         tree_count = size // 5
         for i in range(tree_count):
-            base_x = random.randint(4, size - 5)
-            base_y = random.randint(4, size - 5)
+            base_x = rnd.randint(4, size - 5)
+            base_y = rnd.randint(4, size - 5)
             
             # Sanfte Wind-Bewegung
             x = int(base_x + wind_offset)
             y = base_y
             
-            radius = random.randint(3, 6)
+            radius = rnd.randint(3, 6)
             
             # Schatten (Tiefe)
             shadow_radius = radius + 1
@@ -558,9 +774,9 @@ class AdvancedTextureRenderer:
                 layer_radius = radius - layer
                 
                 crown_color = (
-                    max(20, min(50, 35 + layer * 5 + random.randint(-5, 5))),
-                    max(50, min(95, 75 + layer * 5 + random.randint(-8, 8))),
-                    max(15, min(35, 22 + layer * 3 + random.randint(-3, 3)))
+                    max(20, min(50, 35 + layer * 5 + rnd.randint(-5, 5))),
+                    max(50, min(95, 75 + layer * 5 + rnd.randint(-8, 8))),
+                    max(15, min(35, 22 + layer * 3 + rnd.randint(-3, 3)))
                 )
                 
                 draw.ellipse(
@@ -580,8 +796,6 @@ class AdvancedTextureRenderer:
                 fill=(60, 110, 40)
             )
         
-        random.seed()
-        
         # Weicher Blur für organischen Look
         img = img.filter(ImageFilter.SMOOTH_MORE)
         
@@ -589,40 +803,28 @@ class AdvancedTextureRenderer:
     
     def render_sand(self, size, frame):
         """Professioneller Sand mit Körnung"""
-        img = Image.new('RGB', (size, size), (201, 177, 138))
+        # Organische Sand-Textur - Sandkorn-Variation pro Pixel
+        rnd, rng = texture_rngs("sand", size)
+        layer = _varied_layer(rng, (size, size), (201, 177, 138), (180, 155, 115), (220, 195, 155), 18)
+        img = Image.fromarray(layer)
         draw = ImageDraw.Draw(img)
         
-        # Organische Sand-Textur
-        random.seed(size * 4000)
-        for y in range(size):
-            for x in range(size):
-                # Sandkorn-Variation
-                variation = random.randint(-18, 18)
-                color = (
-                    max(180, min(220, 201 + variation)),
-                    max(155, min(195, 177 + variation)),
-                    max(115, min(155, 138 + variation))
-                )
-                draw.point((x, y), fill=color)
-        
         # Sandkörner als Details
         for _ in range(size * 3):
-            x = random.randint(0, size-1)
-            y = random.randint(0, size-1)
+            x = rnd.randint(0, size-1)
+            y = rnd.randint(0, size-1)
             
-            if random.random() > 0.5:
+            if rnd.random() > 0.5:
                 draw.point((x, y), fill=(185, 160, 120))
             else:
                 draw.point((x, y), fill=(215, 195, 155))
         
         # Kleine Schatten für Dimensionalität
         for _ in range(size // 20):
-            x = random.randint(1, size-2)
-            y = random.randint(1, size-2)
+            x = rnd.randint(1, size-2)
+            y = rnd.randint(1, size-2)
             draw.point((x, y), fill=(180, 155, 115))
         
-        random.seed()
-        
         # Sanfter Smooth
         img = img.filter(ImageFilter.SMOOTH)
         
@@ -632,45 +834,34 @@ class AdvancedTextureRenderer:
         """
         Professioneller Schnee mit funkelnden Kristallen (animiert)
         """
-        img = Image.new('RGB', (size, size), (232, 244, 248))
-        draw = ImageDraw.Draw(img)
-        
         # Schneestruktur mit subtilen Variationen
-        random.seed(size * 5000)
-        for y in range(size):
-            for x in range(size):
-                variation = random.randint(-12, 12)
-                color = (
-                    max(220, min(255, 232 + variation)),
-                    max(232, min(255, 244 + variation)),
-                    max(236, min(255, 248 + variation))
-                )
-                draw.point((x, y), fill=color)
+        _, rng = texture_rngs("snow", size)
+        layer = _varied_layer(rng, (size, size), (232, 244, 248), (220, 232, 236), (255, 255, 255), 12)
+        img = Image.fromarray(layer)
+        draw = ImageDraw.Draw(img)
         
         # Funkelnde Schneekristalle (animiert)
-        random.seed(size + frame * 123)
+        rnd, _ = texture_rngs("snow_sparkle", size, frame)
         sparkle_count = size // 3
         
         for i in range(sparkle_count):
-            x = random.randint(0, size-1)
-            y = random.randint(0, size-1)
+            x = rnd.randint(0, size-1)
+            y = rnd.randint(0, size-1)
             
             # Einige Kristalle funkeln stärker je nach Frame
             intensity = 255
             if (i + frame) % 10 < 5:
-                intensity = random.randint(240, 255)
+                intensity = rnd.randint(240, 255)
             
             draw.point((x, y), fill=(intensity, intensity, intensity))
             
             # Stern-Form für größere Kristalle
-            if random.random() > 0.7 and 1 < x < size-1 and 1 < y < size-1:
+            if rnd.random() > 0.7 and 1 < x < size-1 and 1 < y < size-1:
                 draw.point((x-1, y), fill=(250, 252, 255))
                 draw.point((x+1, y), fill=(250, 252, 255))
                 draw.point((x, y-1), fill=(250, 252, 255))
                 draw.point((x, y+1), fill=(250, 252, 255))
         
-        random.seed()
-        
         # Sehr leichter Blur
         img = img.filter(ImageFilter.GaussianBlur(0.3))
         
@@ -678,20 +869,11 @@ class AdvancedTextureRenderer:
     
     def render_road(self, size, frame):
         """Professionelle Straße mit Kopfsteinpflaster"""
-        img = Image.new('RGB', (size, size), (122, 111, 93))
-        draw = ImageDraw.Draw(img)
-        
         # Erdiger Untergrund
-        random.seed(size * 6000)
-        for y in range(size):
-            for x in range(size):
-                variation = random.randint(-15, 15)
-                color = (
-                    max(100, min(140, 122 + variation)),
-                    max(90, min(130, 111 + variation)),
-                    max(75, min(110, 93 + variation))
-                )
-                draw.point((x, y), fill=color)
+        rnd, rng = texture_rngs("road", size)
+        layer = _varied_layer(rng, (size, size), (122, 111, 93), (100, 90, 75), (140, 130, 110), 15)
+        img = Image.fromarray(layer)
+        draw = ImageDraw.Draw(img)
         
         # Kopfsteinpflaster
         stone_size = max(4, size // 10)
@@ -699,8 +881,8 @@ class AdvancedTextureRenderer:
         for row in range(0, size, stone_size):
             for col in range(0, size, stone_size):
                 # Leicht versetzt für organischen Look
-                offset_x = random.randint(-1, 1)
-                offset_y = random.randint(-1, 1)
+                offset_x = rnd.randint(-1, 1)
+                offset_y = rnd.randint(-1, 1)
                 
                 x1 = col + offset_x
                 y1 = row + offset_y
@@ -709,7 +891,7 @@ class AdvancedTextureRenderer:
                 
                 if 0 <= x1 < size and 0 <= y1 < size:
                     # Stein-Farbe
-                    stone_brightness = random.randint(-15, 15)
+                    stone_brightness = rnd.randint(-15, 15)
                     stone_color = (
                         max(90, min(135, 115 + stone_brightness)),
                         max(80, min(125, 105 + stone_brightness)),
@@ -725,7 +907,7 @@ class AdvancedTextureRenderer:
                     )
                     
                     # Highlight auf Stein
-                    if random.random() > 0.6:
+                    if rnd.random() > 0.6:
                         highlight_x = x1 + stone_size // 3
                         highlight_y = y1 + stone_size // 4
                         if highlight_x < size and highlight_y < size:
@@ -734,8 +916,6 @@ class AdvancedTextureRenderer:
                                 fill=(140, 130, 110)
                             )
         
-        random.seed()
-        
         # Leichter Smooth für natürlichen Look
         img = img.filter(ImageFilter.SMOOTH)
         
@@ -748,24 +928,21 @@ class AdvancedTextureRenderer:
         """
         # VIEL größeres Canvas für Rauch über 2-3 Tiles!
         extended_size = int(size * 3)  # 3x statt 1.5x für mehr Rauch-Höhe
-        img = Image.new('RGBA', (extended_size, extended_size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
         # WICHTIG: Bodentextur GANZ UNTEN platzieren (letztes Tile im 3x Canvas)
         # Das Boden-Tile muss bei y = 2*size beginnen und genau 1*size hoch sein
-        random.seed(size * 7000)
         boden_start_y = int(size * 2)  # Beginnt bei 2x size (letztes Drittel)
         
-        for y in range(boden_start_y, extended_size, 2):
-            for x in range(0, size, 2):  # Nur original width (nicht extended!)
-                variation = random.randint(-10, 10)
-                color = (
-                    max(135, min(165, 150 + variation)),
-                    max(115, min(145, 130 + variation)),
-                    max(85, min(115, 100 + variation)),
-                    255
-                )
-                draw.rectangle([(x, y), (x+2, y+2)], fill=color)
+        # Boden in 2x2-Blöcken, nur original width (nicht extended!)
+        _, rng = texture_rngs("village", size)
+        blocks = (-(-size // 2), -(-size // 2))
+        ground = _varied_layer(rng, blocks, (150, 130, 100, 255), (135, 115, 85, 255), (165, 145, 115, 255), 10)
+        
+        pixels = np.zeros((extended_size, extended_size, 4), dtype=np.uint8)
+        pixels[boden_start_y:boden_start_y + size, :size] = _blocks_to_pixels(ground, size)
+        # Blöcke am rechten Rand ragen 1px über die Tile-Breite (wie die alten 3x3-Rechtecke)
+        pixels[boden_start_y:boden_start_y + size, size] = pixels[boden_start_y:boden_start_y + size, size - 2]
+        img = Image.fromarray(pixels, 'RGBA')
+        draw = ImageDraw.Draw(img)
         
         # GRÖSSERES PSEUDO-3D GEBÄUDE (70% der ORIGINAL size)
         building_size = int(size * 0.7)
@@ -855,7 +1032,7 @@ class AdvancedTextureRenderer:
         num_particles = 120  # Mehr Partikel für dickeren Rauch
         
         # Seed für konsistente horizontale Streuung pro Frame
-        random.seed(size * 9000)
+        rnd, _ = texture_rngs("village_smoke", size)
         
         for i in range(num_particles):
             # Gleichmäßig verteilte Partikel über die gesamte Höhe
@@ -870,7 +1047,7 @@ class AdvancedTextureRenderer:
             # BREITE: Partikel verteilen sich horizontal (breiterer Rauch)
             # Je höher, desto breiter die Streuung
             width_factor = particle_height / max_smoke_height
-            horizontal_spread = (random.random() - 0.5) * 8 * width_factor  # Bis zu ±4px Streuung
+            horizontal_spread = (rnd.random() - 0.5) * 8 * width_factor  # Bis zu ±4px Streuung
             
             # Sanfte Wind-Drift (alle Partikel driften in gleiche Richtung)
             wind_drift = wind_direction * width_factor  # Je höher, desto mehr Wind-Einfluss
@@ -948,8 +1125,6 @@ class AdvancedTextureRenderer:
             fill=(240, 250, 255, 200)
         )
         
-        random.seed()
-        
         # WICHTIG: Extended Canvas beibehalten für Rauch-Overlap!
         # Wir geben das größere Bild zurück, damit der Rauch über Tiles hinausragen kann
         # Das Rendering-System muss mit diesem größeren Format umgehen können
@@ -958,27 +1133,18 @@ class AdvancedTextureRenderer:
     
     def render_stone(self, size, frame):
         """Professionelle Stein-Textur"""
-        img = Image.new('RGB', (size, size), (100, 100, 100))
-        draw = ImageDraw.Draw(img)
-        
         # Stein-Grundstruktur
-        random.seed(size * 8000)
-        for y in range(size):
-            for x in range(size):
-                variation = random.randint(-25, 25)
-                color = (
-                    max(75, min(125, 100 + variation)),
-                    max(75, min(125, 100 + variation)),
-                    max(75, min(125, 100 + variation))
-                )
-                draw.point((x, y), fill=color)
+        rnd, rng = texture_rngs("stone", size)
+        layer = _varied_layer(rng, (size, size), (100, 100, 100), (75, 75, 75), (125, 125, 125), 25)
+        img = Image.fromarray(layer)
+        draw = ImageDraw.Draw(img)
         
         # Steinplatten-Muster
         plate_size = size // 4
         for i in range(4):
             for j in range(4):
-                x1 = i * plate_size + random.randint(-2, 2)
-                y1 = j * plate_size + random.randint(-2, 2)
+                x1 = i * plate_size + rnd.randint(-2, 2)
+                y1 = j * plate_size + rnd.randint(-2, 2)
                 x2 = x1 + plate_size - 3
                 y2 = y1 + plate_size - 3
                 
@@ -989,34 +1155,23 @@ class AdvancedTextureRenderer:
                         width=2
                     )
         
-        random.seed()
-        
         img = img.filter(ImageFilter.SMOOTH)
         
         return img
     
     def render_dirt(self, size, frame):
         """Professionelle Erd-Textur"""
-        img = Image.new('RGB', (size, size), (139, 111, 71))
-        draw = ImageDraw.Draw(img)
-        
         # Erdstruktur
-        random.seed(size * 9000)
-        for y in range(size):
-            for x in range(size):
-                variation = random.randint(-22, 22)
-                color = (
-                    max(115, min(160, 139 + variation)),
-                    max(90, min(130, 111 + variation)),
-                    max(50, min(90, 71 + variation))
-                )
-                draw.point((x, y), fill=color)
+        rnd, rng = texture_rngs("dirt", size)
+        layer = _varied_layer(rng, (size, size), (139, 111, 71), (115, 90, 50), (160, 130, 90), 22)
+        img = Image.fromarray(layer)
+        draw = ImageDraw.Draw(img)
         
         # Kleine Steine
         for _ in range(size // 6):
-            x = random.randint(0, size-3)
-            y = random.randint(0, size-3)
-            stone_size = random.randint(1, 3)
+            x = rnd.randint(0, size-3)
+            y = rnd.randint(0, size-3)
+            stone_size = rnd.randint(1, 3)
             
             draw.ellipse(
                 [(x, y), (x + stone_size, y + stone_size)],
@@ -1025,33 +1180,23 @@ class AdvancedTextureRenderer:
         
         # Wurzeln/Gras-Stücke
         for _ in range(size // 12):
-            x = random.randint(0, size-1)
-            y = random.randint(0, size-1)
+            x = rnd.randint(0, size-1)
+            y = rnd.randint(0, size-1)
             draw.point((x, y), fill=(80, 100, 50))
         
-        random.seed()
-        
         img = img.filter(ImageFilter.SMOOTH)
         
         return img
     
     def render_custom_material(self, material, size, frame):
         """Rendert ein benutzerdefiniertes Material"""
-        color = material.get("color", (128, 128, 128))
-        img = Image.new('RGB', (size, size), color)
-        draw = ImageDraw.Draw(img)
-        
-        # Einfache Textur-Variation
-        random.seed(size * 10000 + hash(material.get("name", "")))
-        for y in range(0, size, 2):
-            for x in range(0, size, 2):
-                variation = random.randint(-15, 15)
-                varied_color = tuple(
-                    max(0, min(255, c + variation)) for c in color
-                )
-                draw.rectangle([(x, y), (x+2, y+2)], fill=varied_color)
+        color = tuple(material.get("color", (128, 128, 128)))
         
-        random.seed()
+        # Einfache Textur-Variation in 2x2-Blöcken
+        _, rng = texture_rngs(f"custom:{material.get('name', '')}", size)
+        blocks = (-(-size // 2), -(-size // 2))
+        layer = _varied_layer(rng, blocks, color, (0,) * len(color), (255,) * len(color), 15)
+        img = Image.fromarray(_blocks_to_pixels(layer, size))
         
         img = img.filter(ImageFilter.SMOOTH)
         
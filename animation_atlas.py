@@ -0,0 +1,145 @@
+"""
+Animations-Atlas für "Der Eine Ring"
+Rendert alle Frames der animierten Materialien einmalig in Sprite-Sheets
+Läuft in einem Hintergrund-Thread, während die statische Karte schon angezeigt wird
+"""
+import threading
+from PIL import Image
+
+from advanced_texture_renderer import WATER_DIRECTIONS
+
+
+# Anzahl Frames pro Animations-Loop (wie im Projektor)
+ANIMATION_FRAMES = 240
+
+# Materialien mit Sprite-Sheet
+ATLAS_MATERIALS = ("water", "forest", "snow", "village")
+
+
+class AnimationAtlas:
+    """
+    Sprite-Sheets für alle animierten Materialien bei EINER Tile-Größe
+    Pro Material ein zusammenhängendes Sheet: Spalten = Frames, Zeilen = Fluss-Richtungen (nur Wasser)
+    """
+
+    def __init__(self, renderer, tile_size, materials=None, frame_count=ANIMATION_FRAMES):
+        self.renderer = renderer
+        self.tile_size = tile_size
+        self.frame_count = frame_count
+        self.materials = [m for m in ATLAS_MATERIALS if materials is None or m in materials]
+
+        # Nur FERTIGE Sheets landen hier: material -> (sheet, cell_size)
+        self.sheets = {}
+        self.directions = list(WATER_DIRECTIONS.keys())
+
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._thread = None
+        self._frames_done = 0
+
+    def start(self):
+        """Startet den Aufbau im Hintergrund-Thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.build, name="AnimationAtlas", daemon=True)
+            self._thread.start()
+        return self
+
+    def cancel(self):
+        """Bricht den Aufbau ab (z.B. bei Zoom-Änderung)"""
+        self._cancelled.set()
+
+    def build(self):
+        """Baut alle Sheets nacheinander (blockierend)"""
+        for material in self.materials:
+            if self._cancelled.is_set():
+                return
+
+            if material == "water":
+                sheet = self._build_water_sheet()
+            else:
+                sheet = self._build_sheet(material)
+
+            if sheet is None:
+                return
+
+            # Erst veröffentlichen wenn komplett fertig
+            with self._lock:
+                self.sheets[material] = sheet
+
+    def _build_water_sheet(self, batch_size=24):
+        """Wasser: eine Zeile pro Richtung, Frames in Blöcken vektorisiert gerendert"""
+        size = self.tile_size
+        sheet = Image.new('RGB', (size * self.frame_count, size * len(self.directions)))
+
+        for row, direction in enumerate(self.directions):
+            for start in range(0, self.frame_count, batch_size):
+                if self._cancelled.is_set():
+                    return None
+
+                frames = range(start, min(start + batch_size, self.frame_count))
+                images = self.renderer.render_water_frames(size, frames, direction)
+                for frame, img in zip(frames, images):
+                    sheet.paste(img, (frame * size, row * size))
+                self._frames_done += len(images)
+
+        return sheet, size
+
+    def _build_sheet(self, material):
+        """Forest/Snow/Village: eine Zeile mit allen Frames"""
+        sheet = None
+        cell = self.tile_size
+
+        for frame in range(self.frame_count):
+            if self._cancelled.is_set():
+                return None
+
+            # render_texture nutzt den Disk-Cache - zweiter Start liest nur noch von Disk
+            img = self.renderer.render_texture(material, self.tile_size, frame)
+
+            # Village liefert größeres RGBA-Bild (Rauch-Overlap) - Zellgröße danach richten
+            if sheet is None:
+                cell = img.size[0]
+                sheet = Image.new(img.mode, (cell * self.frame_count, cell))
+
+            sheet.paste(img, (frame * cell, 0))
+            self._frames_done += 1
+
+        return sheet, cell
+
+    def is_ready(self, material=None):
+        """Prüft ob ein Material (oder alle) fertig gerendert ist"""
+        with self._lock:
+            if material is None:
+                return all(m in self.sheets for m in self.materials)
+            return material in self.sheets
+
+    def covers(self, material):
+        """Prüft ob das Material über den Atlas animiert wird"""
+        return material in self.materials
+
+    def progress(self):
+        """Fortschritt 0.0 - 1.0"""
+        total = 0
+        for material in self.materials:
+            rows = len(self.directions) if material == "water" else 1
+            total += rows * self.frame_count
+        return min(1.0, self._frames_done / total) if total else 1.0
+
+    def get_frame(self, material, frame, direction="right"):
+        """
+        Gibt den Frame aus dem fertigen Sheet zurück
+        None wenn das Sheet noch nicht fertig ist (Aufrufer zeigt dann das statische Tile)
+        """
+        with self._lock:
+            entry = self.sheets.get(material)
+
+        if entry is None:
+            return None
+
+        sheet, cell = entry
+        frame = frame % self.frame_count
+        row = 0
+        if material == "water":
+            row = self.directions.index(direction) if direction in WATER_DIRECTIONS else 0
+
+        return sheet.crop((frame * cell, row * cell, (frame + 1) * cell, (row + 1) * cell))
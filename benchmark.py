@@ -0,0 +1,305 @@
+"""
+Headless-Benchmark für "Der Eine Ring"
+Misst die heißen Pfade bei mehreren Karten- und Tile-Größen - ohne Tk-Fenster:
+Textur-Generatoren, Fog-Texturen, Projektor-Composite, FogOfWar und Karten-I/O
+Ergebnisse als JSON, Vergleich mit einer gespeicherten Baseline fängt Regressionen ab
+
+Aufruf:
+    python benchmark.py                          # misst, schreibt benchmark_results.json
+    python benchmark.py --save-baseline          # misst und speichert als benchmark_baseline.json
+    python benchmark.py --baseline benchmark_baseline.json   # vergleicht, Exit-Code 1 bei Regression
+    python benchmark.py --quick --filter fog     # nur wenige Durchläufe, nur passende Messungen
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import PIL
+
+# Füge das Projekt-Verzeichnis zum Python-Path hinzu
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from advanced_texture_renderer import AdvancedTextureRenderer, GENERATOR_VERSION
+from fog_engine import tile_distance_field
+from fog_of_war import FogOfWar
+from fog_texture_generator import FogTextureGenerator
+from map_format import BINARY_EXTENSION
+from map_system import MapSystem
+from render_engine import RenderEngine
+
+
+# Standard-Dateien
+RESULTS_FILE = "benchmark_results.json"
+BASELINE_FILE = "benchmark_baseline.json"
+
+# Gemessene Größen
+TILE_SIZES = (32, 64)
+MAP_SIZES = (50, 100)
+
+# Projektor-Ausschnitt (Full-HD)
+VIEWPORT = (1920, 1080)
+
+# Durchläufe pro Messung (Median zählt)
+REPEAT = 7
+QUICK_REPEAT = 3
+
+# Regression: mehr als 25% langsamer UND mindestens 0.5 ms (kleinere Schwankungen sind Rauschen)
+REGRESSION_FACTOR = 1.25
+REGRESSION_MIN_MS = 0.5
+
+# Animations-Frames im Composite-Benchmark (danach Loop, Texturen liegen im Cache)
+ANIMATION_FRAMES = 8
+
+# Alle prozeduralen Materialien des AdvancedTextureRenderer
+MATERIALS = ("grass", "water", "mountain", "forest", "sand", "snow", "road", "village", "stone", "dirt")
+
+
+def measure(func, repeat):
+    """Median/Minimum in ms über repeat Durchläufe (plus ein Aufwärm-Durchlauf)"""
+    func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": statistics.median(timings), "min_ms": min(timings), "runs": repeat}
+
+
+def benchmark_map(width, height, seed=7):
+    """Deterministische Test-Karte mit allen Materialien (lokaler Zufall, keine globalen Seeds)"""
+    rnd = random.Random(seed)
+    weighted = ["grass"] * 6 + ["water"] * 3 + ["forest"] * 2 + list(MATERIALS)
+    tiles = [[rnd.choice(weighted) for _ in range(width)] for _ in range(height)]
+    directions = {f"{x},{y}": rnd.choice(["right", "down", "down-left", "up"])
+                  for y, row in enumerate(tiles) for x, material in enumerate(row) if material == "water"}
+    return {"width": width, "height": height, "tiles": tiles, "river_directions": directions}
+
+
+def bench_texture_generators(renderer, cases):
+    """Jeder render_*-Generator bei jeder Tile-Größe (ohne Cache)"""
+    for size in TILE_SIZES:
+        for material in MATERIALS:
+            cases[f"render_{material}_{size}"] = lambda m=material, s=size: \
+                renderer.generate_professional_texture(m, s, 17, "down-left")
+
+
+def bench_fog_textures(cases):
+    """Alle Varianten des FogTextureGenerator (direkt, ohne Cache)"""
+    generator = FogTextureGenerator()
+    for size in TILE_SIZES:
+        cases[f"fog_texture_cloud_{size}"] = lambda s=size: generator.generate_cloud_fog_texture(s)
+        cases[f"fog_texture_dense_{size}"] = lambda s=size: generator.generate_dense_fog_texture(s)
+        cases[f"fog_texture_light_{size}"] = lambda s=size: generator.generate_light_fog_texture(s)
+        cases[f"fog_texture_animated_{size}"] = lambda s=size: generator.generate_animated_fog_frame(s, 42)
+
+
+def headless_view(map_size, tile_size):
+    """Tile-Bereich eines Full-HD-Ausschnitts in der Kartenmitte"""
+    view_w = min(map_size, -(-VIEWPORT[0] // tile_size))
+    view_h = min(map_size, -(-VIEWPORT[1] // tile_size))
+    x0 = (map_size - view_w) // 2
+    y0 = (map_size - view_h) // 2
+    return x0, y0, x0 + view_w, y0 + view_h
+
+
+def composite_cases(renderer, map_data, fog, map_size, tile_size):
+    """
+    Die drei Compositing-Messungen für eine Karte + Tile-Größe
+    Eigene Funktion: jede Messung hat ihre eigene Engine, ihren Nebel und ihren Frame-Zähler
+    """
+    engine = RenderEngine(renderer)
+    engine.set_map(map_data)
+    view = headless_view(map_size, tile_size)
+    hidden = fog.get_hidden_mask(*view)
+    state = {"frame": 0}
+
+    def prime():
+        # Texturen der ersten Animations-Frames vorab (Projektor: Atlas)
+        if "primed" not in state:
+            for frame in range(ANIMATION_FRAMES):
+                engine.render(fog, view, tile_size, frame)
+            state["primed"] = True
+
+    def static_view():
+        # Chunk-Cache leer: wie nach Zoom auf eine neue Stufe (Texturen im Speicher-Cache)
+        engine.chunk_cache.clear()
+        engine.build_static_view(view, tile_size)
+
+    def full_frame():
+        prime()
+        engine.build_static_view(view, tile_size)
+        engine.compose_full_frame(tile_size, state["frame"], fog.revealed, hidden, True)
+
+    def next_frame():
+        prime()
+        state["frame"] = (state["frame"] + 1) % ANIMATION_FRAMES
+        engine.render(fog, view, tile_size, state["frame"])
+
+    return static_view, full_frame, next_frame
+
+
+def bench_projector_composite(renderer, cases):
+    """Projektor-Pfad über die Render-Engine: statischer Ausschnitt, Vollaufbau, inkrementeller Frame"""
+    for map_size in MAP_SIZES:
+        map_data = benchmark_map(map_size, map_size)
+        fog = FogOfWar(map_size, map_size)
+        fog.reveal_positions([(map_size // 2 + dx, map_size // 2) for dx in range(-10, 11, 4)], 5)
+
+        for tile_size in TILE_SIZES:
+            static_view, full_frame, next_frame = composite_cases(renderer, map_data, fog, map_size, tile_size)
+            suffix = f"{map_size}x{map_size}_{tile_size}"
+            cases[f"composite_static_{suffix}"] = static_view
+            cases[f"composite_full_frame_{suffix}"] = full_frame
+            cases[f"composite_next_frame_{suffix}"] = next_frame
+
+
+def bench_fog_of_war(cases):
+    """FogOfWar: Aufdecken, Masken-Abfragen, Distanzfeld"""
+    for map_size in MAP_SIZES:
+        rnd = random.Random(map_size)
+        positions = [(rnd.randrange(map_size), rnd.randrange(map_size)) for _ in range(50)]
+        fog = FogOfWar(map_size, map_size)
+        fog.reveal_positions(positions, 3)
+        hidden = fog.get_hidden_mask()
+
+        suffix = f"{map_size}x{map_size}"
+        cases[f"fog_reveal_batch_{suffix}"] = lambda f=fog, p=positions: f.reveal_positions(p, 4)
+        cases[f"fog_reveal_single_{suffix}"] = lambda f=fog, s=map_size: f.reveal_at_position(s // 2, s // 2)
+        cases[f"fog_hidden_mask_{suffix}"] = lambda f=fog: f.get_hidden_mask()
+        cases[f"fog_revealed_tiles_{suffix}"] = lambda f=fog: f.get_revealed_tiles()
+        cases[f"fog_distance_field_{suffix}"] = lambda h=hidden: tile_distance_field(h)
+
+
+def bench_map_io(cases, folder):
+    """MapSystem: Speichern, Laden und Auflisten - JSON und .ringmap (20 Karten im Ordner)"""
+    system = MapSystem(maps_folder=folder)
+    for map_size in MAP_SIZES:
+        map_data = benchmark_map(map_size, map_size)
+        for i in range(5):
+            system.save_map(map_data, f"bench_{map_size}_{i}.json")
+            system.save_map(map_data, f"bench_{map_size}_{i}{BINARY_EXTENSION}")
+
+        suffix = f"{map_size}x{map_size}"
+        cases[f"map_save_{suffix}"] = lambda m=map_data, s=suffix: system.save_map(m, f"bench_{s}.json")
+        cases[f"map_load_{suffix}"] = lambda s=map_size: system.load_map(f"bench_{s}_0.json")
+        cases[f"map_save_binary_{suffix}"] = lambda m=map_data, s=suffix: system.save_map(m, f"bench_{s}")
+        cases[f"map_load_binary_{suffix}"] = lambda s=map_size: system.load_map(f"bench_{s}_0{BINARY_EXTENSION}")
+    cases["map_list"] = system.list_maps
+
+
+def run_benchmarks(quick=False, name_filter=None):
+    """Führt alle (passenden) Messungen aus - gibt das Ergebnis-Dict für JSON zurück"""
+    repeat = QUICK_REPEAT if quick else REPEAT
+    folder = tempfile.mkdtemp(prefix="dereinering_bench_")
+
+    renderer = AdvancedTextureRenderer()
+    renderer.disk_cache.enabled = False  # Generatoren messen, nicht die Festplatte
+
+    cases = {}
+    try:
+        bench_texture_generators(renderer, cases)
+        bench_fog_textures(cases)
+        bench_projector_composite(renderer, cases)
+        bench_fog_of_war(cases)
+        bench_map_io(cases, folder)
+
+        results = {}
+        for name, func in cases.items():
+            if name_filter and name_filter not in name:
+                continue
+            results[name] = measure(func, repeat)
+            print(f"  {name:<40}{results[name]['median_ms']:9.2f} ms")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pillow": PIL.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "generator_version": GENERATOR_VERSION,
+            "repeat": repeat
+        },
+        "results": results
+    }
+
+
+def compare_results(current, baseline, factor=REGRESSION_FACTOR, min_ms=REGRESSION_MIN_MS):
+    """
+    Vergleicht zwei Ergebnis-Dicts (Median)
+    Gibt [(name, baseline_ms, current_ms, ratio)] aller Regressionen zurück
+    """
+    regressions = []
+    for name, entry in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        old_ms, new_ms = old["median_ms"], entry["median_ms"]
+        ratio = new_ms / old_ms if old_ms > 0 else float("inf")
+        if ratio > factor and new_ms - old_ms > min_ms:
+            regressions.append((name, old_ms, new_ms, ratio))
+    return regressions
+
+
+def save_json(data, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless-Benchmark für Der Eine Ring")
+    parser.add_argument("--output", default=RESULTS_FILE, help="JSON-Datei für die Ergebnisse")
+    parser.add_argument("--baseline", help="Baseline-JSON zum Vergleich (Exit-Code 1 bei Regression)")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE_FILE,
+                        help="Ergebnisse zusätzlich als Baseline speichern")
+    parser.add_argument("--quick", action="store_true", help="Weniger Durchläufe")
+    parser.add_argument("--filter", help="Nur Messungen, deren Name diesen Text enthält")
+    args = parser.parse_args(argv)
+
+    print("=== Benchmark: Der Eine Ring ===")
+    current = run_benchmarks(quick=args.quick, name_filter=args.filter)
+
+    save_json(current, args.output)
+    print(f"\n💾 Ergebnisse gespeichert: {args.output} ({len(current['results'])} Messungen)")
+
+    if args.save_baseline:
+        save_json(current, args.save_baseline)
+        print(f"💾 Baseline gespeichert: {args.save_baseline}")
+
+    if not args.baseline:
+        return 0
+
+    baseline = load_json(args.baseline)
+    if baseline["meta"].get("platform") != current["meta"]["platform"]:
+        print("⚠️ Baseline stammt von einem anderen System - Vergleich nur bedingt aussagekräftig")
+
+    regressions = compare_results(current, baseline)
+    if not regressions:
+        print(f"\n✅ Keine Regression gegenüber {args.baseline}")
+        return 0
+
+    print(f"\n❌ {len(regressions)} Regression(en) gegenüber {args.baseline}:")
+    for name, old_ms, new_ms, ratio in regressions:
+        print(f"  {name:<40}{old_ms:9.2f} ms -> {new_ms:9.2f} ms  (x{ratio:.2f})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,6 +32,19 @@ def clear_all_caches():
     except Exception as e:
         print(f"⚠️ AdvancedTextureRenderer Cache: {e}")
     
+    try:
+        # Persistenten Disk-Cache löschen (vorgerenderte Tiles aller Generator-Versionen)
+        from advanced_texture_renderer import GENERATOR_VERSION
+        from disk_texture_cache import DiskTextureStore
+        store = DiskTextureStore(GENERATOR_VERSION)
+        size_mb = store.disk_usage() / (1024 * 1024)
+        if store.clear():
+            print(f"✅ Disk-Textur-Cache gelöscht ({size_mb:.1f} MB)")
+        else:
+            print("✅ Disk-Textur-Cache war leer")
+    except Exception as e:
+        print(f"⚠️ Disk-Textur-Cache: {e}")
+    
     try:
         # FogTextureGenerator Cache leeren
         from fog_texture_generator import FogTextureGenerator
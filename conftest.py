@@ -0,0 +1,18 @@
+"""
+pytest-Einstellungen für "Der Eine Ring"
+Der Textur-Disk-Cache landet während der Tests in einem temporären Ordner statt in ./texture_cache
+(Umgebungsvariable - gilt auch für Worker-Prozesse von Export und Vorwärmen)
+"""
+import os
+import shutil
+import tempfile
+
+from disk_texture_cache import CACHE_FOLDER_ENV
+
+
+_cache_folder = tempfile.mkdtemp(prefix="ring_texture_cache_")
+os.environ[CACHE_FOLDER_ENV] = _cache_folder
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_cache_folder, ignore_errors=True)
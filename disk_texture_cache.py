@@ -0,0 +1,194 @@
+"""
+Persistenter Textur-Cache für "Der Eine Ring"
+Speichert vorgerenderte Tiles als .npy-Dateien auf der Festplatte
+Schlüssel: Material, Größe, Frame, Richtung + Hash des Generator-Quellcodes
+"""
+import glob
+import hashlib
+import os
+import shutil
+
+import numpy as np
+from PIL import Image
+
+
+# Standard-Ordner (relativ zum Arbeitsverzeichnis, wie "maps")
+DEFAULT_CACHE_FOLDER = "texture_cache"
+
+# Umgebungsvariable für einen anderen Ordner (Tests: temporärer Ordner statt ./texture_cache)
+CACHE_FOLDER_ENV = "RING_TEXTURE_CACHE"
+
+# Obergrenze auf Disk - Animations-Frames (240 pro Loop und Größe) würden den Ordner sonst endlos füllen
+DEFAULT_BUDGET_BYTES = 256 * 1024 * 1024
+
+# Beim Überschreiten wird bis auf diesen Anteil geräumt (nicht bei jedem save() erneut)
+EVICT_TARGET = 0.9
+
+
+def source_hash(path):
+    """Kurzer SHA1-Hash einer Quelldatei - ändert sich bei jeder Generator-Änderung"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()[:16]
+    except OSError:
+        return "unknown"
+
+
+class DiskTextureStore:
+    """
+    Vorgerenderte Texturen auf Disk
+    Jede Generator-Version bekommt einen eigenen Unterordner - alte Versionen
+    werden dadurch automatisch ungültig und können mit purge_stale() entfernt werden
+    Byte-Budget pro Version: am längsten nicht benutzte Einträge (mtime, load() frischt auf) fliegen zuerst
+    """
+
+    def __init__(self, version, cache_folder=None, budget_bytes=DEFAULT_BUDGET_BYTES):
+        if cache_folder is None:
+            cache_folder = os.environ.get(CACHE_FOLDER_ENV) or DEFAULT_CACHE_FOLDER
+        self.version = version
+        self.cache_folder = cache_folder
+        self.version_folder = os.path.join(cache_folder, version)
+        self.budget_bytes = budget_bytes
+        self.usage = None  # Bytes im Versions-Ordner - beim ersten save() einmal gezählt
+        self.enabled = True
+
+    def _path(self, material_id, size, frame, direction):
+        return os.path.join(self.version_folder, f"{material_id}_{size}_{frame}_{direction}.npy")
+
+    def load(self, material_id, size, frame=0, direction="-"):
+        """Lädt eine Textur oder None wenn nicht vorhanden"""
+        if not self.enabled:
+            return None
+
+        path = self._path(material_id, size, frame, direction)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            # Kein mmap: offene Mappings würden clear() unter Windows blockieren
+            image = Image.fromarray(np.load(path))
+        except (OSError, ValueError) as e:
+            print(f"Defekter Textur-Cache-Eintrag {path}: {e}")
+            self._remove_file(path)
+            return None
+
+        # Zuletzt benutzt = mtime (für die Räumung nach LRU)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return image
+
+    def save(self, material_id, size, frame, direction, image):
+        """Speichert eine Textur atomar (temp-Datei + rename)"""
+        if not self.enabled:
+            return False
+
+        path = self._path(material_id, size, frame, direction)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            os.makedirs(self.version_folder, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.asarray(image))
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self.track(os.path.getsize(path) - replaced)
+            return True
+        except OSError as e:
+            print(f"Textur-Cache nicht beschreibbar ({e}) - Disk-Cache deaktiviert")
+            self.enabled = False
+            self._remove_file(tmp_path)
+            return False
+
+    def track(self, delta):
+        """Belegung nachführen - über dem Budget: älteste Einträge löschen"""
+        if self.usage is None:
+            self.usage = self.folder_usage(self.version_folder)
+        else:
+            self.usage += delta
+        if self.usage > self.budget_bytes:
+            self.evict(int(self.budget_bytes * EVICT_TARGET))
+
+    def evict(self, target_bytes):
+        """Löscht die am längsten nicht benutzten Einträge, bis höchstens target_bytes belegt sind"""
+        entries = []
+        for path in glob.glob(os.path.join(self.version_folder, "*.npy")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        self.usage = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if self.usage <= target_bytes:
+                break
+            self._remove_file(path)
+            self.usage -= size
+            removed += 1
+        return removed
+
+    def load_size(self, size, frame=0):
+        """
+        Bulk-Load aller Einträge einer Tile-Größe und eines Frames
+        Gibt Dict {(material_id, direction): Image} zurück
+        """
+        textures = {}
+        if not self.enabled:
+            return textures
+
+        pattern = os.path.join(self.version_folder, f"*_{size}_{frame}_*.npy")
+        for path in glob.glob(pattern):
+            name = os.path.basename(path)[:-len(".npy")]
+            material_id, _, _, direction = name.rsplit("_", 3)
+            image = self.load(material_id, size, frame, direction)
+            if image is not None:
+                textures[(material_id, direction)] = image
+
+        return textures
+
+    def purge_stale(self):
+        """Löscht Cache-Ordner älterer Generator-Versionen"""
+        removed = 0
+        if not os.path.isdir(self.cache_folder):
+            return removed
+
+        for entry in os.listdir(self.cache_folder):
+            folder = os.path.join(self.cache_folder, entry)
+            if entry != self.version and os.path.isdir(folder):
+                shutil.rmtree(folder, ignore_errors=True)
+                removed += 1
+
+        return removed
+
+    def clear(self):
+        """Löscht den kompletten Disk-Cache (alle Versionen)"""
+        self.usage = None
+        if os.path.isdir(self.cache_folder):
+            shutil.rmtree(self.cache_folder, ignore_errors=True)
+            return True
+        return False
+
+    def disk_usage(self):
+        """Belegter Speicher in Bytes (alle Versionen)"""
+        return self.folder_usage(self.cache_folder)
+
+    @staticmethod
+    def folder_usage(folder):
+        total = 0
+        for root, _, files in os.walk(folder):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+    def _remove_file(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -6,6 +6,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
 
+# Millisekunden zwischen zwei Abfragen einer noch ladenden Karte
+MAP_STREAM_POLL_MS = 100
+
 class DerEineRingProApp(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -15,6 +18,8 @@ class DerEineRingProApp(tk.Tk):
         
         # Aktuell geladene Karte
         self.current_map_data = None
+        self.map_loader = None  # Karte wird noch im Hintergrund gestreamt (map_stream.py)
+        self.fallback_map_data = None  # Karte vor dem Stream - falls er abbricht
         self.current_editor = None
         self.projector_window = None
         self.gm_panel = None
@@ -81,6 +86,11 @@ class DerEineRingProApp(tk.Tk):
             editor_win.geometry("1400x900")
             editor_win.configure(bg="#1a1a1a")
             
+            # Editor braucht die vollständige Karte - Streaming erst abschließen
+            if self.map_loader:
+                self.map_loader.finished.wait()
+                self.poll_map_loader()  # Lesefehler: Meldung, Editor startet mit der vorigen Karte
+            
             # MapEditor mit aktuellen Daten oder neu
             editor = MapEditor(editor_win, width=50, height=50, map_data=self.current_map_data)
             editor.pack(fill=tk.BOTH, expand=True)
@@ -122,12 +132,15 @@ class DerEineRingProApp(tk.Tk):
                 map_height = map_data.get("height", 50)
                 self.webcam_tracker.map_size = (map_width, map_height)
             
+            # Noch ladende Karte: Projektor rendert die ersten Zeilen sofort, der Rest folgt
+            loader = self.map_loader if self.map_loader and map_data is self.map_loader.map_data else None
+            
             # Projektor öffnen
             if self.projector_window and self.projector_window.winfo_exists():
-                self.projector_window.update_map(map_data)
+                self.projector_window.update_map(map_data, loader)
                 self.projector_window.lift()
             else:
-                self.projector_window = ProjectorWindow(self, map_data, self.webcam_tracker)
+                self.projector_window = ProjectorWindow(self, map_data, self.webcam_tracker, map_loader=loader)
             
         except Exception as e:
             messagebox.showerror("Fehler", f"Projektor konnte nicht gestartet werden:\n{e}")
@@ -152,7 +165,7 @@ class DerEineRingProApp(tk.Tk):
         """Karte laden"""
         filename = filedialog.askopenfilename(
             title="Karte laden",
-            filetypes=[("JSON Dateien", "*.json"), ("Alle Dateien", "*.*")],
+            filetypes=[("Karten", "*.ringmap *.json"), ("Alle Dateien", "*.*")],
             initialdir="maps"
         )
         
@@ -160,41 +173,98 @@ class DerEineRingProApp(tk.Tk):
             try:
                 from map_system import MapSystem
                 ms = MapSystem()
-                map_data = ms.load_map(filename)
                 
-                if map_data:
-                    self.current_map_data = map_data
+                if self.open_map(ms, filename):
                     messagebox.showinfo("Erfolg", f"Karte geladen:\n{os.path.basename(filename)}")
                 else:
                     messagebox.showerror("Fehler", "Karte konnte nicht geladen werden")
             except Exception as e:
                 messagebox.showerror("Fehler", f"Fehler beim Laden:\n{e}")
     
+    def open_map(self, ms, filename):
+        """Karte streamen - ein offener Projektor zeigt die ersten Zeilen schon während des Ladens"""
+        loader = ms.load_map_progressive(filename)
+        if loader is None:
+            return False
+        
+        # Vorige Karte merken - bricht der Stream ab, geht es mit ihr weiter
+        if not self.map_loader:
+            self.fallback_map_data = self.current_map_data
+        self.map_loader = loader
+        self.current_map_data = loader.map_data
+        if self.projector_window and self.projector_window.winfo_exists():
+            self.projector_window.update_map(loader.map_data, loader)
+        self.after(MAP_STREAM_POLL_MS, self.poll_map_loader)
+        return True
+    
+    def poll_map_loader(self):
+        """Wartet auf das Ende des Streams - Lesefehler (z.B. abgeschnittene Datei) als Meldung"""
+        loader = self.map_loader
+        if loader is None:
+            return
+        
+        if not loader.finished.is_set():
+            self.after(MAP_STREAM_POLL_MS, self.poll_map_loader)
+            return
+        
+        self.map_loader = None
+        if loader.error is None:
+            return
+        
+        # Unvollständige Karte NICHT weiterverwenden (Editor, Speichern)
+        self.current_map_data = self.fallback_map_data
+        if self.current_map_data and self.projector_window and self.projector_window.winfo_exists():
+            self.projector_window.update_map(self.current_map_data)
+        messagebox.showerror("Fehler", f"Karte konnte nicht vollständig geladen werden:\n{loader.error}")
+    
     def show_map_list(self):
-        """Liste aller gespeicherten Karten anzeigen"""
+        """Liste aller gespeicherten Karten anzeigen (aus dem Karten-Katalog - durchsuch- und sortierbar)"""
         try:
             from map_system import MapSystem
+            from PIL import Image, ImageTk
             ms = MapSystem()
-            maps = ms.list_maps()
             
-            if not maps:
+            if not ms.list_maps():
                 messagebox.showinfo("Keine Karten", "Noch keine Karten gespeichert.\nErstelle zuerst eine Karte im Editor!")
                 return
             
             # Listenfenster erstellen
             list_win = tk.Toplevel(self)
             list_win.title("Gespeicherte Karten")
-            list_win.geometry("600x400")
+            list_win.geometry("800x450")
             list_win.configure(bg="#1a1a1a")
             
             tk.Label(list_win, text="📋 Gespeicherte Karten", 
                     font=("Arial", 16, "bold"),
                     bg="#1a1a1a", fg="white").pack(pady=10)
             
+            # Suche + Sortierung
+            filter_frame = tk.Frame(list_win, bg="#1a1a1a")
+            filter_frame.pack(fill=tk.X, padx=20)
+            
+            tk.Label(filter_frame, text="🔍 Suche:", bg="#1a1a1a", fg="white").pack(side=tk.LEFT)
+            search_var = tk.StringVar()
+            tk.Entry(filter_frame, textvariable=search_var, bg="#2a2a2a", fg="white",
+                    insertbackground="white").pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+            
+            sort_options = {"Datum": "created", "Name": "name", "Größe": "size"}
+            sort_var = tk.StringVar(value="Datum")
+            ttk.Combobox(filter_frame, textvariable=sort_var, values=list(sort_options),
+                        state="readonly", width=8).pack(side=tk.LEFT)
+            
             # Listbox mit Scrollbar
             frame = tk.Frame(list_win, bg="#1a1a1a")
             frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
             
+            # Vorschau (Thumbnail + häufigste Materialien)
+            preview = tk.Frame(frame, bg="#1a1a1a", width=200)
+            preview.pack(side=tk.RIGHT, fill=tk.Y, padx=(10, 0))
+            thumb_label = tk.Label(preview, bg="#1a1a1a")
+            thumb_label.pack(pady=5)
+            info_label = tk.Label(preview, bg="#1a1a1a", fg="#cccccc", justify=tk.LEFT,
+                                 font=("Courier", 9))
+            info_label.pack(anchor="w")
+            
             scrollbar = tk.Scrollbar(frame)
             scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
             
@@ -205,9 +275,37 @@ class DerEineRingProApp(tk.Tk):
             listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
             scrollbar.config(command=listbox.yview)
             
-            # Karten einfügen
-            for filename, created, size in maps:
-                listbox.insert(tk.END, f"{filename:30} | {size:8} | {created[:19]}")
+            maps = []
+            
+            def fill_list(*_):
+                # Katalog ist schon aktuell - nur filtern/sortieren, keine Datei wird gelesen
+                maps[:] = ms.catalog.entries(search_var.get(), sort_by=sort_options[sort_var.get()])
+                listbox.delete(0, tk.END)
+                for entry in maps:
+                    size = "?" if entry.get("error") else f"{entry['width']}x{entry['height']}"
+                    listbox.insert(tk.END, f"{entry['filename']:30} | {size:8} | {entry['created'][:19]}")
+            
+            def show_preview(_event=None):
+                selection = listbox.curselection()
+                if not selection:
+                    return
+                entry = maps[selection[0]]
+                thumb_path = ms.catalog.thumbnail_path(entry["filename"])
+                if thumb_path and os.path.exists(thumb_path):
+                    thumb_label.image = ImageTk.PhotoImage(Image.open(thumb_path))
+                    thumb_label.config(image=thumb_label.image)
+                else:
+                    thumb_label.config(image="")
+                
+                histogram = entry.get("histogram", {})
+                total = sum(histogram.values()) or 1
+                info_label.config(text="\n".join(f"{material:12} {count * 100 / total:5.1f}%"
+                                                 for material, count in list(histogram.items())[:6]))
+            
+            search_var.trace_add("write", fill_list)
+            sort_var.trace_add("write", fill_list)
+            listbox.bind("<<ListboxSelect>>", show_preview)
+            fill_list()
             
             # Buttons
             btn_frame = tk.Frame(list_win, bg="#1a1a1a")
@@ -217,10 +315,8 @@ class DerEineRingProApp(tk.Tk):
                 selection = listbox.curselection()
                 if selection:
                     idx = selection[0]
-                    filename = maps[idx][0]
-                    map_data = ms.load_map(filename)
-                    if map_data:
-                        self.current_map_data = map_data
+                    filename = maps[idx]["filename"]
+                    if self.open_map(ms, filename):
                         messagebox.showinfo("Erfolg", f"Karte geladen: {filename}")
                         list_win.destroy()
             
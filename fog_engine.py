@@ -0,0 +1,154 @@
+"""
+Weicher Fog-of-War für "Der Eine Ring"
+Distanzfeld aus der Nebel-Maske steuert das Alpha pro Pixel (weiche Ränder),
+darüber driftet EINE nahtlose Wolken-Textur über die ganze Karte
+Kosten: ein vektorisierter Durchgang pro Frame statt eines Aufrufs pro Tile
+"""
+import numpy as np
+from PIL import Image
+
+try:
+    from scipy import ndimage
+except ImportError:
+    ndimage = None  # Fallback: Distanzfeld per Schablone in NumPy
+
+
+# Kantenlänge der kachelbaren Wolken-Textur (Pixel)
+CLOUD_TEXTURE_SIZE = 256
+
+# Weicher Übergang: Alpha steigt zwischen diesen Distanzen (in Tiles) von 0 auf 1
+# 0.5 = Grenze zwischen aufgedecktem und verborgenem Tile
+FOG_EDGE_START = 0.25
+FOG_EDGE_END = 0.75
+
+# Wie weit Wolkenfetzen den Rand verschieben (in Tiles)
+# Klein genug, dass die Mitte verborgener Tiles immer voll deckend bleibt
+FOG_WISP_TILES = 0.2
+
+# Frames pro Animations-Loop (wie Projektor und Animations-Atlas - der Frame-Zähler springt danach auf 0)
+LOOP_FRAMES = 240
+
+# Drift der Wolken in Texturbreiten pro Loop (x, y) - GANZE Zahlen, sonst springt der Nebel beim Umbruch
+# (1, 1): ca. 1 Pixel pro Frame diagonal
+FOG_DRIFT = (1, 1)
+
+# Farben wie die Fog-Texturen: dunkle Wolkenkerne -> helles Grau-Beige
+FOG_DARK = np.array([150, 140, 130], dtype=np.float32)
+FOG_LIGHT = np.array([220, 210, 200], dtype=np.float32)
+
+# Distanzfeld wird hier gekappt (weiter innen ist der Nebel ohnehin voll deckend)
+MAX_FIELD_TILES = 3
+
+
+def seamless_cloud_texture(size=CLOUD_TEXTURE_SIZE, seed=42):
+    """
+    Nahtlos kachelbare Wolken-Dichte (0..1)
+    Rauschen im Frequenzraum gefiltert (1/f) - periodisch per Konstruktion, keine Kanten
+    """
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal((size, size))
+
+    fy = np.fft.fftfreq(size)[:, None]
+    fx = np.fft.fftfreq(size)[None, :]
+    radius = np.sqrt(fx * fx + fy * fy)
+    radius[0, 0] = 1.0
+
+    spectrum = np.fft.fft2(noise) / radius ** 1.6
+    spectrum[0, 0] = 0
+    density = np.real(np.fft.ifft2(spectrum))
+
+    density -= density.min()
+    density /= max(density.max(), 1e-6)
+    return density.astype(np.float32)
+
+
+def tile_distance_field(hidden, max_distance=MAX_FIELD_TILES):
+    """
+    Euklidische Distanz (in Tiles) jedes verborgenen Tiles zum nächsten aufgedeckten
+    Aufgedeckte Tiles = 0, gekappt bei max_distance
+    """
+    if not hidden.any():
+        return np.zeros(hidden.shape, dtype=np.float32)
+    if hidden.all():
+        return np.full(hidden.shape, float(max_distance), dtype=np.float32)
+
+    if ndimage is not None:
+        return np.minimum(ndimage.distance_transform_edt(hidden), max_distance).astype(np.float32)
+
+    # Ohne scipy: jede Schablonen-Verschiebung bis max_distance einmal über das ganze Array
+    height, width = hidden.shape
+    r = int(np.ceil(max_distance))
+    revealed = np.pad(~hidden, r, constant_values=False)
+    field = np.full(hidden.shape, float(max_distance), dtype=np.float32)
+
+    for dy in range(-r, r + 1):
+        for dx in range(-r, r + 1):
+            distance = np.hypot(dx, dy)
+            if distance >= max_distance:
+                continue
+            shifted = revealed[r + dy:r + dy + height, r + dx:r + dx + width]
+            field[shifted] = np.minimum(field[shifted], distance)
+
+    return field
+
+
+class SoftFogLayer:
+    """
+    Fog-Ebene eines Karten-Ausschnitts
+    set_mask() bei Fog-Änderung (Distanzfeld), render() pro Frame (Wolken-Drift)
+    """
+
+    def __init__(self, seed=42):
+        density = seamless_cloud_texture(seed=seed)
+
+        # Einmal vorberechnet: Farbe (uint8) und Rand-Versatz (in Tiles) pro Wolken-Pixel
+        self.cloud_rgb = (FOG_DARK + density[..., None] * (FOG_LIGHT - FOG_DARK)).astype(np.uint8)
+        self.cloud_wisp = ((density - 0.5) * (2 * FOG_WISP_TILES)).astype(np.float32)
+        self.pixel_field = None  # Distanz in Tiles pro Pixel
+        self.origin = (0, 0)  # Pixel-Position des Ausschnitts auf der Karte
+        self.box = None  # (links, oben, rechts, unten) um alle Pixel mit Nebel - None = kein Nebel
+
+    def set_mask(self, hidden, tile_size, origin=(0, 0)):
+        """Distanzfeld neu berechnen - nur wenn sich der Nebel (oder Ausschnitt/Zoom) ändert"""
+        field = tile_distance_field(hidden)
+        height, width = hidden.shape
+
+        # Werte gelten für Tile-Mitten -> bilinear auf Pixel-Auflösung = weicher Verlauf
+        field_img = Image.fromarray(field, 'F').resize((width * tile_size, height * tile_size),
+                                                       Image.BILINEAR)
+        self.pixel_field = np.asarray(field_img)
+        self.origin = origin
+
+        # Nur hier kann Nebel sein (auch mit Wolken-Versatz) - Drift ändert nichts außerhalb
+        foggy = self.pixel_field > FOG_EDGE_START - FOG_WISP_TILES
+        rows = np.flatnonzero(foggy.any(axis=1))
+        cols = np.flatnonzero(foggy.any(axis=0))
+        self.box = (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1) if len(rows) else None
+
+    def render(self, frame=0, box=None):
+        """
+        RGBA-Overlay für einen Frame - Wolken in Karten-Koordinaten, damit Pannen sie nicht verschiebt
+        box: nur diesen Bereich (links, oben, rechts, unten) rendern, z.B. self.box bei reiner Drift
+        """
+        height, width = self.pixel_field.shape
+        left, top, right, bottom = box or (0, 0, width, height)
+        size = self.cloud_wisp.shape[0]
+
+        # Ganzzahlig gerechnet: Frame LOOP_FRAMES liegt exakt auf Frame 0
+        offset_x = int(self.origin[0]) + int(frame) * FOG_DRIFT[0] * size // LOOP_FRAMES
+        offset_y = int(self.origin[1]) + int(frame) * FOG_DRIFT[1] * size // LOOP_FRAMES
+        rows = (np.arange(top, bottom) + offset_y) % size
+        cols = (np.arange(left, right) + offset_x) % size
+
+        overlay = np.empty((bottom - top, right - left, 4), dtype=np.uint8)
+        overlay[..., :3] = self.cloud_rgb.take(rows, axis=0).take(cols, axis=1)
+
+        # Rand wabert mit den Wolken, Tile-Mitten bleiben voll deckend
+        alpha = self.cloud_wisp.take(rows, axis=0).take(cols, axis=1)
+        alpha += self.pixel_field[top:bottom, left:right]
+        alpha -= FOG_EDGE_START
+        alpha *= 255.0 / (FOG_EDGE_END - FOG_EDGE_START)
+        np.clip(alpha, 0.0, 255.0, out=alpha)
+        overlay[..., 3] = alpha
+
+        return Image.fromarray(overlay, 'RGBA')
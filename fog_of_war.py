@@ -7,6 +7,9 @@ import numpy as np
 class FogOfWar:
     """Verwaltet Nebel des Krieges (Fog-of-War) für die Karte"""
     
+    # Vorberechnete Kreis-Schablonen: sight_range -> (dy, dx) Offsets
+    _disc_stencils = {}
+    
     def __init__(self, width, height):
         self.width = width
         self.height = height
@@ -16,23 +19,42 @@ class FogOfWar:
         
         # Sichtweite (in Tiles)
         self.sight_range = 3
-        
+    
+    @classmethod
+    def disc_stencil(cls, radius):
+        """Offsets (dy, dx) aller Tiles im Kreis mit Radius radius (gecacht)"""
+        stencil = cls._disc_stencils.get(radius)
+        if stencil is None:
+            dy, dx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+            inside = dx * dx + dy * dy <= radius * radius
+            stencil = np.stack((dy[inside], dx[inside]), axis=1)
+            cls._disc_stencils[radius] = stencil
+        return stencil
+    
     def reveal_at_position(self, x, y, range_override=None):
         """
         Lichtet Nebel um eine Position herum
         """
+        self.reveal_positions([(x, y)], range_override)
+    
+    def reveal_positions(self, positions, range_override=None):
+        """
+        Lichtet Nebel um viele Positionen auf einmal (eine Masken-Operation statt Loops)
+        positions: Liste/Array von (x, y)
+        """
         sight_range = range_override if range_override is not None else self.sight_range
+        positions = np.asarray(positions, dtype=np.intp).reshape(-1, 2)
+        if len(positions) == 0:
+            return
+        
+        # Jede Position + jeder Schablonen-Offset -> alle Ziel-Tiles
+        stencil = self.disc_stencil(sight_range)
+        ys = (positions[:, 1, None] + stencil[None, :, 0]).ravel()
+        xs = (positions[:, 0, None] + stencil[None, :, 1]).ravel()
         
-        # Kreisförmigen Bereich aufdecken
-        for dy in range(-sight_range, sight_range + 1):
-            for dx in range(-sight_range, sight_range + 1):
-                # Distanz prüfen (kreisförmig)
-                if dx*dx + dy*dy <= sight_range*sight_range:
-                    nx, ny = x + dx, y + dy
-                    
-                    # Grenzen prüfen
-                    if 0 <= nx < self.width and 0 <= ny < self.height:
-                        self.revealed[ny][nx] = True
+        # Grenzen prüfen
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        self.revealed[ys[inside], xs[inside]] = True
     
     def reveal_area(self, x1, y1, x2, y2):
         """Deckt einen rechteckigen Bereich auf"""
@@ -65,7 +87,7 @@ class FogOfWar:
     def is_revealed(self, x, y):
         """Prüft ob ein Tile sichtbar ist"""
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.revealed[y][x]
+            return bool(self.revealed[y, x])
         return False
     
     def reveal_all(self):
@@ -78,12 +100,23 @@ class FogOfWar:
     
     def get_revealed_tiles(self):
         """Gibt Liste aller aufgedeckten Tiles zurück"""
-        tiles = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.revealed[y][x]:
-                    tiles.append((x, y))
-        return tiles
+        ys, xs = np.nonzero(self.revealed)
+        return list(zip(xs.tolist(), ys.tolist()))
+    
+    def get_hidden_mask(self, x1=0, y1=0, x2=None, y2=None):
+        """
+        Bool-Maske der verborgenen Tiles im Bereich [x1, x2) x [y1, y2) (Ende exklusiv)
+        Tiles außerhalb der Fog-Karte gelten als verborgen (wie bei is_revealed)
+        """
+        x2 = self.width if x2 is None else x2
+        y2 = self.height if y2 is None else y2
+        
+        mask = np.ones((max(0, y2 - y1), max(0, x2 - x1)), dtype=bool)
+        sx1, sy1 = max(0, x1), max(0, y1)
+        sx2, sy2 = min(self.width, x2), min(self.height, y2)
+        if sx1 < sx2 and sy1 < sy2:
+            mask[sy1 - y1:sy2 - y1, sx1 - x1:sx2 - x1] = ~self.revealed[sy1:sy2, sx1:sx2]
+        return mask
     
     def save_state(self):
         """Speichert aktuellen Fog-Status"""
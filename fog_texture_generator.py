@@ -8,6 +8,8 @@ import random
 import math
 import os
 
+from texture_cache import shared_texture_cache
+
 
 class FogTextureGenerator:
     """
@@ -17,7 +19,7 @@ class FogTextureGenerator:
     """
     
     def __init__(self):
-        self.texture_cache = {}
+        self.texture_cache = shared_texture_cache.namespace("fog")
         self.cloud_reference = None
         
         # Versuche das Cloud-Referenzbild zu finden
@@ -219,15 +221,17 @@ class FogTextureGenerator:
         """
         cache_key = f"{fog_type}_{size}"
         
-        if cache_key not in self.texture_cache:
+        texture = self.texture_cache.get(cache_key)
+        if texture is None:
             if fog_type == "dense":
-                self.texture_cache[cache_key] = self.generate_dense_fog_texture(size)
+                texture = self.generate_dense_fog_texture(size)
             elif fog_type == "light":
-                self.texture_cache[cache_key] = self.generate_light_fog_texture(size)
+                texture = self.generate_light_fog_texture(size)
             else:
-                self.texture_cache[cache_key] = self.generate_cloud_fog_texture(size)
+                texture = self.generate_cloud_fog_texture(size)
+            self.texture_cache[cache_key] = texture
         
-        return self.texture_cache[cache_key]
+        return texture
     
     def generate_animated_fog_frame(self, size=64, frame=0):
         """
@@ -0,0 +1,95 @@
+"""
+Frame-Pacing für den Projektor von "Der Eine Ring"
+Misst die Renderzeit pro Frame und wählt die Bildrate passend zum Zeit-Budget
+Animations-Frames folgen der Uhr - ist der Renderer zu langsam, werden Frames übersprungen
+"""
+import time
+
+
+# Animations-Geschwindigkeit: Frames der 240er-Loops pro Sekunde
+ANIMATION_FPS = 30
+
+# Ziel-Bildrate (Budget pro Frame = 1 / TARGET_FPS)
+TARGET_FPS = 30
+
+# Langsamer wird nie gerendert - lieber Frames überspringen
+MIN_FPS = 5
+
+# Luft über der gemessenen Renderzeit, damit der Tk-Loop Eingaben abarbeiten kann
+RENDER_HEADROOM = 1.25
+
+# Glättung der gemessenen Renderzeit (exponentieller Mittelwert)
+RENDER_TIME_SMOOTHING = 0.2
+
+# Mess-Fenster der Bildrate (Sekunden) und Abstand der Konsolen-Meldung
+FPS_WINDOW_SECONDS = 1
+FPS_REPORT_SECONDS = 10
+
+
+class FramePacer:
+    """
+    Taktgeber der Animations-Schleife
+    animation_frame() = Frame zur aktuellen Zeit, next_delay_ms() = Wartezeit bis zum nächsten Render,
+    frame_rendered() meldet die Kosten eines fertigen Frames
+    """
+
+    def __init__(self, target_fps=TARGET_FPS, animation_fps=ANIMATION_FPS, frame_count=240,
+                 clock=time.perf_counter):
+        self.clock = clock
+        self.budget = 1.0 / target_fps
+        self.animation_fps = animation_fps
+        self.frame_count = frame_count
+
+        self.render_time = 0.0  # Geglättete Kosten pro Frame (Sekunden)
+        self.interval = self.budget  # Aktueller Abstand zwischen zwei Renders
+        self.fps = 0.0  # Zuletzt gemessene Bildrate
+
+        self.start_time = clock()
+        self.last_tick = None
+        self.reset_window()
+
+    def reset_window(self):
+        """Neues Mess-Fenster (nach Leerlauf zählt die Pause nicht mit)"""
+        self.window_start = self.clock()
+        self.window_frames = 0
+        self.last_report = self.window_start
+        self.last_tick = None
+
+    def animation_frame(self):
+        """Animations-Frame zur aktuellen Zeit - unabhängig davon, wie oft gerendert wird"""
+        elapsed = self.clock() - self.start_time
+        return int(elapsed * self.animation_fps) % self.frame_count
+
+    def frame_rendered(self, seconds):
+        """Kosten eines fertigen Frames melden - passt die Render-Rate an"""
+        if self.render_time == 0.0:
+            self.render_time = seconds
+        else:
+            self.render_time += (seconds - self.render_time) * RENDER_TIME_SMOOTHING
+
+        # Im Budget: Ziel-Bildrate, sonst so schnell wie der Compositor es schafft
+        self.interval = min(max(self.budget, self.render_time * RENDER_HEADROOM), 1.0 / MIN_FPS)
+        self.window_frames += 1
+
+        now = self.clock()
+        elapsed = now - self.window_start
+        if elapsed >= FPS_WINDOW_SECONDS:
+            self.fps = self.window_frames / elapsed
+            self.window_start = now
+            self.window_frames = 0
+
+        if now - self.last_report >= FPS_REPORT_SECONDS:
+            print(f"Projektor: {self.fps:.1f} FPS (Frame {self.render_time * 1000:.1f} ms, "
+                  f"Ziel {1.0 / self.budget:.0f} FPS)")
+            self.last_report = now
+
+    def next_delay_ms(self):
+        """Wartezeit bis zum nächsten Render-Tick (ms) - Tick-Abstand = aktuelles Intervall"""
+        now = self.clock()
+        if self.last_tick is None:
+            self.last_tick = now
+        else:
+            # Verpasste Ticks nicht nachholen: nächster Tick relativ zu jetzt, wenn wir hinterher sind
+            self.last_tick = max(self.last_tick + self.interval, now - self.interval)
+        delay = self.last_tick + self.interval - now
+        return max(1, round(delay * 1000))
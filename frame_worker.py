@@ -0,0 +1,87 @@
+"""
+Render-Thread für den Projektor von "Der Eine Ring"
+Komponiert den nächsten Frame abseits des Tk-Event-Loops (Back-Buffer),
+Tk übernimmt nur das fertige Ergebnis ins PhotoImage (Front-Buffer)
+"""
+import threading
+import time
+
+
+class FrameWorker:
+    """
+    Ein Hintergrund-Thread, der Frame-Aufträge nacheinander ausführt
+    submit() ersetzt einen noch wartenden Auftrag (neuester Frame gewinnt),
+    take() holt die fertigen Updates ab - beides blockiert den Tk-Thread nie
+    """
+
+    def __init__(self, name="FrameWorker"):
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._job = None  # Nächster Auftrag (callable -> Liste von Updates)
+        self._result = None  # Fertige, noch nicht übernommene Updates
+        self._running = False
+        self._stopped = False
+        self.last_duration = 0.0  # Dauer des zuletzt fertigen Auftrags (Sekunden)
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, job):
+        """Neuen Frame-Auftrag einreihen - ein noch nicht gestarteter wird verworfen"""
+        with self._changed:
+            self._job = job
+            self._changed.notify_all()
+
+    def take(self):
+        """Fertige Updates abholen (None wenn nichts Neues da ist)"""
+        with self._lock:
+            result, self._result = self._result, None
+            return result
+
+    def busy(self):
+        """Läuft oder wartet ein Auftrag?"""
+        with self._lock:
+            return self._running or self._job is not None
+
+    def wait_idle(self):
+        """
+        Wartet bis kein Auftrag mehr läuft und verwirft alle Ergebnisse
+        Vor jedem Neuaufbau im Tk-Thread: danach gehört der Compositor-Zustand wieder Tk
+        """
+        with self._changed:
+            self._job = None
+            while self._running:
+                self._changed.wait()
+            self._result = None
+
+    def stop(self):
+        """Thread beenden (beim Schließen des Fensters)"""
+        with self._changed:
+            self._stopped = True
+            self._job = None
+            self._changed.notify_all()
+
+    def _run(self):
+        while True:
+            with self._changed:
+                while self._job is None and not self._stopped:
+                    self._changed.wait()
+                if self._stopped:
+                    return
+                job, self._job = self._job, None
+                self._running = True
+
+            started = time.perf_counter()
+            try:
+                updates = job()
+            except Exception as e:
+                print(f"Fehler im Render-Thread: {e}")
+                updates = None
+
+            with self._changed:
+                self._running = False
+                self.last_duration = time.perf_counter() - started
+                if updates:
+                    # Noch nicht übernommene Updates bleiben gültig - neue kommen obendrauf
+                    self._result = (self._result or []) + updates
+                self._changed.notify_all()
@@ -6,6 +6,15 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import cv2
 from PIL import Image, ImageTk
+from texture_cache import shared_texture_cache
+from perf_stats import shared_perf_stats
+from render_engine import RenderEngine
+
+# Aktualisierung des Performance-Tabs
+PERF_REFRESH_MS = 1000
+
+# Tile-Größe der interaktiven Fog-Karte
+FOG_MAP_TILE_SIZE = 8
 
 class GamemasterControlPanel(tk.Toplevel):
     """Kontrollpanel für den Spielleiter"""
@@ -31,6 +40,14 @@ class GamemasterControlPanel(tk.Toplevel):
         self.preview_running = False
         self.preview_label = None
         
+        # Performance-Tab
+        self.perf_refresh_id = None
+        
+        # Interaktive Fog-Karte: eigene Render-Engine (harte Tile-Kanten, kein Drift)
+        self.fog_map_engine = None
+        self.fog_map_photo = None
+        self.fog_map_image_id = None
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -63,6 +80,11 @@ class GamemasterControlPanel(tk.Toplevel):
         detail_frame = tk.Frame(notebook, bg="#1e1e1e")
         notebook.add(detail_frame, text="🏘️ Detail-Maps")
         self.setup_detail_maps_tab(detail_frame)
+        
+        # Tab 6: Performance
+        perf_frame = tk.Frame(notebook, bg="#1e1e1e")
+        notebook.add(perf_frame, text="📊 Performance")
+        self.setup_performance_tab(perf_frame)
     
     def setup_webcam_tab(self, parent):
         """Webcam-Steuerung Tab"""
@@ -129,6 +151,16 @@ class GamemasterControlPanel(tk.Toplevel):
                                      font=("Arial", 11, "bold"))
         fog_checkbox.pack(side=tk.LEFT, padx=5)
         
+        # Wolken-Drift (weicher Nebel) - kostet pro Frame ein Update des Nebel-Bereichs
+        drift = bool(self.projector_window and self.projector_window.engine.fog_drift)
+        self.fog_drift_var = tk.BooleanVar(value=drift)
+        drift_checkbox = tk.Checkbutton(toggle_frame, text="Wolken-Drift",
+                                       variable=self.fog_drift_var,
+                                       command=self.toggle_fog_drift,
+                                       bg="#1e1e1e", fg="white", selectcolor="#2d2d2d",
+                                       font=("Arial", 11))
+        drift_checkbox.pack(side=tk.LEFT, padx=5)
+        
         # Sichtweite
         sight_frame = tk.LabelFrame(parent, text="Sichtweite", bg="#2d2d2d", fg="white")
         sight_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -187,7 +219,7 @@ class GamemasterControlPanel(tk.Toplevel):
         
         # Info-Text
         info_text = ("Linksklick: Bereich enthüllen | Rechtsklick: Bereich verbergen\n"
-                    "Die Karte zeigt alle Tiles aufgedeckt - Grau = verborgen, Farbig = sichtbar")
+                    "Die Karte zeigt die Spieler-Ansicht - verborgene Tiles liegen im Nebel")
         info_label = tk.Label(map_frame, text=info_text, bg="#2d2d2d", fg="#aaaaaa",
                             font=("Arial", 8), justify=tk.LEFT)
         info_label.pack(padx=5, pady=2)
@@ -326,6 +358,49 @@ class GamemasterControlPanel(tk.Toplevel):
                               variable=self.sensitivity_var,
                               bg="#2d2d2d", fg="white", highlightthickness=0)
         sens_slider.pack(fill=tk.X, padx=5, pady=2)
+        
+        # Speicher-Budget des gemeinsamen Textur-Caches
+        tk.Label(perf_frame, text="Textur-Cache (MB):", bg="#2d2d2d", fg="white").pack(anchor=tk.W, padx=5, pady=2)
+        self.cache_budget_var = tk.IntVar(value=shared_texture_cache.budget_bytes // (1024 * 1024))
+        cache_slider = tk.Scale(perf_frame, from_=32, to=2048, resolution=32, orient=tk.HORIZONTAL,
+                               variable=self.cache_budget_var,
+                               command=self.update_cache_budget,
+                               bg="#2d2d2d", fg="white", highlightthickness=0)
+        cache_slider.pack(fill=tk.X, padx=5, pady=2)
+    
+    def setup_performance_tab(self, parent):
+        """Performance Tab - rollierende p50/p95 pro Render-Stufe des Projektors"""
+        title = tk.Label(parent, text="Projektor-Performance", font=("Arial", 16, "bold"),
+                        bg="#1e1e1e", fg="white")
+        title.pack(pady=10)
+        
+        self.perf_text = tk.Label(parent, text="", bg="#2d2d2d", fg="#00ff00",
+                                  font=("Courier", 11), justify=tk.LEFT, anchor=tk.NW)
+        self.perf_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        reset_btn = tk.Button(parent, text="🔄 Messwerte zurücksetzen",
+                             command=self.reset_performance_stats,
+                             bg="#2196F3", fg="white", font=("Arial", 11, "bold"),
+                             padx=15, pady=8)
+        reset_btn.pack(padx=10, pady=10)
+        
+        self.update_performance_tab()
+    
+    def update_performance_tab(self):
+        """Messwerte regelmäßig neu anzeigen"""
+        fps = None
+        if self.projector_window and hasattr(self.projector_window, 'pacer'):
+            fps = self.projector_window.pacer.fps
+        
+        lines = shared_perf_stats.report_lines(shared_texture_cache.stats(), fps)
+        self.perf_text.config(text="\n".join(lines))
+        self.perf_refresh_id = self.after(PERF_REFRESH_MS, self.update_performance_tab)
+    
+    def reset_performance_stats(self):
+        """Setzt Stufen-Messwerte und Cache-Zähler zurück"""
+        shared_perf_stats.reset()
+        shared_texture_cache.reset_stats()
+        self.perf_text.config(text="")
     
     def setup_detail_maps_tab(self, parent):
         """Detail-Maps Tab"""
@@ -444,6 +519,11 @@ class GamemasterControlPanel(tk.Toplevel):
             self.projector_window.fog_enabled = self.fog_enabled_var.get()
             self.projector_window.render_map()
     
+    def toggle_fog_drift(self):
+        """Wolken-Drift im Projektor ein/ausschalten"""
+        if self.projector_window:
+            self.projector_window.set_fog_drift(self.fog_drift_var.get())
+    
     def update_sight_range(self, value):
         """Aktualisiert Sichtweite"""
         val = int(float(value))
@@ -466,78 +546,47 @@ class GamemasterControlPanel(tk.Toplevel):
             self.update_fog_map()
     
     def update_fog_map(self):
-        """Zeichnet die interaktive Fog-Karte"""
+        """Zeichnet die interaktive Fog-Karte komplett neu (Karte aus dem Projektor übernehmen)"""
         if not self.projector_window or not hasattr(self, 'fog_map_canvas'):
             return
         
-        # Canvas leeren
-        self.fog_map_canvas.delete("all")
+        if self.fog_map_engine is None:
+            self.fog_map_engine = RenderEngine(texture_manager=self.projector_window.texture_manager)
+            self.fog_map_engine.fog_style = "tiles"
+            self.fog_map_engine.fog_drift = False
         
-        # Map-Daten holen
+        # Karte neu übernehmen - nur Chunks mit geänderten Tiles werden wirklich neu gerendert
+        # Raster der Projektor-Engine mitnutzen statt die Karte ein zweites Mal zu kodieren
         map_data = self.projector_window.map_data
-        width = map_data.get("width", 50)
-        height = map_data.get("height", 50)
-        tiles = map_data.get("tiles", [])
-        
-        # Kleine Tile-Größe für Overview
-        tile_size = 8
-        
-        # Farben für Terrain-Typen (vereinfacht)
-        terrain_colors = {
-            "grass": "#6ba868",
-            "water": "#4db8c4",
-            "water_h": "#4db8c4",
-            "water_v": "#4db8c4",
-            "mountain": "#8a8a8a",
-            "forest": "#3d6b3d",
-            "sand": "#d4c8a0",
-            "village": "#b8956f",
-            "road": "#8a7f6f",
-            "default": "#4a4a4a"
-        }
-        
-        # Karte zeichnen
-        for y in range(height):
-            for x in range(width):
-                # Terrain-Farbe
-                if y < len(tiles) and x < len(tiles[y]):
-                    terrain = tiles[y][x]
-                else:
-                    terrain = "grass"
-                
-                base_color = terrain_colors.get(terrain, terrain_colors["default"])
-                
-                # Fog-Status prüfen
-                is_revealed = self.projector_window.fog.is_revealed(x, y)
-                
-                # Farbe anpassen je nach Fog-Status
-                if is_revealed:
-                    fill_color = base_color  # Normal sichtbar
-                    outline = "#2a2a2a"
-                else:
-                    fill_color = "#3a3a3a"   # Grau = verborgen
-                    outline = "#2a2a2a"
-                
-                # Tile zeichnen
-                x1 = x * tile_size
-                y1 = y * tile_size
-                x2 = x1 + tile_size
-                y2 = y1 + tile_size
-                
-                tile_id = self.fog_map_canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    fill=fill_color,
-                    outline=outline,
-                    tags=f"tile_{x}_{y}"
-                )
+        projector_engine = self.projector_window.engine
+        grid = projector_engine.grid if projector_engine.map_data is map_data else None
+        self.fog_map_engine.set_map(map_data, grid=grid)
+        
+        self.fog_map_canvas.delete("all")
+        self.fog_map_image_id = None
+        self.draw_fog_map()
         
         # Canvas-Scroll-Region setzen
+        tile_size = FOG_MAP_TILE_SIZE
+        width = map_data.get("width", 50)
+        height = map_data.get("height", 50)
         self.fog_map_canvas.config(scrollregion=(0, 0, width * tile_size, height * tile_size))
         
         # Referenz für spätere Nutzung
         if not hasattr(self.fog_map_canvas, 'tile_size'):
             self.fog_map_canvas.tile_size = tile_size
     
+    def draw_fog_map(self):
+        """Fog-Karte aus der Render-Engine - nach Klicks werden nur geänderte Tiles neu komponiert"""
+        image = self.fog_map_engine.render(self.projector_window.fog, None, FOG_MAP_TILE_SIZE, animate=False)
+        self.fog_map_photo = ImageTk.PhotoImage(image)
+        
+        if self.fog_map_image_id is None:
+            self.fog_map_image_id = self.fog_map_canvas.create_image(0, 0, image=self.fog_map_photo,
+                                                                     anchor=tk.NW, tags="map")
+        else:
+            self.fog_map_canvas.itemconfig(self.fog_map_image_id, image=self.fog_map_photo)
+    
     def on_fog_map_left_click(self, event):
         """Linksklick auf Karte = Bereich enthüllen"""
         self._fog_map_click(event, reveal=True)
@@ -581,49 +630,9 @@ class GamemasterControlPanel(tk.Toplevel):
         # Projektor-Karte neu rendern
         self.projector_window.render_map()
         
-        # Eigene Karte lokal updaten (schneller)
-        self._update_fog_tiles_local(x1, y1, x2, y2, reveal)
-    
-    def _update_fog_tiles_local(self, x1, y1, x2, y2, reveal):
-        """Updatet nur die geänderten Tiles lokal (Performance)"""
-        if not hasattr(self, 'fog_map_canvas'):
-            return
-        
-        map_data = self.projector_window.map_data
-        tiles = map_data.get("tiles", [])
-        
-        terrain_colors = {
-            "grass": "#6ba868",
-            "water": "#4db8c4",
-            "water_h": "#4db8c4",
-            "water_v": "#4db8c4",
-            "mountain": "#8a8a8a",
-            "forest": "#3d6b3d",
-            "sand": "#d4c8a0",
-            "village": "#b8956f",
-            "road": "#8a7f6f",
-            "default": "#4a4a4a"
-        }
-        
-        # Nur geänderte Tiles updaten
-        for y in range(y1, y2 + 1):
-            for x in range(x1, x2 + 1):
-                # Terrain-Farbe
-                if y < len(tiles) and x < len(tiles[y]):
-                    terrain = tiles[y][x]
-                else:
-                    terrain = "grass"
-                
-                base_color = terrain_colors.get(terrain, terrain_colors["default"])
-                
-                # Neue Farbe je nach Reveal-Status
-                if reveal:
-                    fill_color = base_color
-                else:
-                    fill_color = "#3a3a3a"
-                
-                # Tile updaten
-                self.fog_map_canvas.itemconfig(f"tile_{x}_{y}", fill=fill_color)
+        # Eigene Karte updaten (nur geänderte Tiles)
+        if self.fog_map_engine is not None:
+            self.draw_fog_map()
     
     def reveal_area_fog(self):
         """Deckt ausgewählten Bereich auf (alte Methode mit Koordinaten)"""
@@ -655,6 +664,10 @@ class GamemasterControlPanel(tk.Toplevel):
         except ValueError:
             messagebox.showerror("Fehler", "Ungültige Koordinaten!")
     
+    def update_cache_budget(self, value):
+        """Setzt das Speicher-Budget des gemeinsamen Textur-Caches"""
+        shared_texture_cache.set_budget_mb(int(float(value)))
+    
     def update_zoom(self, value):
         """Aktualisiert Zoom-Level"""
         val = float(value)
@@ -727,6 +740,8 @@ class GamemasterControlPanel(tk.Toplevel):
     def destroy(self):
         """Aufräumen beim Schließen"""
         self.preview_running = False
+        if self.perf_refresh_id:
+            self.after_cancel(self.perf_refresh_id)
         super().destroy()
     
     # Preset-Funktionen für Fog-of-War
@@ -746,11 +761,7 @@ class GamemasterControlPanel(tk.Toplevel):
         center_x = width // 2
         center_y = height // 2
         
-        for dy in range(-2, 3):
-            for dx in range(-2, 3):
-                nx, ny = center_x + dx, center_y + dy
-                if 0 <= nx < width and 0 <= ny < height:
-                    self.projector_window.fog.revealed[ny][nx] = True
+        self.projector_window.fog.reveal_area(center_x - 2, center_y - 2, center_x + 2, center_y + 2)
         
         self.projector_window.render_map()
         self.update_fog_map()
@@ -5,6 +5,11 @@ from texture_manager import TextureManager
 from map_system import MapSystem
 from advanced_texture_renderer import AdvancedTextureRenderer
 from material_manager import MaterialBar, MaterialManagerWindow
+from map_autosave import COMPACT_INTERVAL_MS, MapAutosave
+from tile_grid import TileGrid
+
+# Abfrage-Intervall für Speichern im Hintergrund (ms)
+SAVE_POLL_MS = 100
 
 class MapEditor(tk.Frame):
     def __init__(self, parent, width=50, height=50, map_data=None):
@@ -15,6 +20,14 @@ class MapEditor(tk.Frame):
         # Map System
         self.map_system = MapSystem()
         
+        # Autosave: Journal + Snapshot - nach einem Absturz hier wiederherstellen
+        self.autosave = MapAutosave()
+        self.autosave_id = None
+        if self.autosave.has_recovery() and messagebox.askyesno(
+                "Autosave", "Der Editor wurde nicht sauber beendet.\n"
+                            "Nicht gespeicherte Änderungen wiederherstellen?", parent=self):
+            map_data = self.autosave.recover() or map_data
+        
         # Wenn Map-Daten übergeben wurden, diese laden
         if map_data:
             self.width = map_data.get("width", width)
@@ -25,6 +38,10 @@ class MapEditor(tk.Frame):
             self.map = self.create_empty_map()
             self.river_directions = {}  # River-Richtungen Dictionary (key: "x,y", value: direction)
         
+        # Raster-Modell: ALLE Änderungen laufen darüber (self.map / self.river_directions bleiben synchron)
+        self.grid = TileGrid.of(dict(map_data or {}, width=self.width, height=self.height, tiles=self.map,
+                                     river_directions=self.river_directions))
+        
         # NEUER Advanced Texture Renderer
         self.texture_renderer = AdvancedTextureRenderer()
         
@@ -51,13 +68,30 @@ class MapEditor(tk.Frame):
         self.tile_size = min(self.tile_size, 64)
         
         self.setup_ui()
+        
+        # Ausgangsstand als Snapshot, danach nur noch Änderungen ins Journal
+        self.autosave.snapshot(self.get_map_data())
+        self.grid.subscribe(self.on_grid_changed)
+        self.autosave_id = self.after(COMPACT_INTERVAL_MS, self.compact_autosave)
 
     def create_empty_map(self):
         return [["empty" for _ in range(self.width)] for _ in range(self.height)]
 
     def set_tile(self, x, y, terrain_type):
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.map[y][x] = terrain_type
+            self.grid.set(x, y, terrain_type)
+    
+    def on_grid_changed(self, grid, region):
+        """Änderungs-Meldung des Rasters: Tiles + Flussrichtungen ins Autosave-Journal (blockiert nie)"""
+        x0, y0, x1, y1 = region
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                self.autosave.record(x, y, grid.get(x, y), grid.direction(x, y))
+    
+    def compact_autosave(self):
+        """Timer: Journal zu einem Snapshot kompaktieren"""
+        self.autosave.compact(self.get_map_data())
+        self.autosave_id = self.after(COMPACT_INTERVAL_MS, self.compact_autosave)
     
     def setup_ui(self):
         """UI-Elemente erstellen"""
@@ -89,6 +123,10 @@ class MapEditor(tk.Frame):
                  font=("Arial", 10), padx=10, pady=5,
                  command=self.load_map).pack(side=tk.LEFT, padx=5)
         
+        tk.Button(file_frame, text="🖼️ Als Bild", bg="#7d5d2a", fg="white",
+                 font=("Arial", 10), padx=10, pady=5,
+                 command=self.export_image).pack(side=tk.LEFT, padx=5)
+        
         tk.Button(file_frame, text="� Material-Manager", bg="#5d2a7d", fg="white",
                  font=("Arial", 10), padx=10, pady=5,
                  command=self.open_material_manager).pack(side=tk.LEFT, padx=5)
@@ -314,8 +352,7 @@ class MapEditor(tk.Frame):
             if river_mode != "disabled":
                 # Set river direction for this tile (only if it's water)
                 if self.map[y][x] == "water":
-                    coord_key = f"{x},{y}"
-                    self.river_directions[coord_key] = river_mode
+                    self.grid.set_direction(x, y, river_mode)
                     self.update_tile(x, y)  # Refresh tile with new direction
             else:
                 # Normal tile placement
@@ -338,9 +375,7 @@ class MapEditor(tk.Frame):
             if river_mode != "disabled":
                 # Set river direction for water tiles while dragging
                 if self.map[y][x] == "water":
-                    coord_key = f"{x},{y}"
-                    if self.river_directions.get(coord_key) != river_mode:  # Only update if changed
-                        self.river_directions[coord_key] = river_mode
+                    if self.grid.set_direction(x, y, river_mode):  # Only update if changed
                         self.update_tile(x, y)
             else:
                 # Normal tile placement
@@ -498,17 +533,13 @@ class MapEditor(tk.Frame):
             "down-right": "up-left"
         }
         
-        # Finde alle Water-Tiles und kehre ihre Richtung um
+        # Finde alle Water-Tiles (mit Richtung) und kehre ihre Richtung um
         updated_count = 0
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.map[y][x] == "water":
-                    coord_key = f"{x},{y}"
-                    if coord_key in self.river_directions:
-                        old_dir = self.river_directions[coord_key]
-                        new_dir = reverse_map.get(old_dir, old_dir)
-                        self.river_directions[coord_key] = new_dir
-                        updated_count += 1
+        for x, y in self.grid.positions("water").tolist():
+            old_dir = self.grid.direction(x, y)
+            if old_dir is not None:
+                self.grid.set_direction(x, y, reverse_map.get(old_dir, old_dir))
+                updated_count += 1
         
         # Karte neu zeichnen
         self.draw_grid()
@@ -560,14 +591,12 @@ class MapEditor(tk.Frame):
             from collections import Counter
             direction_count = Counter(neighbor_directions)
             most_common_direction = direction_count.most_common(1)[0][0]
-            coord_key = f"{x},{y}"
-            self.river_directions[coord_key] = most_common_direction
+            self.grid.set_direction(x, y, most_common_direction)
             return
         
         # PRIORITÄT 2: Keine Nachbarn - Default "right"
         if not neighbors:
-            coord_key = f"{x},{y}"
-            self.river_directions[coord_key] = "right"
+            self.grid.set_direction(x, y, "right")
             return
         
         # PRIORITÄT 3: Analysiere geometrische Anordnung (WO sind die Nachbarn?)
@@ -668,34 +697,54 @@ class MapEditor(tk.Frame):
             else:
                 direction = "down" if avg_dy < 0 else "up"
         
-        coord_key = f"{x},{y}"
-        self.river_directions[coord_key] = direction
+        self.grid.set_direction(x, y, direction)
     
     def save_map(self):
         """Karte speichern"""
         filename = filedialog.asksaveasfilename(
-            defaultextension=".json",
-            filetypes=[("JSON Dateien", "*.json"), ("Alle Dateien", "*.*")],
+            defaultextension=".ringmap",
+            filetypes=[("Ring-Karten", "*.ringmap"), ("JSON Dateien", "*.json"), ("Alle Dateien", "*.*")],
+            initialdir="maps"
+        )
+        
+        if filename:
+            # Schreiben im Autosave-Thread - der Editor bleibt bedienbar
+            future = self.autosave.save_as(self.get_map_data(),
+                                           lambda map_data: self.map_system.export_map(map_data, filename))
+            self.after(SAVE_POLL_MS, self.poll_save, future, filename)
+    
+    def poll_save(self, future, filename):
+        """Wartet (ohne zu blockieren) auf das Speichern im Hintergrund"""
+        if not future.done():
+            self.after(SAVE_POLL_MS, self.poll_save, future, filename)
+            return
+        
+        error = future.exception()
+        if error:
+            messagebox.showerror("Fehler", f"Fehler beim Speichern:\n{error}")
+        else:
+            messagebox.showinfo("Erfolg", f"Karte gespeichert:\n{filename}")
+    
+    def export_image(self):
+        """Karte als PNG in voller Auflösung exportieren (Handout) - Animationen: map_export.py"""
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".png",
+            filetypes=[("PNG Bilder", "*.png"), ("Alle Dateien", "*.*")],
             initialdir="maps"
         )
         
         if filename:
-            map_data = {
-                "width": self.width,
-                "height": self.height,
-                "tiles": self.map
-            }
-            
             try:
-                self.map_system.export_map(map_data, filename)
-                messagebox.showinfo("Erfolg", f"Karte gespeichert:\n{filename}")
+                from map_export import export_map_png
+                export_map_png(self.get_map_data(), filename, tile_size=64)
+                messagebox.showinfo("Erfolg", f"Bild exportiert:\n{filename}")
             except Exception as e:
-                messagebox.showerror("Fehler", f"Fehler beim Speichern:\n{e}")
+                messagebox.showerror("Fehler", f"Fehler beim Exportieren:\n{e}")
     
     def load_map(self):
         """Karte laden"""
         filename = filedialog.askopenfilename(
-            filetypes=[("JSON Dateien", "*.json"), ("Alle Dateien", "*.*")],
+            filetypes=[("Karten", "*.ringmap *.json"), ("Alle Dateien", "*.*")],
             initialdir="maps"
         )
         
@@ -707,6 +756,13 @@ class MapEditor(tk.Frame):
                     self.width = map_data["width"]
                     self.height = map_data["height"]
                     self.map = map_data["tiles"]
+                    self.river_directions = map_data.get("river_directions", {})
+                    
+                    # Neues Raster, altes Journal verwerfen
+                    self.grid.unsubscribe(self.on_grid_changed)
+                    self.grid = TileGrid.of(map_data)
+                    self.autosave.snapshot(self.get_map_data())
+                    self.grid.subscribe(self.on_grid_changed)
                     
                     # Neu zeichnen
                     self.draw_grid()
@@ -717,13 +773,8 @@ class MapEditor(tk.Frame):
                 messagebox.showerror("Fehler", f"Fehler beim Laden:\n{e}")
     
     def get_map_data(self):
-        """Gibt die aktuellen Map-Daten zurück"""
-        return {
-            "width": self.width,
-            "height": self.height,
-            "tiles": self.map,
-            "river_directions": self.river_directions
-        }
+        """Gibt die aktuellen Map-Daten zurück (mit Raster - Projektor/Engine nutzen es direkt)"""
+        return self.grid.map_data()
     
     def start_animation(self):
         """Startet die Wasser-Animation"""
@@ -742,6 +793,12 @@ class MapEditor(tk.Frame):
         self.is_animating = False
         if self.animation_id:
             self.after_cancel(self.animation_id)
+        if self.autosave_id:
+            self.after_cancel(self.autosave_id)
+            self.autosave_id = None
+        
+        # Sauber beendet: Autosave wird nicht mehr gebraucht
+        self.autosave.close(discard=True)
         super().destroy()
 
 class DerEineRingApp:
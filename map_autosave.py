@@ -0,0 +1,242 @@
+"""
+Autosave für den Map-Editor von "Der Eine Ring"
+Jede Tile-Änderung landet als Zeile in einem Journal (nur anhängen), ein Hintergrund-Thread schreibt + fsynct
+Per Timer wird das Journal zu einem Snapshot (.ringmap, atomar) kompaktiert und geleert
+Nach einem Absturz: Snapshot laden und Journal darüber abspielen (recover)
+
+Dateien (maps/.autosave/):
+    <name>.ringmap   letzter Snapshot
+    <name>.journal   Änderungen seit dem Snapshot - eine JSON-Liste [x, y, material, richtung] pro Zeile
+"""
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from map_format import BINARY_EXTENSION, GRID_KEY, read_binary_map, write_binary_map
+
+
+# Ordner für Snapshot + Journal (versteckt - taucht nicht in der Kartenliste auf)
+AUTOSAVE_FOLDER = os.path.join("maps", ".autosave")
+
+# Sekunden, die der Schreib-Thread Änderungen sammelt, bevor er sie auf Disk bringt (ein fsync pro Stapel)
+FLUSH_INTERVAL = 0.5
+
+# Millisekunden zwischen zwei Kompaktierungen (Tk-Timer im Editor)
+COMPACT_INTERVAL_MS = 30000
+
+JOURNAL_EXTENSION = ".journal"
+
+# Aufträge für den Schreib-Thread
+_EDIT, _SNAPSHOT, _SAVE, _FLUSH, _STOP = range(5)
+
+
+def copy_map_data(map_data):
+    """Flache Kopie (Zeilen + Richtungen) - der Editor ändert die Originale weiter, während geschrieben wird"""
+    return {
+        "width": map_data.get("width", 50),
+        "height": map_data.get("height", 50),
+        "tiles": [list(row) for row in map_data.get("tiles", [])],
+        "river_directions": dict(map_data.get("river_directions", {}))
+    }
+
+
+def apply_edit(map_data, edit):
+    """Eine Journal-Zeile auf map_data anwenden (richtung None = Richtung entfernt)"""
+    x, y, material, direction = edit
+    tiles = map_data["tiles"]
+    if 0 <= y < len(tiles) and 0 <= x < len(tiles[y]):
+        tiles[y][x] = material
+    key = f"{x},{y}"
+    if direction is None:
+        map_data["river_directions"].pop(key, None)
+    else:
+        map_data["river_directions"][key] = direction
+
+
+class MapAutosave:
+    """
+    Journal + Snapshot für eine Editor-Sitzung
+    record()/snapshot() werden vom Tk-Thread aufgerufen und blockieren nie auf Disk -
+    alle Schreibzugriffe laufen der Reihe nach im Schreib-Thread (Journal-Zeilen nach einem Snapshot
+    gehören also immer zu Änderungen danach)
+    """
+
+    def __init__(self, folder=AUTOSAVE_FOLDER, name="editor", flush_interval=FLUSH_INTERVAL):
+        self.folder = folder
+        self.snapshot_path = os.path.join(folder, name + BINARY_EXTENSION)
+        self.journal_path = os.path.join(folder, name + JOURNAL_EXTENSION)
+        self.flush_interval = flush_interval
+
+        self.queue = queue.Queue()
+        self.journal = None
+        self.pending_edits = 0  # Änderungen seit dem letzten Snapshot (nur Tk-Thread)
+        self.closed = False
+
+        self.thread = threading.Thread(target=self.run, name="MapAutosave", daemon=True)
+        self.thread.start()
+
+    def record(self, x, y, material, direction=None):
+        """Tile-Änderung ins Journal (asynchron)"""
+        self.pending_edits += 1
+        self.queue.put((_EDIT, (x, y, material, direction)))
+
+    def snapshot(self, map_data):
+        """Journal zu einem Snapshot kompaktieren - map_data wird hier (im Tk-Thread) kopiert"""
+        self.pending_edits = 0
+        self.queue.put((_SNAPSHOT, copy_map_data(map_data)))
+
+    def compact(self, map_data):
+        """Für den Timer: Snapshot nur wenn sich seit dem letzten etwas geändert hat"""
+        if self.pending_edits:
+            self.snapshot(map_data)
+
+    def save_as(self, map_data, save):
+        """
+        Explizites Speichern im Schreib-Thread statt im Tk-Thread
+
+        Args:
+            map_data: Kartendaten (werden sofort kopiert)
+            save: Funktion(map_data) -> Pfad, z.B. MapSystem.export_map mit Ziel
+
+        Returns:
+            Future mit dem Pfad (oder der Exception) - im Tk-Thread per after() abfragen
+        """
+        future = Future()
+        self.queue.put((_SAVE, (copy_map_data(map_data), save, future)))
+        return future
+
+    def flush(self, timeout=None):
+        """Wartet bis alle bisherigen Aufträge auf Disk sind"""
+        done = threading.Event()
+        self.queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self, discard=True, timeout=10):
+        """
+        Schreib-Thread beenden
+        discard=True: sauber beendet - Snapshot + Journal löschen (nichts wiederherzustellen)
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put((_STOP, discard))
+        self.thread.join(timeout)
+
+    def run(self):
+        stop = None
+        while stop is None:
+            jobs = [self.queue.get()]
+            if jobs[0][0] == _EDIT:
+                # Drag-Malen erzeugt viele Änderungen kurz hintereinander - sammeln, ein fsync pro Stapel
+                time.sleep(self.flush_interval)
+            while True:
+                try:
+                    jobs.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            for kind, payload in jobs:
+                if stop is not None:
+                    break
+                if kind == _EDIT:
+                    lines.append(json.dumps(payload, ensure_ascii=False, separators=(',', ':')))
+                    continue
+
+                # Alles davor zuerst auf Disk - die Reihenfolge bleibt erhalten
+                self.append_lines(lines)
+                lines = []
+                if kind == _SNAPSHOT:
+                    self.write_snapshot(payload)
+                elif kind == _SAVE:
+                    self.run_save(*payload)
+                elif kind == _FLUSH:
+                    payload.set()
+                elif kind == _STOP:
+                    stop = payload
+            self.append_lines(lines)
+
+        self.close_journal()
+        if stop:
+            self.discard()
+
+    def append_lines(self, lines):
+        if not lines:
+            return
+        try:
+            if self.journal is None:
+                os.makedirs(self.folder, exist_ok=True)
+                self.journal = open(self.journal_path, 'a', encoding='utf-8')
+            self.journal.write("\n".join(lines) + "\n")
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+        except OSError as e:
+            print(f"Autosave-Journal nicht beschreibbar: {e}")
+
+    def write_snapshot(self, map_data):
+        """Snapshot atomar schreiben, DANACH Journal leeren (Absturz dazwischen: Journal wird doppelt
+        abgespielt - harmlos, jede Zeile setzt nur einen Wert)"""
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            write_binary_map(map_data, self.snapshot_path)
+            self.close_journal()
+            with open(self.journal_path, 'w', encoding='utf-8') as f:
+                os.fsync(f.fileno())
+        except OSError as e:
+            print(f"Autosave-Snapshot fehlgeschlagen: {e}")
+
+    @staticmethod
+    def run_save(map_data, save, future):
+        try:
+            future.set_result(save(map_data))
+        except Exception as e:
+            future.set_exception(e)
+
+    def close_journal(self):
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+
+    def discard(self):
+        for path in (self.journal_path, self.snapshot_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def has_recovery(self):
+        """Snapshot einer nicht sauber beendeten Sitzung vorhanden?"""
+        return os.path.exists(self.snapshot_path)
+
+    def recover(self):
+        """
+        Snapshot + Journal einer abgestürzten Sitzung
+
+        Returns:
+            map_data oder None (kein/defekter Snapshot)
+        """
+        try:
+            map_data = read_binary_map(self.snapshot_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Autosave-Snapshot nicht lesbar: {e}")
+            return None
+
+        replayed = 0
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        apply_edit(map_data, json.loads(line))
+                    except (ValueError, TypeError):
+                        break  # Letzte Zeile beim Absturz nur halb geschrieben
+                    replayed += 1
+        except OSError:
+            pass
+        if replayed:
+            map_data.pop(GRID_KEY, None)  # Journal hat die Listen geändert - Raster neu kodieren
+
+        print(f"✓ Autosave wiederhergestellt ({replayed} Änderungen aus dem Journal)")
+        return map_data
@@ -0,0 +1,255 @@
+"""
+Karten-Katalog für "Der Eine Ring"
+Index aller Karten im Maps-Ordner (maps/.catalog.json) mit Größe, Datum, Tile-Histogramm und Vorschaubild
+Einträge werden über mtime + Dateigröße geprüft - nur geänderte Karten werden neu gelesen
+"""
+import json
+import os
+
+import numpy as np
+from PIL import Image
+
+from map_format import BINARY_EXTENSION, encode_tiles, is_binary_map, load_map_arrays
+
+
+# Dateinamen im Maps-Ordner
+CATALOG_FILE = ".catalog.json"
+THUMBNAIL_FOLDER = ".thumbnails"
+
+# Bei Änderungen am Eintrags-Aufbau erhöhen (alter Katalog wird dann neu aufgebaut)
+CATALOG_VERSION = 2
+
+# Header-Feld einer konvertierten .ringmap: {"file", "mtime_ns", "file_size"} der geprüften JSON-Quelle
+# Solange die JSON-Datei unverändert ist, zeigt entries() nur die .ringmap
+CONVERTED_FROM = "converted_from"
+
+# Längste Kante des Vorschaubilds in Pixeln
+THUMBNAIL_SIZE = 96
+
+# Farbe für Materialien ohne bekannte Grundfarbe (wie im Renderer)
+UNKNOWN_COLOR = (128, 128, 128)
+
+# Sortier-Schlüssel für MapCatalog.entries()
+SORT_KEYS = {
+    "created": lambda entry: entry.get("created", ""),
+    "name": lambda entry: entry["filename"].lower(),
+    "size": lambda entry: entry.get("width", 0) * entry.get("height", 0),
+    "modified": lambda entry: entry.get("mtime_ns", 0)
+}
+
+_default_colors = None
+
+
+def default_material_colors():
+    """Grundfarben aller Materialien (Basis + custom) - einmal pro Prozess geladen"""
+    global _default_colors
+    if _default_colors is None:
+        from advanced_texture_renderer import AdvancedTextureRenderer
+        materials = AdvancedTextureRenderer().get_all_materials()
+        _default_colors = {material_id: tuple(data.get("color", UNKNOWN_COLOR))
+                           for material_id, data in materials.items()}
+    return _default_colors
+
+
+class MapCatalog:
+    """
+    Persistenter Index des Maps-Ordners
+    MapSystem hält ihn bei save_map/delete_map aktuell, refresh() fängt Änderungen von außen ab
+    (kopierte, gelöschte oder im Editor überschriebene Dateien)
+    """
+
+    def __init__(self, maps_folder, extensions=(BINARY_EXTENSION, ".json"), colors=None):
+        self.maps_folder = maps_folder
+        self.extensions = tuple(extensions)
+        self.colors = colors
+        self.catalog_path = os.path.join(maps_folder, CATALOG_FILE)
+        self.thumbnail_folder = os.path.join(maps_folder, THUMBNAIL_FOLDER)
+        self.catalog = self.load()
+
+    def load(self):
+        """Katalog von Disk - defekt oder alte Version: leer (wird beim nächsten refresh() neu aufgebaut)"""
+        try:
+            with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == CATALOG_VERSION:
+                return data.get("maps", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def save(self):
+        """Katalog atomar schreiben (temp-Datei + rename)"""
+        tmp_path = f"{self.catalog_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": CATALOG_VERSION, "maps": self.catalog}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.catalog_path)
+        except OSError as e:
+            print(f"Karten-Katalog nicht beschreibbar: {e}")
+
+    def refresh(self):
+        """
+        Gleicht den Katalog mit dem Ordner ab - nur neue/geänderte Dateien werden gelesen
+        Returns: Liste der Einträge (Dicts)
+        """
+        changed = False
+        seen = set()
+
+        try:
+            # Versteckte Dateien (u.a. der Katalog selbst) überspringen
+            files = [item for item in os.scandir(self.maps_folder)
+                     if item.is_file() and item.name.endswith(self.extensions) and not item.name.startswith(".")]
+        except OSError:
+            files = []
+
+        for item in files:
+            seen.add(item.name)
+            stat = item.stat()
+            entry = self.catalog.get(item.name)
+            if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("file_size") == stat.st_size:
+                continue
+            self.catalog[item.name] = self.index_file(item.name, stat)
+            changed = True
+
+        for filename in [name for name in self.catalog if name not in seen]:
+            self._drop(filename)
+            changed = True
+
+        if changed:
+            self.save()
+        return list(self.catalog.values())
+
+    def update(self, filename, map_data):
+        """
+        Nach dem Speichern: Eintrag sofort aktualisieren
+        Binär wird die (kleine) Datei gelesen, JSON aus den Daten im Speicher statt neu zu parsen
+        """
+        path = os.path.join(self.maps_folder, filename)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        if is_binary_map(path):
+            self.catalog[filename] = self.index_file(filename, stat)
+        else:
+            palette, indices = encode_tiles(map_data.get("tiles", []), map_data.get("width", 50),
+                                            map_data.get("height", 50))
+            self.catalog[filename] = self._entry(filename, stat, map_data.get("created", "Unbekannt"), palette,
+                                                 indices, "json")
+        self.save()
+
+    def remove(self, filename):
+        """Nach dem Löschen: Eintrag und Vorschaubild entfernen"""
+        if filename in self.catalog:
+            self._drop(filename)
+            self.save()
+
+    def index_file(self, filename, stat):
+        """Liest eine Karte und baut ihren Eintrag - binär ohne die Tiles in Strings umzuwandeln"""
+        path = os.path.join(self.maps_folder, filename)
+        try:
+            if is_binary_map(path):
+                header, indices, _ = load_map_arrays(path, mmap=False)
+                entry = self._entry(filename, stat, header.get("created", "Unbekannt"), header["palette"], indices,
+                                    "binary")
+                converted_from = header.get("extra", {}).get(CONVERTED_FROM)
+                if converted_from:
+                    entry[CONVERTED_FROM] = converted_from
+                return entry
+
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            palette, indices = encode_tiles(data["tiles"], data["width"], data["height"])
+            return self._entry(filename, stat, data.get("created", "Unbekannt"), palette, indices, "json")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Karte nicht lesbar ({filename}): {e}")
+            return {"filename": filename, "mtime_ns": stat.st_mtime_ns, "file_size": stat.st_size,
+                    "created": "Fehler beim Laden", "error": True}
+
+    def _entry(self, filename, stat, created, palette, indices, file_format):
+        height, width = indices.shape
+        counts = np.bincount(indices.ravel(), minlength=len(palette)) if indices.size else np.zeros(len(palette))
+        histogram = {material: int(count) for material, count in zip(palette, counts) if count}
+
+        return {
+            "filename": filename,
+            "format": file_format,
+            "mtime_ns": stat.st_mtime_ns,
+            "file_size": stat.st_size,
+            "created": created,
+            "width": width,
+            "height": height,
+            "histogram": dict(sorted(histogram.items(), key=lambda item: -item[1])),
+            "thumbnail": self._write_thumbnail(filename, palette, indices)
+        }
+
+    def _write_thumbnail(self, filename, palette, indices):
+        """Ein Pixel pro Tile in Material-Grundfarbe, auf THUMBNAIL_SIZE verkleinert"""
+        if not indices.size:
+            return None
+        colors = self.colors if self.colors is not None else default_material_colors()
+        lut = np.array([colors.get(material, UNKNOWN_COLOR) for material in palette], dtype=np.uint8)
+        image = Image.fromarray(lut[indices])
+
+        height, width = indices.shape
+        scale = THUMBNAIL_SIZE / max(width, height)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        # Kleine Karten: harte Kanten (NEAREST), große: gemittelt (BOX)
+        image = image.resize(size, Image.NEAREST if scale >= 1 else Image.BOX)
+
+        name = f"{filename}.png"
+        try:
+            os.makedirs(self.thumbnail_folder, exist_ok=True)
+            image.save(os.path.join(self.thumbnail_folder, name), compress_level=1)
+        except OSError as e:
+            print(f"Vorschaubild nicht gespeichert ({filename}): {e}")
+            return None
+        return name
+
+    def _drop(self, filename):
+        entry = self.catalog.pop(filename)
+        if entry.get("thumbnail"):
+            try:
+                os.remove(os.path.join(self.thumbnail_folder, entry["thumbnail"]))
+            except OSError:
+                pass
+
+    def thumbnail_path(self, filename):
+        """Pfad des Vorschaubilds oder None"""
+        entry = self.catalog.get(filename)
+        if entry and entry.get("thumbnail"):
+            return os.path.join(self.thumbnail_folder, entry["thumbnail"])
+        return None
+
+    def entries(self, query="", material=None, sort_by="created", reverse=None):
+        """
+        Gefilterte und sortierte Einträge (nach refresh())
+
+        Args:
+            query: Teil des Dateinamens (Groß-/Kleinschreibung egal)
+            material: Nur Karten, die dieses Material enthalten
+            sort_by: "created", "name", "size" oder "modified"
+            reverse: Absteigend (Standard: Name aufsteigend, alles andere absteigend)
+        """
+        query = query.lower()
+        replaced = self.replaced_json()
+        result = [entry for entry in self.catalog.values()
+                  if query in entry["filename"].lower() and entry["filename"] not in replaced
+                  and (material is None or material in entry.get("histogram", {}))]
+        if reverse is None:
+            reverse = sort_by != "name"
+        return sorted(result, key=SORT_KEYS[sort_by], reverse=reverse)
+
+    def replaced_json(self):
+        """JSON-Karten mit geprüfter .ringmap-Kopie (seit der Konvertierung unverändert) - werden nicht gelistet"""
+        replaced = set()
+        for entry in self.catalog.values():
+            source = entry.get(CONVERTED_FROM)
+            # Nur der Zwilling mit gleichem Namen zählt (Kopie unter anderem Namen trägt das Feld mit)
+            if not source or os.path.splitext(source.get("file", ""))[0] != os.path.splitext(entry["filename"])[0]:
+                continue
+            json_entry = self.catalog.get(source.get("file"))
+            if json_entry and json_entry.get("mtime_ns") == source.get("mtime_ns") and \
+                    json_entry.get("file_size") == source.get("file_size"):
+                replaced.add(source["file"])
+        return replaced
@@ -0,0 +1,129 @@
+"""
+Chunk-Cache für die statische Kartenebene von "Der Eine Ring"
+Die Karte wird in feste Blöcke (z.B. 16x16 Tiles) pro Zoom-Stufe zerlegt
+Änderungen invalidieren nur die betroffenen Chunks, Verdrängung per LRU-Budget
+"""
+import numpy as np
+
+from texture_cache import TextureCache
+from tile_grid import palette_lut
+
+
+# Tiles pro Chunk-Kante
+CHUNK_SIZE = 16
+
+# Eigenes Budget, damit Chunks nicht die Tile-Texturen verdrängen
+DEFAULT_CHUNK_BUDGET_MB = 128
+
+
+class MapChunkCache:
+    """
+    Gerenderte Chunks der statischen Ebene: Key = (tile_size, chunk_x, chunk_y)
+    Merkt sich den Karten-Stand, aus dem die Chunks gerendert wurden
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE, budget_mb=DEFAULT_CHUNK_BUDGET_MB):
+        self.chunk_size = chunk_size
+        self.cache = TextureCache(budget_mb)
+
+        # Snapshot des Rasters (Editor ändert es in-place!) - Arrays + Paletten
+        self.grid = None
+        self.grid_version = None
+        self.materials_snapshot = None
+        self.palette_snapshot = None
+        self.directions_snapshot = None
+        self.direction_palette_snapshot = None
+        self.map_size = None
+
+    def get(self, tile_size, chunk_x, chunk_y):
+        return self.cache.get((tile_size, chunk_x, chunk_y))
+
+    def put(self, tile_size, chunk_x, chunk_y, image):
+        return self.cache.put((tile_size, chunk_x, chunk_y), image)
+
+    def chunk_range(self, chunk_x, chunk_y, width, height):
+        """Tile-Bereich (x0, y0, x1, y1) eines Chunks - Ende exklusiv"""
+        size = self.chunk_size
+        return (chunk_x * size, chunk_y * size,
+                min(width, (chunk_x + 1) * size), min(height, (chunk_y + 1) * size))
+
+    def chunks_for_range(self, tile_range):
+        """Alle Chunk-Koordinaten, die einen Tile-Bereich überdecken"""
+        x0, y0, x1, y1 = tile_range
+        size = self.chunk_size
+        if x1 <= x0 or y1 <= y0:
+            return []
+        return [(cx, cy)
+                for cy in range(y0 // size, (y1 - 1) // size + 1)
+                for cx in range(x0 // size, (x1 - 1) // size + 1)]
+
+    def sync(self, grid):
+        """
+        Vergleicht das Raster (TileGrid) mit dem letzten Stand und invalidiert nur geänderte Chunks
+        Auch ein anderes Raster gleicher Größe (neu geladene Karte) wird verglichen statt alles zu verwerfen
+        Gibt die Anzahl invalidierter Chunks zurück
+        """
+        if grid is self.grid and grid.version == self.grid_version:
+            return 0  # Nichts geändert - kein Vergleich nötig
+
+        if self.map_size != (grid.width, grid.height) or self.materials_snapshot is None:
+            # Neue Karte oder andere Größe: alles verwerfen
+            removed = len(self.cache)
+            self.cache.clear()
+        else:
+            changed = self.changed_tiles(grid)
+            removed = self.invalidate_tiles(changed) if len(changed) else 0
+
+        self.grid = grid
+        self.grid_version = grid.version
+        self.materials_snapshot = grid.materials.copy()
+        self.palette_snapshot = list(grid.palette)
+        self.directions_snapshot = grid.directions.copy()
+        self.direction_palette_snapshot = list(grid.direction_palette)
+        self.map_size = (grid.width, grid.height)
+        return removed
+
+    def changed_tiles(self, grid):
+        """Positionen [[x, y], ...], deren Material oder Fluss-Richtung sich geändert hat (über die Paletten)"""
+        old_materials = palette_lut(self.palette_snapshot, grid.index, -1)[self.materials_snapshot]
+        changed = old_materials != grid.materials
+
+        old_directions = np.concatenate(([0], palette_lut(self.direction_palette_snapshot,
+                                                          grid.direction_index, -1)))
+        changed |= old_directions[self.directions_snapshot] != grid.directions
+
+        ys, xs = np.nonzero(changed)
+        return np.column_stack((xs, ys))
+
+    def invalidate_tiles(self, positions):
+        """
+        Entfernt alle Chunks (jeder Zoom-Stufe), die geänderte Tiles enthalten
+        Village-Rauch ragt 2 Tiles nach rechts/oben -> Nachbar-Chunks mit prüfen
+        """
+        size = self.chunk_size
+        coords = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        xs, ys = coords[:, 0], coords[:, 1]
+        dirty_chunks = set()
+        for cx in (xs // size, (xs + 2) // size):
+            for cy in (ys // size, np.maximum(0, ys - 2) // size):
+                pairs = np.unique(np.column_stack((cx, cy)), axis=0)
+                dirty_chunks.update(map(tuple, pairs.tolist()))
+
+        removed = 0
+        for key in self.cache.keys():
+            if (key[1], key[2]) in dirty_chunks:
+                self.cache.remove(key)
+                removed += 1
+        return removed
+
+    def clear(self):
+        """Verwirft alle Chunks"""
+        self.cache.clear()
+        self.grid = None
+        self.grid_version = None
+        self.materials_snapshot = None
+        self.directions_snapshot = None
+        self.map_size = None
+
+    def stats(self):
+        return self.cache.stats()
@@ -0,0 +1,338 @@
+"""
+Offline-Export für "Der Eine Ring"
+Große Karten als PNG (zeilenweise gestreamt - nie das ganze Bild im Speicher) oder als Kachel-Ordner,
+Animations-Loop (240 Frames) als GIF/WebP/Video - Frames parallel in Worker-Prozessen
+
+Aufruf:
+    python map_export.py maps/karte.json --image karte.png --tile-size 64
+    python map_export.py maps/karte.json --tiles karte_tiles/
+    python map_export.py maps/karte.json --animation loop.webp --tile-size 32 --workers 4
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import struct
+import sys
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+try:
+    import imageio
+except ImportError:
+    imageio = None  # Nur für Video-Export nötig (GIF/WebP schreibt Pillow)
+
+from animation_atlas import ANIMATION_FRAMES
+from fog_engine import MAX_FIELD_TILES
+from fog_of_war import FogOfWar
+from render_engine import RenderEngine
+
+
+# Tile-Zeilen pro gerendertem Streifen (= Chunk-Größe des Chunk-Caches)
+STRIP_TILES = 16
+
+# Weicher Nebel braucht Nachbar-Tiles über/unter dem Streifen (Distanzfeld + bilineare Kanten)
+FOG_MARGIN_TILES = MAX_FIELD_TILES + 1
+
+# Kantenlänge (in Tiles) der Kacheln beim Ordner-Export
+EXPORT_TILE_TILES = 16
+
+# Frames pro Worker-Auftrag (innerhalb eines Auftrags rendert die Engine inkrementell)
+FRAMES_PER_JOB = 8
+
+# PNG: IDAT-Blöcke ab dieser Größe schreiben
+PNG_CHUNK_BYTES = 1 << 20
+
+# Dateiendungen, die Pillow direkt als Animation schreibt
+PILLOW_ANIMATION_FORMATS = {".gif": "GIF", ".webp": "WEBP"}
+
+# Pillow sammelt beim GIF/WebP-Schreiben ALLE Frames im Speicher (WebP: list(append_images)) -
+# größere Loops (Breite x Höhe x 3 Byte x Frames) werden abgelehnt, Video wird gestreamt
+PILLOW_ANIMATION_BYTES = 1 << 30
+
+
+class PngStreamWriter:
+    """
+    Schreibt ein RGB-PNG zeilenweise - Speicherbedarf unabhängig von der Bildgröße
+    Aufruf: write_rows(array H x W x 3) beliebig oft, dann close()
+    """
+
+    def __init__(self, path, width, height, compress_level=6):
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self.file = open(path, 'wb')
+        self.compressor = zlib.compressobj(compress_level)
+        self.pending = []
+        self.pending_size = 0
+
+        self.file.write(b'\x89PNG\r\n\x1a\n')
+        # 8 Bit pro Kanal, Farbtyp 2 = RGB, Standard-Kompression/-Filter, kein Interlacing
+        self._write_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+    def _write_chunk(self, chunk_type, data):
+        self.file.write(struct.pack('>I', len(data)))
+        self.file.write(chunk_type)
+        self.file.write(data)
+        self.file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(chunk_type)) & 0xffffffff))
+
+    def _flush(self, data):
+        self.pending.append(data)
+        self.pending_size += len(data)
+        if self.pending_size >= PNG_CHUNK_BYTES:
+            self._write_chunk(b'IDAT', b''.join(self.pending))
+            self.pending = []
+            self.pending_size = 0
+
+    def write_rows(self, rows):
+        rows = np.ascontiguousarray(rows, dtype=np.uint8)
+        if rows.shape[1:] != (self.width, 3):
+            raise ValueError(f"Zeilen haben Form {rows.shape}, erwartet (n, {self.width}, 3)")
+        if self.rows_written + rows.shape[0] > self.height:
+            raise ValueError("Mehr Zeilen als im PNG-Header angegeben")
+
+        # Filter-Typ 0 (None) vor jeder Zeile
+        filtered = np.zeros((rows.shape[0], self.width * 3 + 1), dtype=np.uint8)
+        filtered[:, 1:] = rows.reshape(rows.shape[0], -1)
+        self._flush(self.compressor.compress(filtered.tobytes()))
+        self.rows_written += rows.shape[0]
+
+    def close(self):
+        if self.rows_written != self.height:
+            self.file.close()
+            raise ValueError(f"PNG unvollständig: {self.rows_written}/{self.height} Zeilen")
+        self._flush(self.compressor.flush())
+        if self.pending:
+            self._write_chunk(b'IDAT', b''.join(self.pending))
+        self._write_chunk(b'IEND', b'')
+        self.file.close()
+
+
+def fog_from_state(width, height, revealed):
+    """FogOfWar aus einem gespeicherten revealed-Array (None = ohne Nebel)"""
+    if revealed is None:
+        return None
+    fog = FogOfWar(width, height)
+    fog.load_state(np.asarray(revealed, dtype=bool))
+    return fog
+
+
+def render_rows(engine, fog, tile_range, tile_size, frame=0, fog_enabled=True):
+    """
+    Rendert einen Tile-Bereich so, dass er nahtlos an Nachbarn passt
+    Mit Nebel wird mit Rand gerendert und zugeschnitten (Distanzfeld sieht die Nachbar-Tiles)
+    """
+    x0, y0, x1, y1 = tile_range
+    if fog is None or not fog_enabled:
+        return engine.render_array(fog, tile_range, tile_size, frame, fog_enabled, animate=False)
+
+    margin = FOG_MARGIN_TILES
+    padded = (max(0, x0 - margin), max(0, y0 - margin),
+              min(engine.width, x1 + margin), min(engine.height, y1 + margin))
+    image = engine.render_array(fog, padded, tile_size, frame, fog_enabled, animate=False)
+    top = (y0 - padded[1]) * tile_size
+    left = (x0 - padded[0]) * tile_size
+    return image[top:top + (y1 - y0) * tile_size, left:left + (x1 - x0) * tile_size]
+
+
+def export_map_png(map_data, path, tile_size=64, fog=None, renderer=None, progress=print):
+    """
+    Ganze Karte als PNG (Frame 0) - Streifen für Streifen gerendert und gestreamt
+    fog: FogOfWar für eine Spieler-Ansicht, None = alles sichtbar
+    """
+    engine = RenderEngine(renderer)
+    engine.set_map(map_data)
+    width, height = engine.width, engine.height
+
+    writer = PngStreamWriter(path, width * tile_size, height * tile_size)
+    for y0 in range(0, height, STRIP_TILES):
+        y1 = min(height, y0 + STRIP_TILES)
+        writer.write_rows(render_rows(engine, fog, (0, y0, width, y1), tile_size))
+        if progress:
+            progress(f"PNG-Export: {y1}/{height} Tile-Zeilen")
+    writer.close()
+    return path
+
+
+def export_map_tiles(map_data, folder, tile_size=64, fog=None, renderer=None, progress=print):
+    """
+    Karte als Ordner mit Kacheln (tile_<x>_<y>.png) + index.json - für Viewer mit Kachel-Nachladen
+    """
+    engine = RenderEngine(renderer)
+    engine.set_map(map_data)
+    width, height = engine.width, engine.height
+    os.makedirs(folder, exist_ok=True)
+
+    step = EXPORT_TILE_TILES
+    files = []
+    for y0 in range(0, height, step):
+        for x0 in range(0, width, step):
+            tile_range = (x0, y0, min(width, x0 + step), min(height, y0 + step))
+            filename = f"tile_{x0 // step}_{y0 // step}.png"
+            Image.fromarray(render_rows(engine, fog, tile_range, tile_size)).save(os.path.join(folder, filename))
+            files.append({"file": filename, "range": tile_range})
+        if progress:
+            progress(f"Kachel-Export: {min(height, y0 + step)}/{height} Tile-Zeilen")
+
+    index = {
+        "map_width": width,
+        "map_height": height,
+        "tile_size": tile_size,
+        "tiles_per_image": step,
+        "image_size": [width * tile_size, height * tile_size],
+        "tiles": files
+    }
+    with open(os.path.join(folder, "index.json"), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    return folder
+
+
+# Zustand pro Worker-Prozess (einmal im Initializer aufgebaut)
+_worker_engine = None
+_worker_job = None
+
+
+def _init_animation_worker(map_data, revealed, view_range, tile_size, fog_enabled):
+    global _worker_engine, _worker_job
+    _worker_engine = RenderEngine()
+    _worker_engine.set_map(map_data)
+    fog = fog_from_state(_worker_engine.width, _worker_engine.height, revealed)
+    _worker_job = (fog, view_range, tile_size, fog_enabled)
+
+
+def _render_frame_range(frames):
+    """Läuft im Worker: zusammenhängende Frames (inkrementell) - zurück als (Größe, Pixel-Puffer)"""
+    fog, view_range, tile_size, fog_enabled = _worker_job
+    results = []
+    for frame in frames:
+        image = _worker_engine.render(fog, view_range, tile_size, frame, fog_enabled)
+        results.append((image.size, image.tobytes()))
+    return results
+
+
+def iter_animation_frames(map_data, fog=None, view_range=None, tile_size=32, frame_count=ANIMATION_FRAMES,
+                          fog_enabled=True, workers=None, progress=print):
+    """
+    Liefert alle Frames des Animations-Loops der Reihe nach als PIL-Bilder
+    workers > 1: Frame-Blöcke in einem Prozess-Pool, nur wenige Blöcke gleichzeitig unterwegs
+    """
+    revealed = fog.save_state() if fog is not None else None
+    jobs = [range(start, min(frame_count, start + FRAMES_PER_JOB))
+            for start in range(0, frame_count, FRAMES_PER_JOB)]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+
+    if workers <= 1:
+        _init_animation_worker(map_data, revealed, view_range, tile_size, fog_enabled)
+        results = (_render_frame_range(job) for job in jobs)
+        executor = None
+    else:
+        # spawn wie beim Textur-Vorwärmen: gleiches Verhalten unter Windows und Linux
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_animation_worker,
+            initargs=(map_data, revealed, view_range, tile_size, fog_enabled)
+        )
+        results = _ordered_results(executor, jobs, workers * 2)
+
+    done = 0
+    try:
+        for block in results:
+            for size, pixels in block:
+                yield Image.frombytes('RGB', size, pixels)
+            done += len(block)
+            if progress:
+                progress(f"Animation: {done}/{frame_count} Frames")
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _ordered_results(executor, jobs, window):
+    """Ergebnisse in Auftrags-Reihenfolge - höchstens window Aufträge gleichzeitig (Speicher!)"""
+    pending = deque()
+    queued = deque(jobs)
+    while queued or pending:
+        while queued and len(pending) < window:
+            pending.append(executor.submit(_render_frame_range, queued.popleft()))
+        yield pending.popleft().result()
+
+
+def export_animation(map_data, path, fog=None, view_range=None, tile_size=32, frame_count=ANIMATION_FRAMES,
+                     fps=30, fog_enabled=True, workers=None, progress=print):
+    """
+    Animations-Loop als GIF/WebP (Pillow) oder Video (.mp4, .avi, ... über imageio)
+    Video: Frames werden gestreamt - auch lange Loops großer Karten passen in den Speicher
+    GIF/WebP: Pillow hält alle Frames - über PILLOW_ANIMATION_BYTES ValueError (vor dem Rendern)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in PILLOW_ANIMATION_FORMATS:
+        x0, y0, x1, y1 = view_range or (0, 0, map_data.get("width", 50), map_data.get("height", 50))
+        loop_bytes = (x1 - x0) * (y1 - y0) * tile_size * tile_size * 3 * frame_count
+        if loop_bytes > PILLOW_ANIMATION_BYTES:
+            raise ValueError(f"{extension}-Loop zu groß ({loop_bytes >> 20} MiB im Speicher) - "
+                             f"kleinere --tile-size, weniger Frames oder Video (.mp4) verwenden")
+
+    frames = iter_animation_frames(map_data, fog, view_range, tile_size, frame_count,
+                                   fog_enabled, workers, progress)
+
+    if extension in PILLOW_ANIMATION_FORMATS:
+        first = next(frames)
+        first.save(path, PILLOW_ANIMATION_FORMATS[extension], save_all=True, append_images=frames,
+                   duration=round(1000 / fps), loop=0)
+        return path
+
+    if imageio is None:
+        frames.close()
+        raise RuntimeError(f"Video-Export ({extension}) braucht imageio: pip install imageio imageio-ffmpeg")
+
+    writer = imageio.get_writer(path, fps=fps)
+    try:
+        for image in frames:
+            writer.append_data(np.asarray(image))
+    finally:
+        writer.close()
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Karten-Export für Der Eine Ring")
+    parser.add_argument("map", help="Karten-Datei (JSON)")
+    parser.add_argument("--image", help="Ganze Karte als PNG (gestreamt)")
+    parser.add_argument("--tiles", help="Ordner für Kachel-Export")
+    parser.add_argument("--animation", help="Animations-Loop (.gif, .webp, .mp4, ...)")
+    parser.add_argument("--tile-size", type=int, default=64, help="Pixel pro Tile")
+    parser.add_argument("--frames", type=int, default=ANIMATION_FRAMES, help="Frames im Loop")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--workers", type=int, help="Worker-Prozesse für die Animation (Default: alle Kerne)")
+    args = parser.parse_args(argv)
+
+    if not (args.image or args.tiles or args.animation):
+        parser.error("mindestens eines von --image, --tiles, --animation angeben")
+
+    from map_system import MapSystem
+    map_path = os.path.abspath(args.map)
+    map_data = MapSystem(maps_folder=os.path.dirname(map_path)).load_map(map_path)
+    if not map_data:
+        print(f"❌ Karte nicht lesbar: {args.map}")
+        return 1
+
+    if args.image:
+        export_map_png(map_data, args.image, args.tile_size)
+        print(f"💾 Bild gespeichert: {args.image}")
+    if args.tiles:
+        export_map_tiles(map_data, args.tiles, args.tile_size)
+        print(f"💾 Kacheln gespeichert: {args.tiles}")
+    if args.animation:
+        export_animation(map_data, args.animation, tile_size=args.tile_size, frame_count=args.frames,
+                         fps=args.fps, workers=args.workers)
+        print(f"💾 Animation gespeichert: {args.animation}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,411 @@
+"""
+Binäres Karten-Format für "Der Eine Ring" (.ringmap)
+Material-Palette + uint8/uint16-Tile-Array + gepackte Fluss-Richtungen statt JSON-Listen aus Strings
+
+Aufbau:
+    MAGIC (8 Byte) | Format-Version (uint16) | Header-Länge (uint32) | Header (JSON, UTF-8)
+    danach die Arrays, je auf SECTION_ALIGN Bytes ausgerichtet - roh (per mmap ohne Kopie ladbar)
+    oder zlib-komprimiert, was kleiner ist; große Tile-Abschnitte (ab RAW_TILES_BYTES) immer roh
+"""
+import json
+import os
+import struct
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+
+
+# Dateiendung und Kennung
+BINARY_EXTENSION = ".ringmap"
+MAGIC = b"RINGMAP\x00"
+
+# Aktuelle Format-Version (ältere werden gelesen, neuere abgelehnt)
+MAP_FORMAT_VERSION = 1
+
+# Ausrichtung der Arrays in der Datei (mmap-freundlich)
+SECTION_ALIGN = 64
+
+# Komprimieren nur wenn es mindestens so viel spart (sonst roh = mmap-fähig)
+COMPRESSION_GAIN = 0.9
+
+# Tile-Abschnitt ab dieser Größe IMMER roh: Laden per mmap statt alles auf einmal zu entpacken
+# (2048x2048 Tiles mit uint8 = 4 MiB - kleinere Karten werden weiter komprimiert)
+RAW_TILES_BYTES = 1 << 22
+
+# zlib-Stufe: Karten bestehen aus langen Läufen gleicher Indizes - höhere Stufen sparen kaum, kosten aber Zeit
+COMPRESSION_LEVEL = 1
+
+# Material für fehlende Tiles (kurze/fehlende Zeilen in alten Karten)
+DEFAULT_MATERIAL = "grass"
+
+# Lesegröße beim stückweisen Entpacken (iter_tile_blocks)
+STREAM_READ_BYTES = 1 << 16
+
+# Fluss-Richtungen: 0 = keine, sonst Index+1 in die Richtungs-Palette - zwei pro Byte (4 Bit)
+MAX_PACKED_DIRECTIONS = 15
+
+_PREFIX = struct.Struct('<8sHI')
+
+# Schlüssel für das mitgeführte TileGrid (tile_grid.py) - Laufzeit-Objekt, wird nie gespeichert
+GRID_KEY = "grid"
+
+# Schlüssel, die als Arrays gespeichert werden (alles andere landet im Header unter "extra")
+_ARRAY_KEYS = ("width", "height", "tiles", "river_directions", "version", "created", GRID_KEY)
+
+
+class MapFormatError(ValueError):
+    """Datei ist keine gültige .ringmap (oder aus einer neueren Version)"""
+
+
+@contextmanager
+def atomic_write(path, mode='wb', encoding=None):
+    """
+    Schreibt über eine temporäre Datei: fsync, dann rename
+    Absturz mitten im Schreiben: die alte Datei bleibt unverändert - NIE eine halbe Karte
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_folder(os.path.dirname(path))
+
+
+def _fsync_folder(folder):
+    """Rename selbst auf Disk bringen (nur POSIX - Windows kann Ordner nicht fsyncen)"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        fd = os.open(folder or ".", os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def is_binary_map(path):
+    """Prüft die Kennung am Dateianfang (nicht die Endung)"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def encode_tiles(tiles, width, height):
+    """Tiles (Listen aus Strings) -> (Palette, Index-Array uint8/uint16)"""
+    rows = [list(row[:width]) + [DEFAULT_MATERIAL] * (width - len(row)) for row in tiles[:height]]
+    rows += [[DEFAULT_MATERIAL] * width] * (height - len(rows))
+
+    # Erst die Palette (in Reihenfolge des Auftretens), dann reine Dict-Lookups pro Zeile
+    palette = {}
+    for row in rows:
+        for material in dict.fromkeys(row):
+            palette.setdefault(material, len(palette))
+
+    lookup = palette.__getitem__
+    indices = np.empty((height, width), dtype=np.uint32)
+    for y, row in enumerate(rows):
+        indices[y] = list(map(lookup, row))
+
+    dtype = np.uint8 if len(palette) <= 256 else np.uint16
+    return list(palette), indices.astype(dtype)
+
+
+def decode_tiles(palette, indices):
+    """Index-Array -> Listen aus Strings (wie im JSON-Format)"""
+    return np.array(palette, dtype=object)[indices].tolist()
+
+
+def encode_directions(river_directions, width, height):
+    """
+    {"x,y": Richtung} -> (Richtungs-Palette, Array mit 0 = keine / Index+1, Rest)
+    Rest = Einträge außerhalb der Karte oder mit ungültigem Schlüssel (bleiben im Header erhalten)
+    """
+    keys = list(river_directions)
+    values = list(river_directions.values())
+    palette = {direction: index for index, direction in enumerate(dict.fromkeys(values))}
+    dtype = np.uint8 if len(palette) < 256 else np.uint16
+    directions = np.zeros((height, width), dtype=dtype)
+    if not keys:
+        return [], directions, {}
+
+    coords = None
+    if all(key.count(",") == 1 for key in keys):
+        try:
+            # Alle Schlüssel auf einmal parsen - "x,y,x,y,..." -> Zahlen
+            coords = np.array(",".join(keys).split(","), dtype=np.int64).reshape(-1, 2)
+        except ValueError:
+            pass
+    if coords is None:
+        coords = np.array([_parse_key(key) for key in keys], dtype=np.int64)
+
+    xs, ys = coords[:, 0], coords[:, 1]
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    codes = np.fromiter(map(palette.__getitem__, values), dtype=dtype, count=len(values)) + 1
+    directions[ys[inside], xs[inside]] = codes[inside]
+
+    leftover = {keys[i]: values[i] for i in np.flatnonzero(~inside).tolist()}
+    return list(palette), directions, leftover
+
+
+def _parse_key(key):
+    try:
+        x, y = (int(value) for value in key.split(","))
+        return x, y
+    except ValueError:
+        return -1, -1
+
+
+def decode_directions(palette, directions):
+    """Richtungs-Array -> {"x,y": Richtung} (nur belegte Tiles)"""
+    ys, xs = np.nonzero(directions)
+    values = directions[ys, xs]
+    return {f"{x},{y}": palette[value - 1] for x, y, value in zip(xs.tolist(), ys.tolist(), values.tolist())}
+
+
+def pack_nibbles(values):
+    """uint8-Array mit Werten < 16 -> halb so viele Bytes (zwei Werte pro Byte, zeilenweise)"""
+    height, width = values.shape
+    padded = np.zeros((height, width + (width & 1)), dtype=np.uint8)
+    padded[:, :width] = values
+    return (padded[:, 0::2] << 4) | padded[:, 1::2]
+
+
+def unpack_nibbles(packed, width):
+    height = packed.shape[0]
+    values = np.empty((height, packed.shape[1] * 2), dtype=np.uint8)
+    values[:, 0::2] = packed >> 4
+    values[:, 1::2] = packed & 0x0f
+    return values[:, :width]
+
+
+def _encode_section(array, compress):
+    raw = np.ascontiguousarray(array).tobytes()
+    if compress:
+        packed = zlib.compress(raw, COMPRESSION_LEVEL)
+        if len(packed) < len(raw) * COMPRESSION_GAIN:
+            return "zlib", packed
+    return "raw", raw
+
+
+def write_binary_map(map_data, path, compress=True):
+    """
+    Schreibt map_data als .ringmap (atomar: temporäre Datei, fsync, rename)
+    compress=False: alle Arrays roh - load_map_arrays(mmap=True) lädt dann ohne Kopie
+    Große Karten (Tiles ab RAW_TILES_BYTES) speichern die Tiles auch mit compress=True roh
+    """
+    width = int(map_data.get("width", 50))
+    height = int(map_data.get("height", 50))
+
+    grid = map_data.get(GRID_KEY)
+    if grid is not None and grid.tiles is map_data.get("tiles") and (grid.width, grid.height) == (width, height):
+        # Editor-Karte: schon kodiert
+        palette = list(grid.palette)
+        indices = grid.materials.astype(np.uint8 if len(palette) <= 256 else np.uint16)
+    else:
+        palette, indices = encode_tiles(map_data.get("tiles", []), width, height)
+    direction_palette, directions, leftover = encode_directions(map_data.get("river_directions", {}),
+                                                                width, height)
+    packed = len(direction_palette) <= MAX_PACKED_DIRECTIONS
+    if packed:
+        directions = pack_nibbles(directions)
+
+    header = {
+        "created": map_data.get("created") or _now(),
+        "width": width,
+        "height": height,
+        "palette": palette,
+        "direction_palette": direction_palette,
+        "directions_packed": packed,
+        "river_directions_extra": leftover,
+        "extra": {key: value for key, value in map_data.items() if key not in _ARRAY_KEYS},
+        "sections": {}
+    }
+
+    # Offsets relativ zum Datenbereich (beginnt ausgerichtet direkt nach dem Header)
+    blobs = []
+    offset = 0
+    sections = (("tiles", indices, compress and indices.nbytes < RAW_TILES_BYTES),
+                ("directions", directions, compress))
+    for name, array, compress_section in sections:
+        codec, blob = _encode_section(array, compress_section)
+        header["sections"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "codec": codec,
+                                    "offset": offset, "size": len(blob)}
+        blobs.append((offset, blob))
+        offset = _align(offset + len(blob))
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    data_start = _align(_PREFIX.size + len(header_bytes))
+
+    with atomic_write(path) as f:
+        f.write(_PREFIX.pack(MAGIC, MAP_FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for offset, blob in blobs:
+            f.seek(data_start + offset)
+            f.write(blob)
+    return path
+
+
+def read_header(path):
+    """Nur den Header lesen (Größe, Palette, Datum) - für Kartenlisten ohne die Tiles zu laden"""
+    with open(path, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise MapFormatError(f"Datei zu kurz: {path}")
+        magic, version, header_length = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise MapFormatError(f"Keine .ringmap-Datei: {path}")
+        if version > MAP_FORMAT_VERSION:
+            raise MapFormatError(f"Karten-Format v{version} ist neuer als unterstützt (v{MAP_FORMAT_VERSION})")
+        header = json.loads(f.read(header_length).decode('utf-8'))
+    header["format_version"] = version
+    header["data_start"] = _align(_PREFIX.size + header_length)
+    return header
+
+
+def _read_section(path, header, name, mmap):
+    section = header["sections"][name]
+    dtype = np.dtype(section["dtype"])
+    shape = tuple(section["shape"])
+    offset = header["data_start"] + section["offset"]
+    if section["codec"] == "raw":
+        if mmap:
+            # Ohne Kopie - Seiten werden erst beim Zugriff gelesen
+            return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            return np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        blob = f.read(section["size"])
+    try:
+        return np.frombuffer(zlib.decompress(blob), dtype=dtype).reshape(shape)
+    except zlib.error as e:
+        raise MapFormatError(f"Abschnitt '{name}' beschädigt oder abgeschnitten: {path} ({e})")
+
+
+def iter_tile_blocks(path, header, block_rows):
+    """
+    Tile-Indizes blockweise (y0, Array block_rows x width) - für Streaming-Laden großer Karten
+    Komprimierte Karten werden stückweise entpackt, nie komplett im Speicher
+    """
+    section = header["sections"]["tiles"]
+    dtype = np.dtype(section["dtype"])
+    height, width = section["shape"]
+    offset = header["data_start"] + section["offset"]
+
+    if section["codec"] == "raw":
+        indices = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(height, width))
+        for y0 in range(0, height, block_rows):
+            yield y0, np.array(indices[y0:y0 + block_rows])
+        return
+
+    row_bytes = width * dtype.itemsize
+    block_bytes = block_rows * row_bytes
+    decompressor = zlib.decompressobj()
+    pending = b""
+    y0 = 0
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        remaining = section["size"]
+        while remaining > 0:
+            data = f.read(min(STREAM_READ_BYTES, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            pending += decompressor.decompress(data)
+            if remaining <= 0:
+                pending += decompressor.flush()
+
+            # Nur ganze Blöcke ausgeben - am Ende auch den angebrochenen Rest
+            while len(pending) >= block_bytes or (remaining <= 0 and len(pending) >= row_bytes > 0):
+                block, pending = pending[:block_bytes], pending[block_bytes:]
+                rows = len(block) // row_bytes
+                yield y0, np.frombuffer(block, dtype=dtype).reshape(rows, width)
+                y0 += rows
+
+    # Abgeschnittene Datei: zlib liefert dann einfach weniger - fehlende Zeilen sind ein Fehler
+    if y0 < height:
+        raise MapFormatError(f"Datei abgeschnitten: {path} ({y0} von {height} Zeilen)")
+
+
+def read_direction_array(path, header):
+    """Richtungs-Array einer .ringmap (0 = keine, sonst Index+1 in header["direction_palette"])"""
+    directions = _read_section(path, header, "directions", mmap=False)
+    if header.get("directions_packed"):
+        directions = unpack_nibbles(directions, header["width"])
+    return directions
+
+
+def read_directions(path, header, directions=None):
+    """Fluss-Richtungen einer .ringmap als {"x,y": Richtung} (klein - wird immer komplett gelesen)"""
+    if directions is None:
+        directions = read_direction_array(path, header)
+
+    river_directions = dict(header.get("river_directions_extra", {}))
+    river_directions.update(decode_directions(header["direction_palette"], directions))
+    return river_directions
+
+
+def load_map_arrays(path, mmap=True):
+    """
+    Header + Arrays einer .ringmap: (header, Tile-Indizes, Richtungen 0 = keine / Index+1)
+    Rohe Arrays kommen mit mmap=True als read-only np.memmap (ohne Kopie)
+    """
+    header = read_header(path)
+    indices = _read_section(path, header, "tiles", mmap)
+    directions = _read_section(path, header, "directions", mmap)
+    if header.get("directions_packed"):
+        directions = unpack_nibbles(directions, header["width"])
+    return header, indices, directions
+
+
+def read_binary_map(path):
+    """
+    Lädt eine .ringmap als map_data-Dict (gleiche Struktur wie das JSON-Format)
+    Das TileGrid wird direkt aus den Arrays gebaut und unter GRID_KEY mitgegeben - die Listen sind
+    nur seine dekodierte Ansicht (TileGrid.of() kodiert sie also NICHT ein zweites Mal)
+    Rohe Tiles (große Karten) kommen per mmap und werden nur einmal ins Raster kopiert
+    """
+    from tile_grid import TileGrid  # tile_grid importiert dieses Modul
+
+    header, indices, directions = load_map_arrays(path, mmap=True)
+    river_directions = read_directions(path, header, directions)
+    tiles = decode_tiles(header["palette"], indices)
+
+    map_data = dict(header.get("extra", {}))
+    map_data.update({
+        "version": f"bin{header['format_version']}",
+        "created": header.get("created", "Unbekannt"),
+        "width": header["width"],
+        "height": header["height"],
+        "tiles": tiles,
+        "river_directions": river_directions,
+        GRID_KEY: TileGrid.from_arrays(header["palette"], indices, header["direction_palette"], directions,
+                                       tiles, river_directions)
+    })
+    return map_data
+
+
+def _align(offset):
+    return -(-offset // SECTION_ALIGN) * SECTION_ALIGN
+
+
+def _now():
+    from datetime import datetime
+    return datetime.now().isoformat()
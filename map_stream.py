@@ -0,0 +1,316 @@
+"""
+Streaming-Laden großer Karten für "Der Eine Ring"
+Liefert Tile-Zeilen blockweise, sobald sie gelesen sind - .ringmap stückweise entpackt,
+JSON Zeile für Zeile (nie das ganze Dokument als Text + Baum gleichzeitig im Speicher)
+Der ProgressiveMapLoader füllt eine Karte im Hintergrund, der Projektor rendert schon die ersten Zeilen
+"""
+import json
+import threading
+
+import numpy as np
+
+from map_format import (DEFAULT_MATERIAL, GRID_KEY, decode_tiles, encode_directions, is_binary_map,
+                        iter_tile_blocks, read_direction_array, read_directions, read_header)
+from tile_grid import TileGrid
+
+
+# Zeilen pro Block (= Chunk-Kante des Projektors, jeder Block füllt eine Chunk-Reihe)
+CHUNK_ROWS = 16
+
+# Lesegröße für JSON - wächst bei großen Einzelwerten (z.B. river_directions) exponentiell
+JSON_READ_CHARS = 1 << 16
+
+_WHITESPACE = " \t\r\n"
+
+
+class JsonStreamScanner:
+    """
+    Minimaler inkrementeller JSON-Leser: einzelne Werte per raw_decode aus einem wachsenden Puffer
+    Reicht für die Struktur der Karten-Dateien (Objekt auf oberster Ebene, "tiles" als Liste von Zeilen)
+    """
+
+    def __init__(self, f, read_chars=JSON_READ_CHARS):
+        self.f = f
+        self.read_chars = read_chars
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self, size=None):
+        data = self.f.read(size or self.read_chars)
+        if not data:
+            self.eof = True
+            return
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+
+    def peek(self):
+        """Nächstes Zeichen ohne Whitespace ('' am Dateiende)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self.fill()
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON: '{char}' erwartet, '{found}' gefunden")
+        self.pos += 1
+
+    def value(self):
+        """Nächster vollständiger JSON-Wert"""
+        self.peek()
+        size = self.read_chars
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # Zahl am Pufferende könnte noch weitergehen - erst nach einem Folgezeichen übernehmen
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill(size)
+            size *= 2
+
+
+class MapStreamReader:
+    """
+    Liest eine Karte (.ringmap oder JSON) in Blöcken von Zeilen
+    Nach open() sind width/height bekannt, river_directions bei .ringmap sofort, bei JSON am Ende
+    """
+
+    def __init__(self, path, chunk_rows=CHUNK_ROWS):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.binary = is_binary_map(path)
+
+        self.width = None
+        self.height = None
+        self.created = "Unbekannt"
+        self.version = None
+        self.river_directions = {}
+        self.direction_array = None  # .ringmap: Richtungen wie in der Datei (für das TileGrid)
+        self.extra = {}
+
+        self.header = None
+        self.file = None
+        self.scanner = None
+        self.buffered_rows = None  # JSON mit "tiles" vor width/height: nicht streambar
+
+    def open(self):
+        """Liest alles bis zum Anfang der Tiles"""
+        if self.binary:
+            self.header = read_header(self.path)
+            self.width = self.header["width"]
+            self.height = self.header["height"]
+            self.created = self.header.get("created", "Unbekannt")
+            self.version = f"bin{self.header['format_version']}"
+            self.extra = dict(self.header.get("extra", {}))
+            self.direction_array = read_direction_array(self.path, self.header)
+            self.river_directions = read_directions(self.path, self.header, self.direction_array)
+            return self
+
+        self.file = open(self.path, 'r', encoding='utf-8')
+        self.scanner = JsonStreamScanner(self.file)
+        try:
+            self.scanner.expect("{")
+            if not self.read_fields(stop_at_tiles=True):
+                raise ValueError(f"Ungültige Kartendaten in {self.path}")
+
+            if self.width is None or self.height is None:
+                # Größe steht erst hinter den Tiles - komplett lesen, dann in Blöcken ausgeben
+                self.buffered_rows = list(self.iter_json_rows())
+                self.read_fields(stop_at_tiles=False)
+                if self.width is None or self.height is None:
+                    raise ValueError(f"Ungültige Kartendaten in {self.path}")
+        except ValueError:
+            self.close()
+            raise
+        return self
+
+    def read_fields(self, stop_at_tiles):
+        """Felder des Objekts auf oberster Ebene - True wenn "tiles" erreicht (Scanner steht davor)"""
+        scanner = self.scanner
+        while scanner.peek() not in ("}", ""):
+            if scanner.peek() == ",":
+                scanner.expect(",")
+            key = scanner.value()
+            scanner.expect(":")
+            if key == "tiles" and stop_at_tiles:
+                return True
+
+            value = scanner.value()
+            if key in ("width", "height"):
+                setattr(self, key, value)
+            elif key == "created":
+                self.created = value
+            elif key == "version":
+                self.version = value
+            elif key == "river_directions":
+                self.river_directions = value
+            else:
+                self.extra[key] = value
+        return False
+
+    def iter_json_rows(self):
+        scanner = self.scanner
+        scanner.expect("[")
+        while scanner.peek() != "]":
+            if scanner.peek() == ",":
+                scanner.expect(",")
+            yield scanner.value()
+        scanner.expect("]")
+
+    def chunks(self):
+        """Erzeugt (y0, Zeilen) - Zeilen als Listen aus Material-Strings"""
+        for y0, rows, _ in self.blocks():
+            yield y0, rows
+
+    def blocks(self):
+        """
+        Erzeugt (y0, Zeilen, Indizes) - Indizes: Block aus der .ringmap (Palette = header["palette"]),
+        bei JSON None (dort gibt es nur die Listen)
+        """
+        if self.width is None:
+            self.open()
+
+        try:
+            if self.binary:
+                palette = self.header["palette"]
+                for y0, block in iter_tile_blocks(self.path, self.header, self.chunk_rows):
+                    yield y0, decode_tiles(palette, block), block
+                return
+
+            rows = self.buffered_rows if self.buffered_rows is not None else self.iter_json_rows()
+            block = []
+            y0 = 0
+            for row in rows:
+                block.append(row)
+                if len(block) == self.chunk_rows:
+                    yield y0, block, None
+                    y0 += len(block)
+                    block = []
+            if block:
+                yield y0, block, None
+
+            # Felder hinter den Tiles (river_directions, ...)
+            if self.buffered_rows is None:
+                self.read_fields(stop_at_tiles=False)
+        finally:
+            self.close()
+
+    def map_data(self, tiles):
+        """map_data-Dict mit den bisher bekannten Feldern (gleiche Struktur wie MapSystem.load_map)"""
+        map_data = dict(self.extra)
+        if self.version is not None:
+            map_data["version"] = self.version
+        map_data.update({
+            "created": self.created,
+            "width": self.width,
+            "height": self.height,
+            "tiles": tiles,
+            "river_directions": self.river_directions
+        })
+        return map_data
+
+    def read_all(self):
+        """Ganze Karte über den Stream lesen"""
+        tiles = []
+        for _, rows in self.chunks():
+            tiles.extend(rows)
+        return self.map_data(tiles)
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+class ProgressiveMapLoader:
+    """
+    Lädt eine Karte im Hintergrund-Thread in ein vorab angelegtes map_data-Dict
+    Noch nicht geladene Zeilen sind leer ([]), loaded_rows wächst von oben nach unten
+    Der Tk-Thread fragt per poll() ab - die Tiles werden nur zeilenweise ersetzt, nie in-place geändert
+    Lesefehler (z.B. abgeschnittene Datei): error ist gesetzt, done NIE - die Karte bleibt unvollständig
+
+    Das TileGrid (map_data[GRID_KEY]) füllt der Lade-Thread gleich mit: .ringmap-Blöcke direkt als
+    Indizes, JSON-Zeilen einmal kodiert - der Projektor kodiert nichts mehr nach, er meldet nur
+    (grid.load_rows / grid.loading_finished im Tk-Thread)
+    """
+
+    def __init__(self, path, chunk_rows=CHUNK_ROWS):
+        self.reader = MapStreamReader(path, chunk_rows).open()
+        self.map_data = self.reader.map_data([[] for _ in range(self.reader.height)])
+        self.grid = self.empty_grid()
+        self.map_data[GRID_KEY] = self.grid
+        self.loaded_rows = 0
+        self.error = None
+        self.done = threading.Event()  # Karte vollständig
+        self.finished = threading.Event()  # Thread beendet (fertig oder Fehler)
+
+        self.thread = threading.Thread(target=self.run, name="MapStreamLoader", daemon=True)
+        self.thread.start()
+
+    def empty_grid(self):
+        """Raster in voller Größe, noch ohne Zeilen (encoded_rows = 0)"""
+        reader = self.reader
+        width, height = reader.width, reader.height
+        materials = np.zeros((height, width), dtype=np.uint16)
+        if reader.binary:
+            grid = TileGrid.from_arrays(reader.header["palette"], materials, reader.header["direction_palette"],
+                                        reader.direction_array, self.map_data["tiles"],
+                                        self.map_data["river_directions"])
+        else:
+            direction_palette, directions, _ = encode_directions(reader.river_directions, width, height)
+            grid = TileGrid(width, height, [DEFAULT_MATERIAL], materials, direction_palette, directions)
+            grid.tiles = self.map_data["tiles"]
+            grid.river_directions = self.map_data["river_directions"]
+        grid.encoded_rows = 0
+        return grid
+
+    def run(self):
+        tiles = self.map_data["tiles"]
+        grid = self.grid
+        try:
+            height = self.reader.height
+            for y0, rows, indices in self.reader.blocks():
+                rows = rows[:max(0, height - y0)]
+                tiles[y0:y0 + len(rows)] = rows
+                # Raster VOR loaded_rows - der Tk-Thread liest nur Zeilen unterhalb davon
+                if indices is not None:
+                    grid.store_rows(y0, indices[:len(rows)])
+                else:
+                    grid.encode_rows(y0, y0 + len(rows))
+                self.loaded_rows = y0 + len(rows)
+
+            # JSON: Richtungen (und Felder hinter den Tiles) erst jetzt bekannt
+            self.map_data["river_directions"].update(self.reader.river_directions)
+            if not self.reader.binary:
+                grid.load_directions()
+            for key, value in self.reader.extra.items():
+                self.map_data.setdefault(key, value)
+        except (OSError, ValueError) as e:
+            # loaded_rows bleibt beim letzten vollständigen Block - fehlende Zeilen sind KEINE Karte
+            print(f"Fehler beim Streamen der Karte: {e}")
+            self.error = e
+        else:
+            self.loaded_rows = self.reader.height
+            self.done.set()
+        finally:
+            self.finished.set()
+
+    def poll(self):
+        """(geladene Zeilen, fertig?) - bei Fehler nie fertig, dann error prüfen"""
+        return self.loaded_rows, self.done.is_set()
+
+    def wait(self, timeout=None):
+        """Blockiert bis die Karte vollständig geladen ist - gibt map_data zurück (Lesefehler: wird geworfen)"""
+        self.finished.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.map_data
@@ -1,17 +1,27 @@
 """
 Map System für "Der Eine Ring"
 Verwaltet Speichern und Laden von Karten
+Standard-Format: binäre .ringmap (map_format.py) - alte JSON-Karten werden weiter gelesen
 """
 import json
 import os
 from datetime import datetime
 
+from map_catalog import CONVERTED_FROM, MapCatalog
+from map_format import (BINARY_EXTENSION, DEFAULT_MATERIAL, MapFormatError, atomic_write, decode_directions,
+                        encode_directions, is_binary_map, read_binary_map, write_binary_map)
+from map_stream import ProgressiveMapLoader
+
+# Dateiendungen, die list_maps() anzeigt
+MAP_EXTENSIONS = (BINARY_EXTENSION, '.json')
+
 class MapSystem:
     """Verwaltet Karten-Speicherung und -Laden"""
     
     def __init__(self, maps_folder="maps"):
         self.maps_folder = maps_folder
         self.ensure_maps_folder()
+        self.catalog = MapCatalog(maps_folder, MAP_EXTENSIONS)
     
     def ensure_maps_folder(self):
         """Stellt sicher, dass der Maps-Ordner existiert"""
@@ -20,7 +30,7 @@ class MapSystem:
     
     def save_map(self, map_data, filename=None):
         """
-        Speichert eine Karte als JSON
+        Speichert eine Karte - binär (.ringmap), oder als JSON wenn filename auf .json endet
         
         Args:
             map_data: Dict mit width, height, tiles
@@ -31,32 +41,46 @@ class MapSystem:
         """
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"map_{timestamp}.json"
+            filename = f"map_{timestamp}{BINARY_EXTENSION}"
         
-        # .json Extension sicherstellen
-        if not filename.endswith('.json'):
-            filename += '.json'
+        # Extension sicherstellen (ohne Angabe: binär)
+        if not filename.endswith(MAP_EXTENSIONS):
+            filename += BINARY_EXTENSION
         
         filepath = os.path.join(self.maps_folder, filename)
+        map_data = dict(map_data, created=datetime.now().isoformat())
+        
+        if filename.endswith('.json'):
+            self.write_json_map(map_data, filepath)
+        else:
+            write_binary_map(map_data, filepath)
+        
+        # Katalog direkt aus den Daten im Speicher aktualisieren
+        self.catalog.update(filename, map_data)
         
+        return filepath
+    
+    def write_json_map(self, map_data, filepath):
+        """Altes JSON-Format (Version 1.1) - für Austausch und Abwärtskompatibilität"""
         # Metadaten hinzufügen
         save_data = {
             "version": "1.1",  # Version erhöht für river_directions
-            "created": datetime.now().isoformat(),
+            "created": map_data.get("created") or datetime.now().isoformat(),
             "width": map_data.get("width", 50),
             "height": map_data.get("height", 50),
             "tiles": map_data.get("tiles", []),
             "river_directions": map_data.get("river_directions", {})  # Neue Eigenschaft
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, indent=2, ensure_ascii=False)
+        # Kompakt statt indent=2 (große Karten: ein Vielfaches kleiner und schneller), atomar geschrieben
+        with atomic_write(filepath, 'w', encoding='utf-8') as f:
+            json.dump(save_data, f, ensure_ascii=False, separators=(',', ':'))
         
         return filepath
     
     def load_map(self, filename):
         """
-        Lädt eine Karte aus einer JSON-Datei
+        Lädt eine Karte - .ringmap oder JSON (erkannt am Dateiinhalt, nicht an der Endung)
         
         Args:
             filename: Name oder Pfad der Datei
@@ -74,6 +98,13 @@ class MapSystem:
             print(f"Karte nicht gefunden: {filepath}")
             return None
         
+        if is_binary_map(filepath):
+            try:
+                return read_binary_map(filepath)
+            except (MapFormatError, OSError, ValueError, KeyError) as e:
+                print(f"Fehler beim Laden der Karte: {e}")
+                return None
+        
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -93,34 +124,58 @@ class MapSystem:
             print(f"Fehler beim Laden der Karte: {e}")
             return None
     
+    def load_map_progressive(self, filename):
+        """
+        Startet das Streaming-Laden einer Karte (große Karten: Projektor rendert schon die ersten Zeilen)
+        
+        Args:
+            filename: Name oder Pfad der Datei
+        
+        Returns:
+            ProgressiveMapLoader (map_data füllt sich im Hintergrund) oder None bei Fehler
+        """
+        if not os.path.isabs(filename):
+            filepath = os.path.join(self.maps_folder, filename)
+        else:
+            filepath = filename
+        
+        if not os.path.exists(filepath):
+            print(f"Karte nicht gefunden: {filepath}")
+            return None
+        
+        try:
+            return ProgressiveMapLoader(filepath)
+        except (MapFormatError, OSError, ValueError, KeyError) as e:
+            print(f"Fehler beim Laden der Karte: {e}")
+            return None
+    
     def list_maps(self):
         """
-        Listet alle verfügbaren Karten auf
+        Listet alle verfügbaren Karten auf (aus dem Katalog - nur geänderte Dateien werden gelesen)
         
         Returns:
-            Liste von Tupeln (filename, created_date)
+            Liste von Tupeln (filename, created_date, size)
         """
-        maps = []
+        self.catalog.refresh()
         
-        if not os.path.exists(self.maps_folder):
-            return maps
+        maps = []
+        for entry in self.catalog.entries(sort_by="created"):
+            if entry.get("error"):
+                maps.append((entry["filename"], 'Fehler beim Laden', '?'))
+            else:
+                maps.append((entry["filename"], entry["created"], f"{entry['width']}x{entry['height']}"))
         
-        for filename in os.listdir(self.maps_folder):
-            if filename.endswith('.json'):
-                filepath = os.path.join(self.maps_folder, filename)
-                
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    created = data.get('created', 'Unbekannt')
-                    size = f"{data.get('width', '?')}x{data.get('height', '?')}"
-                    maps.append((filename, created, size))
-                
-                except:
-                    maps.append((filename, 'Fehler beim Laden', '?'))
+        return maps
+    
+    def search_maps(self, query="", material=None, sort_by="created"):
+        """
+        Durchsucht den Katalog
         
-        return sorted(maps, key=lambda x: x[1], reverse=True)
+        Returns:
+            Liste von Katalog-Einträgen (Dicts mit filename, created, width, height, histogram, thumbnail)
+        """
+        self.catalog.refresh()
+        return self.catalog.entries(query, material, sort_by)
     
     def delete_map(self, filename):
         """
@@ -137,6 +192,7 @@ class MapSystem:
         try:
             if os.path.exists(filepath):
                 os.remove(filepath)
+                self.catalog.remove(filename)
                 return True
             return False
         except Exception as e:
@@ -145,12 +201,15 @@ class MapSystem:
     
     def export_map(self, map_data, export_path):
         """
-        Exportiert eine Karte an einen beliebigen Ort
+        Exportiert eine Karte an einen beliebigen Ort (.ringmap-Endung: binär, sonst JSON)
         
         Args:
             map_data: Kartendaten
             export_path: Ziel-Pfad
         """
+        if export_path.endswith(BINARY_EXTENSION):
+            return write_binary_map(dict(map_data, created=datetime.now().isoformat()), export_path)
+        
         save_data = {
             "version": "1.0",
             "created": datetime.now().isoformat(),
@@ -159,11 +218,94 @@ class MapSystem:
             "tiles": map_data.get("tiles", [])
         }
         
-        with open(export_path, 'w', encoding='utf-8') as f:
+        with atomic_write(export_path, 'w', encoding='utf-8') as f:
             json.dump(save_data, f, indent=2, ensure_ascii=False)
         
         return export_path
     
+    def upgrade_map(self, filename, delete_json=False):
+        """
+        Konvertiert eine JSON-Karte ins binäre Format (gleicher Name, Endung .ringmap)
+        Gibt es die .ringmap schon mit anderem Inhalt, wird NICHT überschrieben (None)
+        Nach geprüfter Konvertierung listet der Katalog die JSON-Datei nicht mehr (solange unverändert)
+        
+        Args:
+            filename: Name oder Pfad der JSON-Datei
+            delete_json: Alte Datei nach erfolgreicher Prüfung löschen (Standard: behalten)
+        
+        Returns:
+            Pfad zur .ringmap oder None bei Fehler
+        """
+        filepath = filename if os.path.isabs(filename) else os.path.join(self.maps_folder, filename)
+        if is_binary_map(filepath):
+            return filepath
+        
+        map_data = self.load_map(filepath)
+        if map_data is None:
+            return None
+        
+        target = os.path.splitext(filepath)[0] + BINARY_EXTENSION
+        if os.path.exists(target):
+            # Schon da: nur übernehmen wenn gleich - eine andere Karte wird NIE überschrieben
+            existing = self.load_map(target)
+            if existing is None or not self.same_map(existing, map_data):
+                print(f"⚠️ {os.path.basename(target)} existiert bereits mit anderem Inhalt, "
+                      f"nicht konvertiert: {filepath}")
+                return None
+            if delete_json:
+                os.remove(filepath)
+            print(f"✓ Karte schon konvertiert: {os.path.basename(target)}")
+            return target
+        
+        stat = os.stat(filepath)
+        source = {"file": os.path.basename(filepath), "mtime_ns": stat.st_mtime_ns, "file_size": stat.st_size}
+        write_binary_map(dict(map_data, **{CONVERTED_FROM: source}), target)
+        
+        # Erst prüfen, dann löschen - KEIN Datenverlust bei defekter Konvertierung
+        if not self.same_map(read_binary_map(target), map_data):
+            print(f"⚠️ Konvertierung fehlerhaft, JSON bleibt erhalten: {filepath}")
+            os.remove(target)
+            return None
+        
+        old_size = stat.st_size
+        if delete_json:
+            os.remove(filepath)
+        
+        print(f"✓ Karte konvertiert: {os.path.basename(target)} "
+              f"({old_size // 1024} KB → {os.path.getsize(target) // 1024} KB)")
+        return target
+    
+    def upgrade_all_maps(self, delete_json=False):
+        """Konvertiert alle JSON-Karten im Maps-Ordner - Returns: Liste der neuen Pfade"""
+        upgraded = []
+        for filename in sorted(os.listdir(self.maps_folder)):
+            if filename.endswith('.json') and not filename.startswith('.'):
+                target = self.upgrade_map(os.path.join(self.maps_folder, filename), delete_json)
+                if target:
+                    upgraded.append(target)
+        return upgraded
+    
+    @classmethod
+    def same_map(cls, map_data, other):
+        """Gleiche Tiles und Richtungen (so wie das Binärformat sie speichert)"""
+        return cls.normalized_tiles(map_data) == cls.normalized_tiles(other) and \
+            cls.normalized_directions(map_data) == cls.normalized_directions(other)
+    
+    @staticmethod
+    def normalized_tiles(map_data):
+        """Tiles auf width x height gebracht (so wie sie das Binärformat speichert)"""
+        width, height = map_data["width"], map_data["height"]
+        tiles = map_data["tiles"]
+        return [list(tiles[y][:width]) + [DEFAULT_MATERIAL] * (width - len(tiles[y])) if y < len(tiles)
+                else [DEFAULT_MATERIAL] * width for y in range(height)]
+    
+    @staticmethod
+    def normalized_directions(map_data):
+        """Nur Richtungen innerhalb der Karte, Schlüssel einheitlich "x,y" (Rest ist für die Prüfung egal)"""
+        palette, directions, _ = encode_directions(map_data.get("river_directions", {}),
+                                                   map_data["width"], map_data["height"])
+        return decode_directions(palette, directions)
+    
     def create_default_map(self, width=50, height=50):
         """
         Erstellt eine Standard-Karte mit verschiedenen Terrains
@@ -198,3 +340,16 @@ class MapSystem:
             "height": height,
             "tiles": tiles
         }
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="JSON-Karten ins binäre .ringmap-Format konvertieren")
+    parser.add_argument("folder", nargs="?", default="maps", help="Maps-Ordner (Standard: maps)")
+    parser.add_argument("--delete-json", action="store_true",
+                        help="JSON-Dateien nach erfolgreicher Konvertierung löschen (Standard: behalten)")
+    args = parser.parse_args()
+    
+    converted = MapSystem(args.folder).upgrade_all_maps(delete_json=args.delete_json)
+    print(f"{len(converted)} Karte(n) konvertiert")
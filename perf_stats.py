@@ -0,0 +1,104 @@
+"""
+Leichtgewichtige Laufzeit-Messung für "Der Eine Ring"
+Rollierende Zeitfenster pro Render-Stufe (p50/p95) - für Projektor-Overlay und GM-Panel
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# Anzahl Messwerte pro Stufe (ältere fallen heraus)
+STATS_WINDOW = 240
+
+# Anzeigenamen der Stufen (Reihenfolge = Reihenfolge im Overlay)
+STAGE_LABELS = {
+    "frame": "Frame gesamt",
+    "static_cache": "Statischer Cache",
+    "texture_generation": "Textur-Generierung",
+    "animated_paste": "Animierte Tiles",
+    "fog_composite": "Nebel-Composite",
+    "photo_image": "PhotoImage",
+}
+
+
+def percentile(sorted_values, fraction):
+    """Perzentil aus bereits sortierten Werten (nächster Rang)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class PerfStats:
+    """
+    Messwerte pro Stufe - thread-sicher (Render-Thread und Tk-Thread messen gleichzeitig)
+    Aufruf: with shared_perf_stats.time("fog_composite"): ...
+    """
+
+    def __init__(self, window=STATS_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def time(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def record(self, stage, seconds):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    def summary(self):
+        """{stage: {"p50", "p95", "last" (ms), "count"}} für alle gemessenen Stufen"""
+        with self._lock:
+            snapshot = {stage: list(samples) for stage, samples in self._samples.items()}
+            counts = dict(self._counts)
+
+        result = {}
+        for stage, samples in snapshot.items():
+            ordered = sorted(samples)
+            result[stage] = {
+                "p50": percentile(ordered, 0.50) * 1000,
+                "p95": percentile(ordered, 0.95) * 1000,
+                "last": samples[-1] * 1000,
+                "count": counts[stage]
+            }
+        return result
+
+    def report_lines(self, cache_stats=None, fps=None):
+        """Textzeilen für Overlay und GM-Panel"""
+        summary = self.summary()
+        lines = []
+        if fps:
+            lines.append(f"{'FPS':<20}{fps:6.1f}")
+        lines.append(f"{'Stufe':<20}{'p50':>7}{'p95':>8}{'Anzahl':>9}")
+
+        stages = [s for s in STAGE_LABELS if s in summary] + sorted(s for s in summary if s not in STAGE_LABELS)
+        for stage in stages:
+            entry = summary[stage]
+            label = STAGE_LABELS.get(stage, stage)
+            lines.append(f"{label:<20}{entry['p50']:6.1f}ms{entry['p95']:6.1f}ms{entry['count']:9d}")
+
+        if cache_stats:
+            lines.append(f"Textur-Cache: {cache_stats['hits']} Treffer / {cache_stats['misses']} Fehlschläge "
+                         f"({cache_stats['hit_rate'] * 100:.0f}%)")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+
+# Gemeinsame Instanz für Renderer, Projektor und GM-Panel
+shared_perf_stats = PerfStats()
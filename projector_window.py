@@ -7,12 +7,43 @@ from tkinter import Canvas
 from PIL import Image, ImageTk, ImageDraw, ImageFilter
 import json
 import random
-from fog_texture_generator import FogTextureGenerator
+from functools import partial
+import numpy as np
+from texture_cache import shared_texture_cache
+from render_engine import RenderEngine, ANIMATED_MATERIALS, MIN_GENERATED_TILE_SIZE
+from frame_worker import FrameWorker
+from frame_pacer import FramePacer
+from perf_stats import shared_perf_stats
+from texture_prewarm import (TexturePrewarmer, collect_texture_jobs, missing_texture_jobs,
+                             PREWARM_MIN_JOBS)
+
+
+# Zusätzliche Tiles um den sichtbaren Bereich (Puffer fürs Pannen ohne Neuaufbau)
+VIEWPORT_MARGIN = 4
+
+# Wartezeit nach dem letzten Mausrad-Schritt, bevor in exakter Größe gerendert wird
+ZOOM_SETTLE_MS = 250
+
+# Abfrage-Intervall des Textur-Vorwärmens (Fortschrittsanzeige)
+PREWARM_POLL_MS = 50
+
+# Abfrage-Intervall für fertige Frames aus dem Render-Thread
+FRAME_POLL_MS = 5
+
+# Aktualisierung des Performance-Overlays (F3)
+PERF_OVERLAY_MS = 500
+
+# Abfrage-Intervall beim Streaming-Laden großer Karten (neue Zeilen übernehmen)
+MAP_STREAM_POLL_MS = 50
+
+# Editor-Änderungen sammeln, bevor der Projektor sie übernimmt (Malen per Drag: viele Tiles kurz hintereinander)
+GRID_UPDATE_MS = 100
+
 
 class ProjectorWindow(tk.Toplevel):
     """Vollbild-Projektor-Fenster für Spieler mit Fog-of-War"""
     
-    def __init__(self, parent, map_data=None, webcam_tracker=None):
+    def __init__(self, parent, map_data=None, webcam_tracker=None, map_loader=None):
         super().__init__(parent)
         
         self.title("Der Eine Ring - Projektor")
@@ -34,6 +65,8 @@ class ProjectorWindow(tk.Toplevel):
         # ESC zum Beenden, F11 für Vollbild-Toggle
         self.bind('<Escape>', lambda e: self.destroy())
         self.bind('<F11>', lambda e: self.toggle_fullscreen())
+        self.bind('<F3>', lambda e: self.toggle_perf_overlay())
+        self.bind('<F4>', lambda e: self.set_fog_drift(not self.engine.fog_drift))
         
         # Map-Daten
         self.map_data = map_data or {"width": 50, "height": 50, "tiles": []}
@@ -46,21 +79,13 @@ class ProjectorWindow(tk.Toplevel):
         self.fog = FogOfWar(map_width, map_height)
         self.fog_enabled = True  # STANDARDMÄSSIG AKTIVIERT
         
-        # FOG TEXTURE GENERATOR - Wiederverwendbare Texturen!
-        self.fog_texture_gen = FogTextureGenerator()
-        self.fog_photo_cache = {}  # Cache für PIL Images (nicht PhotoImage!)
-        
         # Map Photo Reference (für das eine große Bild)
         self.map_photo = None
         
         # WICHTIG: Nur Mitte initial aufdecken (5x5 Bereich)
         center_x = map_width // 2
         center_y = map_height // 2
-        for dy in range(-2, 3):
-            for dx in range(-2, 3):
-                nx, ny = center_x + dx, center_y + dy
-                if 0 <= nx < map_width and 0 <= ny < map_height:
-                    self.fog.revealed[ny][nx] = True
+        self.fog.reveal_area(center_x - 2, center_y - 2, center_x + 2, center_y + 2)
         
         # Webcam-Tracker
         self.webcam_tracker = webcam_tracker
@@ -101,27 +126,67 @@ class ProjectorWindow(tk.Toplevel):
         from texture_manager import TextureManager
         self.texture_manager = TextureManager()
         
+        # RENDER-ENGINE: Compositing (statisch, animiert, Fog) ohne Tk - hier mit Animations-Atlas
+        # Weicher Nebel (engine.fog_style = "soft"): Distanzfeld-Ränder + Wolken (Drift: F4 / GM-Panel)
+        self.engine = RenderEngine(texture_manager=self.texture_manager, use_atlas=True)
+        
         # Animation für Projektor
         self.animation_frame = 0
         self.animation_id = None
         self.is_animating = False  # Startet False, wird aktiviert wenn nötig
         self.has_animated_tiles = False  # Prüfen ob Map animierte Tiles hat
-        self.frame_skip_counter = 0  # Für Performance-Optimierung
         
-        # CACHING für statische Map-Teile
-        self.static_map_cache = None  # PIL Image der statischen Tiles
+        # CACHING: statischer Ausschnitt, Frame-Buffer und Fog-Stand liegen in der Engine
         self.static_map_size = None  # (width, height, tile_size) für Cache-Invalidierung
-        self.animated_positions = []  # Liste von (x, y) Positionen mit animierten Tiles
         self.canvas_image_id = None  # ID des Canvas-Image-Items (für Update statt Delete)
         
+        # VIEWPORT-CULLING: nur der sichtbare Tile-Bereich (+ Rand) wird gerendert (engine.view_range)
+        self.map_offset = (0, 0)  # Zentrierungs-Offset auf dem Canvas
+        self.scroll_region = None
+        
+        # ZOOM-VORSCHAU: während des Zoomens skalierte Mip-Stufen, exakt erst danach
+        self.zooming = False
+        self.zoom_settle_id = None
+        
+        # VORWÄRMEN: fehlende Texturen einer neuen Karte/Größe im Prozess-Pool statt im Tk-Thread
+        self.prewarmer = None
+        self.prewarm_poll_id = None
+        self.prewarm_enabled = True  # Aus, sobald der Pool einmal versagt (sonst Endlos-Neustart)
+        
+        # RENDER-THREAD: inkrementelle Frames werden abseits des Tk-Loops komponiert
+        # Tk übernimmt nur fertige Bereiche ins PhotoImage (present_frame)
+        self.frame_worker = FrameWorker("ProjectorFrames")
+        self.frame_poll_id = None
+        
+        # FRAME-PACING: Render-Rate nach gemessener Frame-Zeit, Animation folgt der Uhr
+        self.pacer = FramePacer()
+        
+        # PERFORMANCE-OVERLAY (F3): p50/p95 pro Render-Stufe
+        self.perf_label = None
+        self.perf_overlay_id = None
+        
+        # STREAMING: große Karten laden im Hintergrund, gerendert wird ab den ersten Zeilen
+        self.map_loader = map_loader
+        self.map_stream_poll_id = None
+        
+        # LIVE-UPDATES: Änderungs-Meldungen des Rasters (Editor malt, Projektor zieht nach)
+        self.watched_grid = None
+        self.grid_update_id = None
+        
+        # Animierte Tiles VOR dem ersten Rendern sammeln (Index des Ausschnitts braucht sie)
+        self.check_for_animated_tiles()
+        
         self.setup_ui()
         self.render_map()
         
-        # Prüfe ob Animation gebraucht wird
-        self.check_for_animated_tiles()
+        if self.map_loader:
+            self.map_stream_poll_id = self.after(MAP_STREAM_POLL_MS, self.poll_map_stream)
+        
+        # Animation läuft nur, solange etwas Animiertes sichtbar ist (siehe wake_animation)
         if self.has_animated_tiles:
-            print(f"Animation aktiviert: {len(self.animated_positions)} animierte Tiles")
-            self.start_animation()  # Nur starten wenn nötig
+            print(f"Animation aktiviert: {len(self.engine.animated_positions)} animierte Tiles")
+        elif self.fog_drifting():
+            print("Keine animierten Tiles - Animation nur für Nebel-Drift")
         else:
             print("Keine animierten Tiles gefunden - statische Map")
         
@@ -180,7 +245,7 @@ class ProjectorWindow(tk.Toplevel):
         self.pan_start_y = 0
         
         # Info-Text (kann ausgeblendet werden)
-        self.info_label = tk.Label(self, text="ESC = Beenden | F11 = Vollbild | Rechtsklick = Detail-Ansicht", 
+        self.info_label = tk.Label(self, text="ESC = Beenden | F11 = Vollbild | F3 = Performance | Rechtsklick = Detail-Ansicht", 
                                    bg="#0a0a0a", fg="#666666", 
                                    font=("Arial", 10))
         self.info_label.place(x=10, y=10)
@@ -205,16 +270,13 @@ class ProjectorWindow(tk.Toplevel):
         if not self.canvas_image_id:
             self.canvas.configure(bg="#0a0a0a")
         
-        # Aktuelle Karte (kann Base oder Detail sein)
-        current_map = self.detail_system.get_current_map()
-        
-        width = current_map.get("width", 50)
-        height = current_map.get("height", 50)
-        tiles = current_map.get("tiles", [])
+        # Aktuelle Karte (kann Base oder Detail sein) - die Engine folgt jedem Kartenwechsel
+        if self.detail_system.get_current_map() is not self.engine.map_data:
+            self.frame_worker.wait_idle()
+            self.check_for_animated_tiles()
         
-        # Wenn tiles leer ist, erstelle leere Karte
-        if not tiles:
-            tiles = [["grass" for _ in range(width)] for _ in range(height)]
+        width = self.engine.width
+        height = self.engine.height
         
         # Canvas-Größe ermitteln für Zentrierung
         try:
@@ -242,138 +304,248 @@ class ProjectorWindow(tk.Toplevel):
         total_map_width = width * current_tile_size
         total_map_height = height * current_tile_size
         
-        # Cache-Schlüssel prüfen
-        cache_key = (width, height, current_tile_size)
-        cache_invalid = self.static_map_cache is None or self.static_map_size != cache_key
-        
-        # STATISCHE MAP CACHEN (einmalig oder bei Größenänderung)
-        if cache_invalid:
-            print(f"Erstelle statischen Map-Cache ({width}x{height}, {current_tile_size}px)")
-            self.static_map_cache = Image.new('RGB', (total_map_width, total_map_height), (10, 10, 10))
-            self.static_map_size = cache_key
-            
-            # Rendere ALLE Tiles einmalig (mit Frame 0 für Animationen)
-            for y in range(height):
-                for x in range(width):
-                    paste_x = x * current_tile_size
-                    paste_y = y * current_tile_size
-                    
-                    if y < len(tiles) and x < len(tiles[y]):
-                        terrain = tiles[y][x]
-                    else:
-                        terrain = "grass"
-                    
-                    # River direction lookup für water tiles
-                    river_direction = "right"  # Default
-                    if terrain == "water":
-                        coord_key = f"{x},{y}"
-                        river_direction = self.river_directions.get(coord_key, "right")
-                    
-                    # Statisches Tile rendern (Frame 0)
-                    if hasattr(self.texture_manager, 'advanced_renderer') and self.texture_manager.advanced_renderer:
-                        texture_img = self.texture_manager.advanced_renderer.get_texture(
-                            terrain, current_tile_size, 0, river_direction  # Frame 0 für Cache!
-                        )
-                    else:
-                        texture_img = self.texture_manager.get_texture(terrain, current_tile_size)
-                    
-                    if texture_img:
-                        # SPECIAL: Village gibt größeres Bild zurück für Overlap
-                        if terrain == 'village' and texture_img.size[0] > current_tile_size:
-                            if texture_img.mode == 'RGBA':
-                                offset_x = paste_x
-                                offset_y = paste_y - int(current_tile_size * 2)  # 2 Tiles nach oben
-                                self.static_map_cache.paste(texture_img, (offset_x, offset_y), texture_img)
-                            else:
-                                texture_img = texture_img.convert('RGB')
-                                self.static_map_cache.paste(texture_img, (paste_x, paste_y))
-                        else:
-                            if texture_img.mode != 'RGB':
-                                texture_img = texture_img.convert('RGB')
-                            self.static_map_cache.paste(texture_img, (paste_x, paste_y))
-        
-        # Kopiere statischen Cache als Basis
-        map_image = self.static_map_cache.copy()
-        
-        # NUR ANIMIERTE TILES neu rendern (wenn Animation läuft)
-        if self.is_animating and self.animated_positions:
-            for x, y, material in self.animated_positions:
-                paste_x = x * current_tile_size
-                paste_y = y * current_tile_size
-                
-                # River direction lookup für water tiles
-                river_direction = "right"  # Default
-                if material == "water":
-                    coord_key = f"{x},{y}"
-                    river_direction = self.river_directions.get(coord_key, "right")
-                
-                # Animiertes Tile mit aktuellem Frame rendern
-                if hasattr(self.texture_manager, 'advanced_renderer') and self.texture_manager.advanced_renderer:
-                    texture_img = self.texture_manager.advanced_renderer.get_texture(
-                        material, current_tile_size, self.animation_frame, river_direction
-                    )
-                    
-                    if texture_img:
-                        # SPECIAL: Village gibt größeres Bild zurück (3x) für Rauch über 2-3 Tiles
-                        if material == 'village' and texture_img.size[0] > current_tile_size:
-                            # Nutze Alpha-Channel für korrektes Overlapping
-                            if texture_img.mode == 'RGBA':
-                                # Gebäude am UNTEREN Rand ausrichten
-                                # Rauch ragt 2 Tiles nach oben (3x size - 1x tile = 2 tiles overlap)
-                                offset_x = paste_x
-                                offset_y = paste_y - int(current_tile_size * 2)  # 2 Tiles nach oben!
-                                map_image.paste(texture_img, (offset_x, offset_y), texture_img)
-                            else:
-                                texture_img = texture_img.convert('RGB')
-                                map_image.paste(texture_img, (paste_x, paste_y))
-                        else:
-                            if texture_img.mode != 'RGB':
-                                texture_img = texture_img.convert('RGB')
-                            map_image.paste(texture_img, (paste_x, paste_y))
-        
-        # Fog-of-War über alles zeichnen
-        if self.fog_enabled:
-            for y in range(height):
-                for x in range(width):
-                    if not self.fog.is_revealed(x, y):
-                        paste_x = x * current_tile_size
-                        paste_y = y * current_tile_size
-                        
-                        # Fog-Textur holen (gecacht)
-                        if current_tile_size not in self.fog_photo_cache:
-                            fog_texture = self.fog_texture_gen.get_fog_texture(current_tile_size, "normal")
-                            self.fog_photo_cache[current_tile_size] = fog_texture
-                        else:
-                            fog_texture = self.fog_photo_cache[current_tile_size]
-                        
-                        # Fog direkt aufs Map-Bild pasten
-                        if fog_texture.mode == 'RGBA':
-                            map_image.paste(fog_texture, (paste_x, paste_y), fog_texture)
-                        else:
-                            map_image.paste(fog_texture, (paste_x, paste_y))
-        
-        # JETZT erst: Konvertiere das EINE große Bild zu PhotoImage
         # Offset für Zentrierung
         offset_x = max(0, (canvas_width - total_map_width) // 2)
         offset_y = max(0, (canvas_height - total_map_height) // 2)
+        self.map_offset = (offset_x, offset_y)
+        
+        # Scroll-Region = GANZE Karte, auch wenn nur der sichtbare Ausschnitt gerendert wird
+        scroll_region = (offset_x, offset_y, offset_x + total_map_width, offset_y + total_map_height)
+        if self.scroll_region != scroll_region:
+            self.canvas.configure(scrollregion=scroll_region)
+            self.scroll_region = scroll_region
         
-        self.map_photo = ImageTk.PhotoImage(map_image)
+        # VIEWPORT-CULLING: Nur sichtbare Tiles (+ Rand) rendern
+        cache_key = (width, height, current_tile_size)
+        visible = self.visible_tile_range(width, height, current_tile_size)
+        view_invalid = (
+            self.engine.static_map_cache is None
+            or self.static_map_size != cache_key
+            or self.engine.static_is_preview != self.zooming
+            or not self.range_contains(self.engine.view_range, visible)
+        )
+        
+        # STATISCHEN AUSSCHNITT CACHEN (bei Zoom, Karten-Änderung oder wenn Pan den Rand erreicht)
+        if view_invalid:
+            self.frame_worker.wait_idle()
+            view_range = self.expand_tile_range(visible, width, height)
+            if not self.zooming:
+                new_size = self.engine.static_is_preview or self.static_map_size != cache_key
+                if (new_size or self.engine.static_map_cache is None) and \
+                        self.prewarm_textures(current_tile_size, new_size):
+                    # Texturen werden parallel gerendert - Fortschritt anzeigen statt einzufrieren
+                    return
+            
+            # Während des Zoomens: schnelle Vorschau aus der Mip-Pyramide, sonst aus dem Chunk-Cache
+            with shared_perf_stats.time("static_cache"):
+                rendered, chunks = self.engine.build_static_view(view_range, current_tile_size, preview=self.zooming)
+            if rendered:
+                x0, y0, x1, y1 = view_range
+                print(f"Statischer Ausschnitt ({x1 - x0}x{y1 - y0} von {width}x{height}, {current_tile_size}px): "
+                      f"{rendered}/{chunks} Chunks neu gerendert")
+            self.static_map_size = cache_key
         
-        # UPDATE statt DELETE+CREATE = kein Flackern!
-        if self.canvas_image_id is None:
-            # Erstes Mal: Image erstellen
-            self.canvas_image_id = self.canvas.create_image(
-                offset_x, offset_y, 
-                image=self.map_photo, 
-                anchor=tk.NW, 
-                tags="map"
+        # DIRTY-RECTANGLES: Voller Neuaufbau nur bei Ausschnitt-/Zoom-/Fog-Toggle-Änderung,
+        # sonst werden nur geänderte Tiles im persistenten Frame-Buffer neu komponiert
+        full_redraw = view_invalid or self.engine.needs_full_frame(self.fog_enabled, self.fog.revealed)
+        
+        x0, y0 = self.engine.view_range[:2]
+        image_x = offset_x + x0 * current_tile_size
+        image_y = offset_y + y0 * current_tile_size
+        
+        if full_redraw:
+            # Neuaufbau im Tk-Thread - laufender Frame-Auftrag wird vorher abgeschlossen und verworfen
+            self.frame_worker.wait_idle()
+            self.engine.compose_full_frame(
+                current_tile_size, self.animation_frame, self.fog.revealed,
+                self.fog.get_hidden_mask(*self.engine.view_range), self.fog_enabled,
+                animate=self.is_animating and not self.zooming
             )
+            
+            # Konvertiere den Ausschnitt zu PhotoImage
+            with shared_perf_stats.time("photo_image"):
+                self.map_photo = ImageTk.PhotoImage(self.engine.frame_buffer)
+            
+            # UPDATE statt DELETE+CREATE = kein Flackern!
+            if self.canvas_image_id is None:
+                # Erstes Mal: Image erstellen
+                self.canvas_image_id = self.canvas.create_image(
+                    image_x, image_y, 
+                    image=self.map_photo, 
+                    anchor=tk.NW, 
+                    tags="map"
+                )
+            else:
+                # Nachfolgende Male: Nur Image aktualisieren
+                self.canvas.itemconfig(self.canvas_image_id, image=self.map_photo)
+                self.canvas.coords(self.canvas_image_id, image_x, image_y)
+            
+            # Neuer Ausschnitt: evtl. kommt jetzt etwas Animiertes ins Bild
+            self.wake_animation()
         else:
-            # Nachfolgende Male: Nur Image aktualisieren
-            self.canvas.itemconfig(self.canvas_image_id, image=self.map_photo)
-            self.canvas.coords(self.canvas_image_id, offset_x, offset_y)
+            self.request_frame(current_tile_size)
+            self.canvas.coords(self.canvas_image_id, image_x, image_y)
+    
+    def visible_tile_range(self, width, height, tile_size):
+        """Sichtbarer Tile-Bereich (x0, y0, x1, y1) - Ende exklusiv"""
+        offset_x, offset_y = self.map_offset
+        left = self.canvas.canvasx(0) - offset_x
+        top = self.canvas.canvasy(0) - offset_y
+        right = left + self.canvas.winfo_width()
+        bottom = top + self.canvas.winfo_height()
+        
+        x0 = max(0, min(width, int(left // tile_size)))
+        y0 = max(0, min(height, int(top // tile_size)))
+        x1 = max(x0, min(width, int(-(-right // tile_size))))
+        y1 = max(y0, min(height, int(-(-bottom // tile_size))))
+        return (x0, y0, x1, y1)
+    
+    def expand_tile_range(self, tile_range, width, height):
+        """Sichtbaren Bereich um VIEWPORT_MARGIN Tiles erweitern (Puffer fürs Pannen)"""
+        x0, y0, x1, y1 = tile_range
+        margin = VIEWPORT_MARGIN
+        return (max(0, x0 - margin), max(0, y0 - margin),
+                min(width, x1 + margin), min(height, y1 + margin))
+    
+    def range_contains(self, outer, inner):
+        """Prüft ob ein Tile-Bereich komplett in einem anderen liegt"""
+        if outer is None:
+            return False
+        return (outer[0] <= inner[0] and outer[1] <= inner[1]
+                and inner[2] <= outer[2] and inner[3] <= outer[3])
+    
+    def refresh_viewport(self):
+        """Nach Pan: nur neu rendern wenn der sichtbare Bereich den gerenderten Ausschnitt verlässt"""
+        if self.static_map_size is None or self.engine.view_range is None:
+            return
+        width, height, tile_size = self.static_map_size
+        if not self.range_contains(self.engine.view_range, self.visible_tile_range(width, height, tile_size)):
+            self.render_map()
+    
+    def prewarm_textures(self, tile_size, new_size):
+        """
+        Startet das parallele Vorwärmen, wenn genug Texturen fehlen
+        True solange es läuft - render_map zeigt dann nur den Fortschritt
+        """
+        if self.prewarmer is not None:
+            return True
+        
+        renderer = getattr(self.texture_manager, 'advanced_renderer', None)
+        if not renderer or not self.prewarm_enabled or tile_size < MIN_GENERATED_TILE_SIZE:
+            return False
+        
+        # Vorgerenderte Tiles von Disk laden statt neu zu generieren
+        if new_size:
+            renderer.preload_disk_cache(tile_size)
+        
+        jobs = missing_texture_jobs(renderer, collect_texture_jobs(renderer, self.engine.grid, tile_size))
+        if len(jobs) < PREWARM_MIN_JOBS:
+            return False
+        
+        try:
+            self.prewarmer = TexturePrewarmer(renderer, jobs)
+        except (OSError, RuntimeError) as e:
+            print(f"Prozess-Pool nicht verfügbar ({e}) - Texturen werden direkt gerendert")
+            self.prewarm_enabled = False
+            return False
+        
+        print(f"Vorwärmen: {len(jobs)} Texturen ({tile_size}px) im Prozess-Pool")
+        self.show_prewarm_progress(0, len(jobs))
+        self.prewarm_poll_id = self.after(PREWARM_POLL_MS, self.poll_prewarm)
+        return True
+    
+    def poll_prewarm(self):
+        """Übernimmt fertige Texturen, aktualisiert den Fortschritt und rendert danach die Karte"""
+        self.prewarm_poll_id = None
+        if self.prewarmer is None:
+            return
+        
+        done, total = self.prewarmer.poll()
+        if not self.prewarmer.is_done():
+            self.show_prewarm_progress(done, total)
+            self.prewarm_poll_id = self.after(PREWARM_POLL_MS, self.poll_prewarm)
+            return
         
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        print(f"Vorwärmen fertig: {self.prewarmer.completed}/{total} Texturen")
+        if self.prewarmer.failed:
+            print("Prozess-Pool fehlerhaft - Vorwärmen deaktiviert")
+            self.prewarm_enabled = False
+        self.prewarmer = None
+        self.canvas.delete("prewarm")
+        self.render_map()
+    
+    def show_prewarm_progress(self, done, total):
+        """Fortschrittsbalken in der Mitte des sichtbaren Canvas-Bereichs"""
+        self.canvas.delete("prewarm")
+        
+        center_x = self.canvas.canvasx(self.canvas.winfo_width() // 2)
+        center_y = self.canvas.canvasy(self.canvas.winfo_height() // 2)
+        bar_width = 300
+        filled = bar_width * done // max(1, total)
+        left = center_x - bar_width // 2
+        
+        self.canvas.create_text(center_x, center_y - 20, text=f"Texturen werden vorbereitet... {done}/{total}",
+                                fill="#888888", font=("Arial", 12), tags="prewarm")
+        self.canvas.create_rectangle(left, center_y, left + bar_width, center_y + 12,
+                                     outline="#444444", tags="prewarm")
+        if filled:
+            self.canvas.create_rectangle(left, center_y, left + filled, center_y + 12,
+                                         fill="#666666", outline="", tags="prewarm")
+    
+    def animation_visible(self):
+        """Animierte Tiles im Ausschnitt zeichnen? Während des Zoomens nicht (Atlas würde neu starten)"""
+        return self.is_animating and bool(self.engine.view_animated) and not self.zooming
+    
+    def fog_drifting(self):
+        """Weicher Nebel mit Wolken-Drift ändert sich jeden Frame"""
+        return self.engine.fog_drifting(self.fog_enabled)
+    
+    def request_frame(self, tile_size):
+        """
+        Nächsten Frame an den Render-Thread geben - mit Schnappschuss von Frame-Nummer und Nebel,
+        damit Eingaben im Tk-Thread den laufenden Auftrag nicht verändern
+        """
+        animate = self.animation_visible()
+        if animate:
+            self.engine.ensure_animation_atlas(tile_size)
+        
+        self.frame_worker.submit(partial(
+            self.engine.compose_next_frame, tile_size, self.animation_frame,
+            self.fog.revealed.copy(), self.fog.get_hidden_mask(*self.engine.view_range),
+            animate, self.fog_enabled, self.fog_drifting()
+        ))
+        
+        if self.frame_poll_id is None:
+            self.frame_poll_id = self.after(FRAME_POLL_MS, self.present_frame)
+    
+    def present_frame(self):
+        """Tk-Seite: fertige Bereiche aus dem Back-Buffer ins PhotoImage übernehmen"""
+        self.frame_poll_id = None
+        
+        updates = self.frame_worker.take()
+        if updates and self.map_photo is not None:
+            started = self.pacer.clock()
+            full_box = (0, 0, self.map_photo.width(), self.map_photo.height())
+            for image, box in updates:
+                if box == full_box:
+                    self.map_photo.paste(image)
+                else:
+                    self.push_region(image, box)
+            present_time = self.pacer.clock() - started
+            shared_perf_stats.record("photo_image", present_time)
+            
+            # Frame-Kosten = Compositing im Render-Thread + Übernahme ins PhotoImage
+            frame_time = self.frame_worker.last_duration + present_time
+            shared_perf_stats.record("frame", frame_time)
+            self.pacer.frame_rendered(frame_time)
+        
+        if self.frame_worker.busy():
+            self.frame_poll_id = self.after(FRAME_POLL_MS, self.present_frame)
+    
+    def push_region(self, region, box):
+        """Nur diesen Bereich ins angezeigte PhotoImage kopieren"""
+        region_photo = ImageTk.PhotoImage(region)
+        self.tk.call(str(self.map_photo), 'copy', str(region_photo), '-to', box[0], box[1])
     
     def center_view(self):
         """Karte zentrieren und skalieren für Fullscreen"""
@@ -414,6 +586,9 @@ class ProjectorWindow(tk.Toplevel):
         
         self.pan_start_x = event.x
         self.pan_start_y = event.y
+        
+        # Neuen Ausschnitt nur rendern wenn der Rand-Puffer verlassen wird
+        self.refresh_viewport()
     
     def zoom(self, event):
         """Zoom mit Mausrad"""
@@ -423,8 +598,46 @@ class ProjectorWindow(tk.Toplevel):
             self.zoom_level *= 0.9
         
         self.zoom_level = max(0.5, min(3.0, self.zoom_level))
+        
+        # Vorschau aus Mip-Stufen, exakte Größe erst wenn das Mausrad ruht
+        self.zooming = True
+        if self.zoom_settle_id:
+            self.after_cancel(self.zoom_settle_id)
+        self.zoom_settle_id = self.after(ZOOM_SETTLE_MS, self.finish_zoom)
+        
         self.render_map()
     
+    def finish_zoom(self):
+        """Zoom beendet: Ausschnitt in exakter Tile-Größe neu rendern"""
+        self.zoom_settle_id = None
+        self.zooming = False
+        self.render_map()
+    
+    def toggle_perf_overlay(self):
+        """F3: Performance-Overlay (p50/p95 pro Render-Stufe) ein/ausblenden"""
+        if self.perf_label is not None:
+            if self.perf_overlay_id:
+                self.after_cancel(self.perf_overlay_id)
+                self.perf_overlay_id = None
+            self.perf_label.destroy()
+            self.perf_label = None
+            return
+        
+        self.perf_label = tk.Label(self, bg="#0a0a0a", fg="#00ff00", justify=tk.LEFT,
+                                   font=("Courier", 10), anchor=tk.NW)
+        self.perf_label.place(x=10, rely=1.0, y=-10, anchor=tk.SW)
+        self.update_perf_overlay()
+    
+    def update_perf_overlay(self):
+        """Overlay-Text regelmäßig aus den rollierenden Messwerten erneuern"""
+        self.perf_overlay_id = None
+        if self.perf_label is None:
+            return
+        
+        lines = shared_perf_stats.report_lines(shared_texture_cache.stats(), self.pacer.fps)
+        self.perf_label.config(text="\n".join(lines))
+        self.perf_overlay_id = self.after(PERF_OVERLAY_MS, self.update_perf_overlay)
+    
     def toggle_fullscreen(self):
         """Vollbild ein/ausschalten"""
         current = self.attributes('-fullscreen')
@@ -439,7 +652,19 @@ class ProjectorWindow(tk.Toplevel):
         else:
             self.fog_toggle_btn.config(text="🌫️ Nebel: AUS", fg="#ff0000")
         
+        # Wolken-Drift startet die Animations-Schleife über render_map -> wake_animation
+        self.render_map()
+    
+    def set_fog_drift(self, enabled):
+        """Wolken-Drift des weichen Nebels ein/aus (F4 oder GM-Panel)"""
+        # Render-Thread liest fog_drift - erst fertig werden lassen
+        self.frame_worker.wait_idle()
+        self.engine.fog_drift = enabled
+        self.engine.invalidate_frame()
+        print(f"Wolken-Drift: {'AN' if enabled else 'AUS'}")
+        
         self.render_map()
+        self.wake_animation()
     
     def toggle_controls(self):
         """Control-Bar ein/ausblenden"""
@@ -462,14 +687,21 @@ class ProjectorWindow(tk.Toplevel):
             # Nach 5 Sekunden wieder ausblenden
             self.after(5000, lambda: self.hide_controls())
     
-    def update_map(self, map_data):
-        """Karte aktualisieren"""
+    def update_map(self, map_data, map_loader=None):
+        """Karte aktualisieren - map_loader: Karte wird noch gestreamt (siehe poll_map_stream)"""
+        # Render-Thread liest Karte und animierte Tiles - erst fertig werden lassen
+        self.frame_worker.wait_idle()
+        
+        self.map_loader = map_loader
+        if self.map_loader and self.map_stream_poll_id is None:
+            self.map_stream_poll_id = self.after(MAP_STREAM_POLL_MS, self.poll_map_stream)
+        
         self.map_data = map_data
         self.river_directions = map_data.get("river_directions", {})  # Update river directions
         self.detail_system.update_base_map(map_data)
         
         # WICHTIG: Fog-Cache leeren bei Map-Update
-        self.fog_photo_cache.clear()
+        self.engine.fog_tile_cache.clear()
         
         # WICHTIG: Auch den internen Cache des FogGenerators leeren
         if hasattr(self, 'fog_generator') and self.fog_generator:
@@ -479,10 +711,16 @@ class ProjectorWindow(tk.Toplevel):
         if hasattr(self, 'texture_manager') and self.texture_manager:
             self.texture_manager.clear_cache()
         
+        # Tiles haben sich geändert: Ausschnitt neu zusammensetzen
+        # (nur Chunks mit geänderten Tiles werden wirklich neu gerendert)
+        self.check_for_animated_tiles()
+        
         self.render_map()
     
     def toggle_detail_view(self, event=None):
         """Wechselt zwischen Basis- und Detail-Ansicht"""
+        self.frame_worker.wait_idle()
+        
         if self.detail_system.is_in_detail_view():
             # Zurück zur Basis
             self.detail_system.switch_to_base()
@@ -493,79 +731,153 @@ class ProjectorWindow(tk.Toplevel):
                 if current_tile:
                     self.detail_system.auto_switch_on_position(current_tile[0], current_tile[1])
         
+        # Andere Karte: alles neu aufbauen
+        self.check_for_animated_tiles()
+        
         self.render_map()
     
-    def check_for_animated_tiles(self):
-        """Prüft ob die Map animierte Tiles hat und sammelt ihre Positionen"""
-        self.has_animated_tiles = False
-        self.animated_positions = []
-        
-        if not self.map_data or 'tiles' not in self.map_data:
+    def streaming_rows(self, map_data):
+        """Schon geladene Zeilen, solange map_data noch gestreamt wird (sonst None = vollständig)"""
+        if self.map_loader and map_data is self.map_loader.map_data:
+            loaded_rows, done = self.map_loader.poll()
+            if not done:
+                return loaded_rows
+        return None
+    
+    def poll_map_stream(self):
+        """Übernimmt neu geladene Zeilen - neu gerendert wird nur, wenn sie im Ausschnitt liegen"""
+        self.map_stream_poll_id = None
+        if self.map_loader is None:
             return
         
-        # Liste der animierten Materialien
-        animated_materials = {'water', 'forest', 'animated_forest', 'animated_grass', 'village'}
+        loaded_rows, done = self.map_loader.poll()
         
-        tiles = self.map_data.get('tiles', [])
+        if self.map_loader.error is not None:
+            # Stream abgebrochen: nicht weiter abfragen, geladene Zeilen bleiben stehen, der Rest schwarz
+            # (Meldung + Rückfall auf die vorige Karte übernimmt die Hauptanwendung)
+            print(f"Karte konnte nicht vollständig geladen werden: {self.map_loader.error}")
+            return
         
-        # DEBUG: Sammle Material-Statistik
-        material_counts = {}
+        if done:
+            # Vollständig (bei JSON jetzt auch mit Fluss-Richtungen): Karte komplett übergeben
+            self.frame_worker.wait_idle()
+            self.map_loader.grid.loading_finished()  # Version hoch - Chunk-Caches vergleichen neu
+            self.map_loader = None
+            self.check_for_animated_tiles()
+            self.render_map()
+            print("Karte vollständig geladen")
+            return
         
-        # Sammle ALLE animierten Positionen
-        for y, row in enumerate(tiles):
-            for x, material in enumerate(row):
-                # Statistik sammeln
-                material_counts[material] = material_counts.get(material, 0) + 1
-                
-                is_animated = False
-                
-                if material in animated_materials:
-                    is_animated = True
-                elif material.startswith('custom_'):
-                    # Prüfe custom materials mit Frames
-                    custom_info = self.texture_manager.custom_materials.get(material)
-                    if custom_info and custom_info.get('frames', 0) > 1:
-                        is_animated = True
-                
-                if is_animated:
-                    self.animated_positions.append((x, y, material))
-                    self.has_animated_tiles = True
+        engine = self.engine
+        if engine.map_data is self.map_loader.map_data and engine.loaded_rows is not None \
+                and loaded_rows > engine.loaded_rows:
+            # Render-Thread liest die animierten Tiles - erst fertig werden lassen
+            self.frame_worker.wait_idle()
+            if engine.rows_loaded(loaded_rows):
+                self.render_map()
+        self.map_stream_poll_id = self.after(MAP_STREAM_POLL_MS, self.poll_map_stream)
+    
+    def check_for_animated_tiles(self):
+        """Übergibt die aktuelle Karte an die Engine (sammelt dort die animierten Tiles)"""
+        current_map = self.detail_system.get_current_map()
+        self.engine.set_map(current_map, self.streaming_rows(current_map))
+        self.has_animated_tiles = bool(self.engine.animated_positions)
+        self.watch_grid(self.engine.grid)
+        
+        # DEBUG: Zeige Material-Verteilung (Histogramm aus dem Raster)
+        material_counts = self.engine.grid.histogram()
         
-        # DEBUG: Zeige Material-Verteilung
         print("Material-Statistik auf der Map:")
         for mat, count in sorted(material_counts.items()):
-            is_anim = "🎬 ANIMIERT" if mat in animated_materials else ""
+            is_anim = "🎬 ANIMIERT" if mat in ANIMATED_MATERIALS else ""
             print(f"  {mat}: {count} Tiles {is_anim}")
-        print(f"\nGesamt: {len(self.animated_positions)} animierte Tiles gefunden")
+        print(f"\nGesamt: {len(self.engine.animated_positions)} animierte Tiles gefunden")
     
     def start_animation(self):
         """Startet die Animation für Wasser, Wälder, etc."""
         self.is_animating = True
-        if self.is_animating:
-            self.animate_tiles()
+        if self.animation_id is None:
+            self.pacer.reset_window()
+            self.animation_id = self.after(0, self.animate_tiles)
+    
+    def animation_needed(self):
+        """Gibt es im Ausschnitt etwas, das sich pro Frame ändert?"""
+        return self.engine.animation_needed(self.fog_enabled)
+    
+    def watch_grid(self, grid):
+        """Änderungs-Meldungen des aktuellen Rasters abonnieren (nur eins zur Zeit)"""
+        if grid is self.watched_grid:
+            return
+        if self.watched_grid:
+            self.watched_grid.unsubscribe(self.on_grid_changed)
+        self.watched_grid = grid
+        grid.subscribe(self.on_grid_changed)
+    
+    def on_grid_changed(self, grid, region):
+        """Tile im Editor geändert - gesammelt übernehmen (Meldungen kommen im Tk-Thread)"""
+        if self.map_loader or self.grid_update_id is not None:
+            return  # Streaming: poll_map_stream übernimmt neue Zeilen selbst
+        self.grid_update_id = self.after(GRID_UPDATE_MS, self.apply_grid_changes)
+    
+    def apply_grid_changes(self):
+        """Nur Chunks mit geänderten Tiles werden neu gerendert (Chunk-Cache vergleicht das Raster)"""
+        self.grid_update_id = None
+        self.frame_worker.wait_idle()
+        current_map = self.detail_system.get_current_map()
+        self.engine.set_map(current_map, self.streaming_rows(current_map))
+        self.has_animated_tiles = bool(self.engine.animated_positions)
+        self.render_map()
+        self.wake_animation()
+    
+    def wake_animation(self):
+        """Schleife (wieder) starten, sobald nach Pan/Zoom/Karten-Wechsel etwas Animiertes sichtbar ist"""
+        if not self.is_animating and self.animation_needed():
+            self.start_animation()
     
     def animate_tiles(self):
         """Animiert Wasser und andere animierte Materialien im Projektor"""
+        self.animation_id = None
         if not self.is_animating:
             return
         
-        # Frame erhöhen - 240 Frames für längere, langsamere Loops
-        self.animation_frame = (self.animation_frame + 1) % 240
+        # LEERLAUF: nichts Animiertes sichtbar -> Schleife komplett anhalten
+        if not self.animation_needed():
+            self.is_animating = False
+            return
+        
+        # Frame folgt der Uhr (240 Frames pro Loop) - ist der Renderer zu langsam,
+        # werden Frames übersprungen statt die Animation zu verlangsamen
+        frame = self.pacer.animation_frame()
         
-        # PERFORMANCE: Nur jeden 2. Frame tatsächlich rendern (15 FPS effektiv)
-        # Animation läuft trotzdem mit 30 FPS (frame counter erhöht sich), aber Rendering seltener
-        self.frame_skip_counter += 1
-        if self.frame_skip_counter >= 2:
-            self.frame_skip_counter = 0
-            # Map rendern (optimiert durch Caching - nur animierte Tiles!)
+        # Komponiert wird im Render-Thread - neuer Auftrag erst wenn der letzte fertig ist
+        if frame != self.animation_frame and not self.frame_worker.busy():
+            self.animation_frame = frame
             self.render_map()
         
-        # Nächster Frame nach 33ms (~30 FPS Animation, 15 FPS Rendering)
-        self.animation_id = self.after(33, self.animate_tiles)
+        # Nächster Tick nach gemessener Frame-Zeit (Ziel-Budget oder langsamer)
+        self.animation_id = self.after(self.pacer.next_delay_ms(), self.animate_tiles)
     
     def destroy(self):
         """Aufräumen beim Schließen"""
         self.is_animating = False
         if self.animation_id:
             self.after_cancel(self.animation_id)
+        if self.zoom_settle_id:
+            self.after_cancel(self.zoom_settle_id)
+        if self.prewarm_poll_id:
+            self.after_cancel(self.prewarm_poll_id)
+        if self.prewarmer:
+            self.prewarmer.shutdown()
+        if self.frame_poll_id:
+            self.after_cancel(self.frame_poll_id)
+        if self.perf_overlay_id:
+            self.after_cancel(self.perf_overlay_id)
+        if self.map_stream_poll_id:
+            self.after_cancel(self.map_stream_poll_id)
+        if self.grid_update_id:
+            self.after_cancel(self.grid_update_id)
+        if self.watched_grid:
+            self.watched_grid.unsubscribe(self.on_grid_changed)
+        self.frame_worker.stop()
+        self.engine.close()
         super().destroy()
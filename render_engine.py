@@ -0,0 +1,537 @@
+"""
+Headless Render-Engine für "Der Eine Ring"
+Komponiert Karte, animierte Tiles (inkl. Village-Rauch-Overlap) und Fog-of-War ohne Tk:
+Karte + Nebel + Ausschnitt + Frame-Nummer -> PIL-Bild oder NumPy-Puffer
+Genutzt von Projektor, GM-Vorschau, Exporten und Benchmark
+"""
+import numpy as np
+from PIL import Image
+
+from animation_atlas import AnimationAtlas, ATLAS_MATERIALS
+from fog_engine import SoftFogLayer
+from fog_texture_generator import FogTextureGenerator
+from map_chunk_cache import MapChunkCache
+from perf_stats import shared_perf_stats
+from texture_cache import shared_texture_cache
+from tile_grid import ANIMATED_MATERIALS, TileGrid  # noqa: F401 - ANIMATED_MATERIALS für bestehende Importe
+
+# Hintergrund außerhalb der Tiles
+BACKGROUND = (10, 10, 10)
+
+# Kleinere Tiles (Übersichten, GM-Karte, weit herausgezoomt) kommen skaliert aus der Mip-Pyramide -
+# die Generatoren brauchen ein paar Pixel Platz (Bäume, Häuser)
+MIN_GENERATED_TILE_SIZE = 16
+
+
+def animated_sprite_tiles(x, y, material):
+    """Tiles, die das Sprite eines animierten Tiles überdeckt (Village-Rauch: 3x3 nach oben)"""
+    if material == 'village':
+        return [(tx, ty) for ty in range(y - 2, y + 1) for tx in range(x, x + 3)]
+    return [(x, y)]
+
+
+def paste_tile_image(target, texture_img, material, paste_x, paste_y, tile_size):
+    """Pastet ein Tile - Village mit 3x-Bild wird für den Rauch-Overlap nach oben versetzt"""
+    # SPECIAL: Village gibt größeres Bild zurück (3x) für Rauch über 2-3 Tiles
+    if material == 'village' and texture_img.size[0] > tile_size:
+        # Nutze Alpha-Channel für korrektes Overlapping
+        if texture_img.mode == 'RGBA':
+            # Gebäude am UNTEREN Rand ausrichten
+            # Rauch ragt 2 Tiles nach oben (3x size - 1x tile = 2 tiles overlap)
+            target.paste(texture_img, (paste_x, paste_y - int(tile_size * 2)), texture_img)
+        else:
+            target.paste(texture_img.convert('RGB'), (paste_x, paste_y))
+    else:
+        if texture_img.mode != 'RGB':
+            texture_img = texture_img.convert('RGB')
+        target.paste(texture_img, (paste_x, paste_y))
+
+
+class RenderEngine:
+    """
+    Zustand eines gerenderten Ausschnitts: statischer Cache, Basis-Ebene (statisch + animiert),
+    Fog-Ebene und fertiger Frame - Vollaufbau oder inkrementell per Dirty-Rects
+    NICHT thread-sicher: ein Aufrufer zur Zeit (der Projektor serialisiert über seinen Render-Thread)
+    """
+
+    def __init__(self, renderer=None, texture_manager=None, use_atlas=False):
+        # Ohne Angabe: eigener Renderer (Headless-Export, Benchmark)
+        if renderer is None and texture_manager is None:
+            from advanced_texture_renderer import AdvancedTextureRenderer
+            renderer = AdvancedTextureRenderer()
+        if renderer is None:
+            renderer = getattr(texture_manager, 'advanced_renderer', None)
+        self.renderer = renderer
+        self.texture_manager = texture_manager
+
+        # Atlas = Sprite-Sheets im Hintergrund (Projektor), sonst jeder Frame direkt gerendert (Export)
+        self.use_atlas = use_atlas
+        self.animation_atlas = None
+
+        # Karte
+        self.map_data = None
+        self.width = 0
+        self.height = 0
+        self.grid = None  # TileGrid - Modell für Abfragen und Änderungs-Erkennung
+        self.tiles = []  # dekodierte Ansicht des Rasters (schneller Einzelzugriff beim Rendern)
+        self.river_directions = {}
+        self.animated_positions = []
+        self.loaded_rows = None  # Streaming-Laden: Zeilen ab hier fehlen noch (None = vollständig)
+
+        # Nebel: "soft" = Distanzfeld-Ränder + Wolken, "tiles" = alte harte Fog-Tiles
+        # Wolken-Drift nur auf Wunsch - sie macht jeden Frame den ganzen Nebel-Bereich neu
+        self.fog_style = "soft"
+        self.fog_drift = False
+        self.soft_fog = SoftFogLayer()
+        self.fog_texture_gen = FogTextureGenerator()
+        self.fog_tile_cache = shared_texture_cache.namespace("projector_fog")  # PIL Images
+
+        # Statischer Ausschnitt (Frame 0) aus Chunks pro Zoom-Stufe
+        self.chunk_cache = MapChunkCache()
+        self.static_map_cache = None
+        self.static_is_preview = False
+        self.view_range = None  # (x0, y0, x1, y1) - Ende exklusiv
+        self.tile_size = None
+
+        # Ebenen des Ausschnitts
+        self.base_buffer = None  # statisch + animiert, OHNE Fog
+        self.fog_overlay = None  # RGBA Fog-Ebene (nur bei Fog-Änderung neu)
+        self.frame_buffer = None  # fertiger Frame
+        self.fog_snapshot = None  # revealed beim letzten Compositing
+        self.frame_fog_enabled = None
+        self.frame_fog_style = None
+        self.animated_cover = {}  # (tx, ty) -> Indizes in animated_positions
+        self.view_animated = []  # Indizes der animierten Tiles im Ausschnitt
+
+    def set_map(self, map_data, loaded_rows=None, grid=None):
+        """
+        Neue (oder geänderte) Karte - Chunks mit geänderten Tiles werden beim nächsten Aufbau neu gerendert
+        loaded_rows: Karte wird noch gestreamt (map_stream.py) - Zeilen darunter bleiben schwarz
+        grid: schon vorhandenes TileGrid der Karte (z.B. aus einer anderen Engine) - sonst TileGrid.of()
+        """
+        self.map_data = map_data
+        self.loaded_rows = loaded_rows
+        self.grid = grid if grid is not None else TileGrid.of(map_data, loaded_rows)
+        self.width = self.grid.width
+        self.height = self.grid.height
+        self.tiles = self.grid.tiles
+        self.river_directions = self.grid.river_directions
+
+        custom = self.renderer.custom_textures if self.renderer else {}
+        self.animated_positions = self.grid.animated_positions(custom, 0, loaded_rows)
+
+        self.static_map_cache = None
+        self.invalidate_frame()
+
+    def rows_loaded(self, loaded_rows):
+        """
+        Streaming: weitere Zeilen sind da - ihre animierten Tiles ergänzen
+        True wenn der aktuelle Ausschnitt betroffen ist (muss neu aufgebaut werden)
+        """
+        old_rows = self.loaded_rows
+        if old_rows is None or loaded_rows <= old_rows:
+            return False
+        self.loaded_rows = loaded_rows if loaded_rows < self.height else None
+
+        self.grid.load_rows(old_rows, loaded_rows)
+        custom = self.renderer.custom_textures if self.renderer else {}
+        self.animated_positions += self.grid.animated_positions(custom, old_rows, loaded_rows)
+
+        # Village-Rauch ragt 2 Tiles nach oben in den Ausschnitt
+        if self.view_range is None or not (self.view_range[1] < loaded_rows and old_rows < self.view_range[3] + 2):
+            return False
+        self.static_map_cache = None
+        self.invalidate_frame()
+        return True
+
+    def available_rows(self):
+        """Zeilen, die gerendert werden können (beim Streamen nur die schon geladenen)"""
+        return self.height if self.loaded_rows is None else self.loaded_rows
+
+    def river_direction(self, material, x, y):
+        """Fluss-Richtung für Wasser-Tiles, sonst Default"""
+        if material == "water":
+            return self.river_directions.get(f"{x},{y}", "right")
+        return "right"
+
+    def tile_at(self, x, y):
+        if y < len(self.tiles) and x < len(self.tiles[y]):
+            return self.tiles[y][x]
+        return "grass"
+
+    def static_tile_texture(self, terrain, x, y, tile_size, preview=False):
+        """Statisches Tile (Frame 0) - preview=True skaliert die nächste Mip-Stufe"""
+        river_direction = self.river_direction(terrain, x, y)
+
+        if self.renderer:
+            if preview or tile_size < MIN_GENERATED_TILE_SIZE:
+                return self.renderer.get_scaled_texture(terrain, tile_size, 0, river_direction)
+            return self.renderer.get_texture(terrain, tile_size, 0, river_direction)  # Frame 0 für Cache!
+        return self.texture_manager.get_texture(terrain, tile_size)
+
+    def render_static_region(self, tile_size, tile_range, preview=False):
+        """Rendert die statischen Tiles (Frame 0) eines Tile-Bereichs"""
+        x0, y0, x1, y1 = tile_range
+        region = Image.new('RGB', ((x1 - x0) * tile_size, (y1 - y0) * tile_size), BACKGROUND)
+
+        # Villages links/unterhalb des Bereichs ragen mit ihrem Rauch hinein -> 2 Tiles mitnehmen
+        for y in range(y0, min(self.available_rows(), y1 + 2)):
+            for x in range(max(0, x0 - 2), x1):
+                terrain = self.tile_at(x, y)
+
+                inside = x >= x0 and y < y1
+                if not inside and terrain != 'village':
+                    continue
+
+                texture_img = self.static_tile_texture(terrain, x, y, tile_size, preview)
+                if texture_img:
+                    paste_tile_image(region, texture_img, terrain,
+                                     (x - x0) * tile_size, (y - y0) * tile_size, tile_size)
+
+        return region
+
+    def build_static_view(self, view_range, tile_size, preview=False):
+        """
+        Statischer Ausschnitt: aus gecachten Chunks zusammengesetzt, nur fehlende werden gerendert
+        preview=True (Zoom-Vorschau): direkt aus der Mip-Pyramide, ohne Chunk-Cache
+        Gibt (neu gerenderte Chunks, Chunks gesamt) zurück
+        """
+        self.view_range = view_range
+        self.tile_size = tile_size
+        self.static_is_preview = preview
+
+        if preview:
+            self.static_map_cache = self.render_static_region(tile_size, view_range, preview=True)
+            return 0, 0
+
+        x0, y0, x1, y1 = view_range
+
+        # Geänderte Tiles (Editor-Update, Detail-Wechsel) invalidieren nur ihre Chunks
+        self.chunk_cache.sync(self.grid)
+
+        self.static_map_cache = Image.new('RGB', ((x1 - x0) * tile_size, (y1 - y0) * tile_size), BACKGROUND)
+
+        rendered = 0
+        chunks = self.chunk_cache.chunks_for_range(view_range)
+        for chunk_x, chunk_y in chunks:
+            chunk = self.chunk_cache.get(tile_size, chunk_x, chunk_y)
+            chunk_range = self.chunk_cache.chunk_range(chunk_x, chunk_y, self.width, self.height)
+            if chunk is None:
+                chunk = self.render_static_region(tile_size, chunk_range)
+                # Noch unvollständig geladene Chunks (inkl. Rauch von unten) nicht cachen
+                if self.loaded_rows is None or chunk_range[3] + 2 <= self.loaded_rows:
+                    self.chunk_cache.put(tile_size, chunk_x, chunk_y, chunk)
+                rendered += 1
+            self.static_map_cache.paste(chunk, ((chunk_range[0] - x0) * tile_size,
+                                                (chunk_range[1] - y0) * tile_size))
+        return rendered, len(chunks)
+
+    def ensure_animation_atlas(self, tile_size):
+        """
+        Startet den Atlas-Aufbau im Hintergrund (einmal pro Tile-Größe)
+        Gibt den aktuellen Atlas zurück (kann noch unfertig sein)
+        """
+        if not self.use_atlas or not self.renderer or tile_size < MIN_GENERATED_TILE_SIZE:
+            return None
+
+        materials = {material for _, _, material in self.animated_positions
+                     if material in ATLAS_MATERIALS}
+
+        atlas = self.animation_atlas
+        if (atlas is None or atlas.tile_size != tile_size
+                or not all(atlas.covers(material) for material in materials)):
+            if atlas:
+                atlas.cancel()
+            self.animation_atlas = AnimationAtlas(self.renderer, tile_size, materials).start()
+
+        return self.animation_atlas
+
+    def animated_tile_texture(self, x, y, material, tile_size, frame_textures, frame):
+        """
+        Aktueller Animations-Frame eines Tiles
+        Mit Atlas werden nur FERTIGE Sheets gelesen, ohne Atlas wird der Frame direkt gerendert
+        """
+        river_direction = self.river_direction(material, x, y)
+
+        # Ein Crop pro (Material, Richtung) und Frame
+        frame_key = (material, river_direction)
+        if frame_key in frame_textures:
+            return frame_textures[frame_key]
+
+        atlas = self.animation_atlas if self.use_atlas and tile_size >= MIN_GENERATED_TILE_SIZE else None
+
+        if atlas and atlas.covers(material):
+            # None = Sheet noch nicht fertig -> statisches Tile bleibt stehen
+            texture_img = atlas.get_frame(material, frame, river_direction)
+        elif self.renderer and tile_size < MIN_GENERATED_TILE_SIZE:
+            texture_img = self.renderer.get_scaled_texture(material, tile_size, frame, river_direction)
+        elif self.renderer:
+            texture_img = self.renderer.get_texture(material, tile_size, frame, river_direction)
+        else:
+            texture_img = None
+
+        frame_textures[frame_key] = texture_img
+        return texture_img
+
+    def build_animation_index(self):
+        """Index: Tile im Ausschnitt -> animierte Tiles, deren Sprite dieses Tile überdeckt"""
+        x0, y0, x1, y1 = self.view_range
+        self.animated_cover = {}
+        self.view_animated = []
+        for index, (x, y, material) in enumerate(self.animated_positions):
+            covered = False
+            for tx, ty in animated_sprite_tiles(x, y, material):
+                if x0 <= tx < x1 and y0 <= ty < y1:
+                    self.animated_cover.setdefault((tx, ty), []).append(index)
+                    covered = True
+            if covered:
+                self.view_animated.append(index)
+
+    def fog_drifting(self, fog_enabled):
+        """Weicher Nebel mit (eingeschalteter) Wolken-Drift ändert sich jeden Frame"""
+        return fog_enabled and self.fog_style == "soft" and self.fog_drift
+
+    def animation_needed(self, fog_enabled):
+        """Ändert sich im Ausschnitt etwas pro Frame? Sonst darf die Animations-Schleife ruhen"""
+        return bool(self.view_animated) or self.fog_drifting(fog_enabled)
+
+    def get_fog_tile(self, tile_size):
+        """Fog-Textur holen (gecacht) - einmal pro Frame, nicht pro Tile"""
+        fog_texture = self.fog_tile_cache.get(tile_size)
+        if fog_texture is None:
+            fog_texture = self.fog_texture_gen.get_fog_texture(tile_size, "normal")
+            self.fog_tile_cache[tile_size] = fog_texture
+        return fog_texture
+
+    def build_fog_overlay(self, tile_size, frame, hidden):
+        """
+        Fog-Ebene des Ausschnitts als EIN RGBA-Bild aus der Nebel-Maske (hidden = Ausschnitt)
+        "soft": Distanzfeld + driftende Wolken (fog_engine), "tiles": gekachelte Fog-Textur
+        """
+        x0, y0, x1, y1 = self.view_range
+
+        if self.fog_style == "soft":
+            self.soft_fog.set_mask(hidden, tile_size, (x0 * tile_size, y0 * tile_size))
+            # Ohne Drift stehen die Wolken - sonst springen sie bei jedem Vollaufbau
+            self.fog_overlay = self.soft_fog.render(frame if self.fog_drift else 0)
+            return
+
+        fog_tile = np.asarray(self.get_fog_tile(tile_size).convert('RGBA'))
+        overlay = np.tile(fog_tile, (y1 - y0, x1 - x0, 1))
+
+        # Maske auf Pixel-Auflösung bringen: ein Bool pro Tile -> tile_size x tile_size Pixel
+        pixel_mask = hidden.repeat(tile_size, axis=0).repeat(tile_size, axis=1)
+        overlay[..., 3] *= pixel_mask
+
+        self.fog_overlay = Image.fromarray(overlay, 'RGBA')
+
+    def apply_fog_overlay(self, target, box):
+        """Legt den Fog-Bereich box der Overlay-Ebene in einem Schritt über target"""
+        overlay = self.fog_overlay
+        if box != (0, 0) + overlay.size:
+            overlay = overlay.crop(box)
+        target.paste(overlay, (0, 0), overlay)
+
+    def compose_fog_frame(self):
+        """Frame = Basis + Fog-Ebene (ein Composite über den ganzen Ausschnitt)"""
+        self.frame_buffer = self.base_buffer.copy()
+        self.apply_fog_overlay(self.frame_buffer, (0, 0) + self.frame_buffer.size)
+
+    def invalidate_frame(self):
+        """Erzwingt beim nächsten Frame einen kompletten Neuaufbau"""
+        self.frame_buffer = None
+        self.fog_snapshot = None
+
+    def needs_full_frame(self, fog_enabled, revealed):
+        """Voller Neuaufbau bei neuem Ausschnitt, Fog-Toggle/-Stil oder neuer Kartengröße"""
+        return (
+            self.frame_buffer is None
+            or self.frame_fog_enabled != fog_enabled
+            or self.frame_fog_style != self.fog_style
+            or self.fog_snapshot is None
+            or self.fog_snapshot.shape != revealed.shape
+        )
+
+    def compose_full_frame(self, tile_size, frame, revealed, hidden, fog_enabled, animate=True):
+        """Baut den Ausschnitt neu auf: Basis (statisch + animiert) und darüber die Fog-Ebene"""
+        x0, y0 = self.view_range[:2]
+        self.base_buffer = self.static_map_cache.copy()
+        self.build_animation_index()
+
+        # NUR SICHTBARE ANIMIERTE TILES neu rendern
+        if animate and self.view_animated:
+            self.ensure_animation_atlas(tile_size)
+            frame_textures = {}
+            with shared_perf_stats.time("animated_paste"):
+                for index in self.view_animated:
+                    x, y, material = self.animated_positions[index]
+                    texture_img = self.animated_tile_texture(x, y, material, tile_size, frame_textures, frame)
+                    if texture_img:
+                        paste_tile_image(self.base_buffer, texture_img, material,
+                                         (x - x0) * tile_size, (y - y0) * tile_size, tile_size)
+
+        # Fog-of-War über alles zeichnen - EIN Composite für den ganzen Ausschnitt
+        if fog_enabled:
+            with shared_perf_stats.time("fog_composite"):
+                self.build_fog_overlay(tile_size, frame, hidden)
+                self.compose_fog_frame()
+        else:
+            self.frame_buffer = self.base_buffer
+
+        self.fog_snapshot = revealed.copy()
+        self.frame_fog_enabled = fog_enabled
+        self.frame_fog_style = self.fog_style
+
+    def compose_next_frame(self, tile_size, frame, revealed, hidden, animate, fog_enabled, drifting):
+        """
+        Inkrementelles Update nach compose_full_frame (Projektor: im Render-Thread)
+        Basis-Ebene per Dirty-Rects, Fog-Ebene nur bei Fog-Änderung bzw. Wolken-Drift neu
+        Gibt die geänderten Bereiche als [(Bild, Box)] zurück - frame_buffer ist danach aktuell
+        """
+        x0, y0, x1, y1 = self.view_range
+
+        # Animation: alle Tiles unter sichtbaren animierten Sprites
+        dirty = set()
+        if animate:
+            dirty.update(self.animated_cover.keys())
+
+        # Fog: nur Tiles, deren Status sich geändert hat
+        fog_changed = []
+        if fog_enabled:
+            fog_changed = np.argwhere(revealed[y0:y1, x0:x1] != self.fog_snapshot[y0:y1, x0:x1])
+            self.fog_snapshot = revealed
+
+            # Harte Kanten: nur die geänderten Tiles neu komponieren
+            if self.fog_style != "soft":
+                for ty, tx in fog_changed:
+                    dirty.add((int(tx) + x0, int(ty) + y0))
+
+        with shared_perf_stats.time("animated_paste"):
+            boxes = self.compose_dirty_tiles(dirty, tile_size, frame, animate) if dirty else []
+
+        if not fog_enabled:
+            # frame_buffer IST die Basis - geänderte Bereiche nur noch anzeigen
+            return [(self.base_buffer.crop(box), box) for box in boxes]
+
+        with shared_perf_stats.time("fog_composite"):
+            if len(fog_changed):
+                self.build_fog_overlay(tile_size, frame, hidden)
+                if self.fog_style == "soft":
+                    # Weicher Nebel ändert sich großflächig: ein Composite für den ganzen Ausschnitt
+                    self.compose_fog_frame()
+                    # Kopie: der nächste Auftrag im Render-Thread ändert frame_buffer, während Tk noch liest
+                    return [(self.frame_buffer.copy(), (0, 0) + self.frame_buffer.size)]
+            elif drifting and self.soft_fog.box:
+                # Nur Wolken weiterschieben - Distanzfeld bleibt, neu nur der Bereich mit Nebel
+                fog_box = self.soft_fog.box
+                self.fog_overlay.paste(self.soft_fog.render(frame, fog_box), fog_box[:2])
+                boxes.append(fog_box)
+
+            updates = []
+            for box in boxes:
+                region = self.base_buffer.crop(box)
+                self.apply_fog_overlay(region, box)
+                self.frame_buffer.paste(region, box[:2])
+                updates.append((region, box))
+            return updates
+
+    def compose_dirty_tiles(self, dirty_tiles, tile_size, frame, animate):
+        """
+        Komponiert geänderte Bereiche der Basis-Ebene neu
+        Dirty-Tiles werden pro Zeile zu zusammenhängenden Streifen gruppiert - gibt deren Boxen zurück
+        """
+        frame_textures = {}
+        boxes = []
+
+        # Zeilenweise zusammenhängende Streifen bilden
+        rows = {}
+        for tx, ty in dirty_tiles:
+            rows.setdefault(ty, []).append(tx)
+
+        for ty, xs in rows.items():
+            xs.sort()
+            run_start = xs[0]
+            previous = xs[0]
+            for tx in xs[1:] + [None]:
+                if tx is not None and tx == previous + 1:
+                    previous = tx
+                    continue
+                boxes.append(self.compose_dirty_run(ty, run_start, previous, tile_size,
+                                                    frame_textures, frame, animate))
+                if tx is not None:
+                    run_start = previous = tx
+
+        return boxes
+
+    def compose_dirty_run(self, ty, x0, x1, tile_size, frame_textures, frame, animate):
+        """Komponiert einen Streifen von Tiles (x0..x1 in Zeile ty) aus statischem Cache neu"""
+        view_x, view_y = self.view_range[:2]
+        box = ((x0 - view_x) * tile_size, (ty - view_y) * tile_size,
+               (x1 + 1 - view_x) * tile_size, (ty + 1 - view_y) * tile_size)
+        region = self.static_map_cache.crop(box)
+
+        # Animierte Sprites, die den Streifen überdecken - in derselben Reihenfolge wie beim Vollaufbau
+        if animate:
+            indices = set()
+            for tx in range(x0, x1 + 1):
+                indices.update(self.animated_cover.get((tx, ty), ()))
+
+            for index in sorted(indices):
+                x, y, material = self.animated_positions[index]
+                texture_img = self.animated_tile_texture(x, y, material, tile_size, frame_textures, frame)
+                if texture_img:
+                    paste_tile_image(region, texture_img, material,
+                                     (x - view_x) * tile_size - box[0],
+                                     (y - view_y) * tile_size - box[1], tile_size)
+
+        self.base_buffer.paste(region, box[:2])
+        return box
+
+    def render(self, fog=None, view_range=None, tile_size=32, frame=0, fog_enabled=True, animate=True):
+        """
+        Rendert einen Frame und gibt ihn als PIL-Bild (RGB) zurück
+        fog: FogOfWar oder None, view_range: Tile-Ausschnitt (x0, y0, x1, y1), Default = ganze Karte
+        Gleicher Ausschnitt wie beim letzten Aufruf -> nur geänderte Bereiche werden neu komponiert
+        """
+        if self.map_data is None:
+            raise ValueError("Keine Karte gesetzt (set_map)")
+
+        view_range = tuple(view_range or (0, 0, self.width, self.height))
+        if fog is not None:
+            revealed = fog.revealed
+            hidden = fog.get_hidden_mask(*view_range)
+        else:
+            fog_enabled = False
+            revealed = np.ones((self.height, self.width), dtype=bool)
+            hidden = None
+
+        if (self.static_map_cache is None or self.static_is_preview
+                or self.view_range != view_range or self.tile_size != tile_size):
+            with shared_perf_stats.time("static_cache"):
+                self.build_static_view(view_range, tile_size)
+            self.invalidate_frame()
+
+        if self.needs_full_frame(fog_enabled, revealed):
+            self.compose_full_frame(tile_size, frame, revealed, hidden, fog_enabled, animate)
+        else:
+            self.compose_next_frame(tile_size, frame, revealed.copy(), hidden, animate and bool(self.view_animated),
+                                    fog_enabled, self.fog_drifting(fog_enabled))
+
+        return self.frame_buffer.copy()
+
+    def render_array(self, *args, **kwargs):
+        """Wie render(), aber als NumPy-Array (H x W x 3, uint8)"""
+        return np.asarray(self.render(*args, **kwargs))
+
+    def close(self):
+        """Hintergrund-Aufbau des Atlas abbrechen"""
+        if self.animation_atlas:
+            self.animation_atlas.cancel()
+            self.animation_atlas = None
+
+
+def render_map_image(map_data, fog=None, view_range=None, tile_size=32, frame=0, fog_enabled=True, renderer=None):
+    """Einmal-Aufruf: Karte (+ Nebel) als PIL-Bild - für Exporte und Skripte"""
+    engine = RenderEngine(renderer)
+    engine.set_map(map_data)
+    return engine.render(fog, view_range, tile_size, frame, fog_enabled)
@@ -0,0 +1,36 @@
+"""
+Test-Script: Headless-Benchmark
+Prüft den Baseline-Vergleich und einen kurzen, gefilterten Lauf ohne Tk
+"""
+from benchmark import compare_results, run_benchmarks
+
+
+def result(**timings):
+    return {"meta": {}, "results": {name: {"median_ms": ms} for name, ms in timings.items()}}
+
+
+def test_compare_results():
+    """Nur deutlich UND spürbar langsamere Messungen gelten als Regression"""
+    baseline = result(fast=0.1, slow=10.0, same=5.0, removed=1.0)
+    current = result(fast=0.4, slow=20.0, same=5.5, added=3.0)
+
+    regressions = compare_results(current, baseline)
+    assert [r[0] for r in regressions] == ["slow"]
+    assert abs(regressions[0][3] - 2.0) < 1e-9
+    print("   ✓ Baseline-Vergleich")
+
+
+def test_quick_run():
+    """Gefilterter Lauf liefert Messwerte und Metadaten"""
+    data = run_benchmarks(quick=True, name_filter="50x50")
+    assert data["results"] and all("50x50" in name for name in data["results"])
+    assert all(entry["median_ms"] >= 0 for entry in data["results"].values())
+    assert data["meta"]["generator_version"]
+    print(f"   ✓ Kurzer Lauf ({len(data['results'])} Messungen)")
+
+
+if __name__ == "__main__":
+    print("=== Test: Benchmark ===")
+    test_compare_results()
+    test_quick_run()
+    print("\n✅ Alle Tests erfolgreich!")
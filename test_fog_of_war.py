@@ -0,0 +1,104 @@
+"""
+Test-Script: Vektorisiertes Fog-of-War
+Prüft Kreis-Schablonen, Batch-Aufdecken, Masken-Abfragen und weichen Nebel
+"""
+import numpy as np
+
+from fog_engine import LOOP_FRAMES, SoftFogLayer, tile_distance_field
+from fog_of_war import FogOfWar
+
+
+def _reveal_loop(width, height, positions, sight_range):
+    """Alte Python-Schleife als Referenz"""
+    revealed = np.zeros((height, width), dtype=bool)
+    for x, y in positions:
+        for dy in range(-sight_range, sight_range + 1):
+            for dx in range(-sight_range, sight_range + 1):
+                if dx * dx + dy * dy <= sight_range * sight_range:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < width and 0 <= ny < height:
+                        revealed[ny, nx] = True
+    return revealed
+
+
+def test_batched_reveal_matches_loop():
+    """Batch-Aufdecken entspricht exakt der alten Kreis-Schleife"""
+    positions = [(0, 0), (39, 29), (20, 15), (5, 28), (-2, 3)]
+
+    for sight_range in (0, 1, 3, 6):
+        fog = FogOfWar(40, 30)
+        fog.reveal_positions(positions, sight_range)
+        assert (fog.revealed == _reveal_loop(40, 30, positions, sight_range)).all()
+
+    fog = FogOfWar(40, 30)
+    fog.reveal_at_position(10, 10)
+    assert (fog.revealed == _reveal_loop(40, 30, [(10, 10)], fog.sight_range)).all()
+    print("   ✓ Batch-Aufdecken identisch zur Schleife")
+
+
+def test_mask_queries():
+    """Aufgedeckte Koordinaten und Nebel-Maske kommen direkt aus dem Array"""
+    fog = FogOfWar(6, 4)
+    fog.reveal_area(1, 1, 2, 2)
+
+    assert fog.get_revealed_tiles() == [(1, 1), (2, 1), (1, 2), (2, 2)]
+    assert fog.is_revealed(2, 2) and not fog.is_revealed(3, 2)
+
+    hidden = fog.get_hidden_mask()
+    assert hidden.shape == (4, 6) and hidden.sum() == 20
+
+    # Bereich über den Rand hinaus: außerhalb gilt als verborgen
+    window = fog.get_hidden_mask(-1, 0, 3, 2)
+    assert window.tolist() == [[True, True, True, True],
+                               [True, True, False, False]]
+    print("   ✓ Masken-Abfragen korrekt")
+
+
+def test_distance_field():
+    """Distanzfeld entspricht der Brute-Force-Distanz zum nächsten aufgedeckten Tile"""
+    fog = FogOfWar(12, 9)
+    fog.reveal_positions([(3, 3), (9, 6)], 1)
+    hidden = fog.get_hidden_mask()
+
+    field = tile_distance_field(hidden, max_distance=3)
+    ys, xs = np.nonzero(~hidden)
+    for y in range(9):
+        for x in range(12):
+            expected = min(3.0, np.hypot(xs - x, ys - y).min())
+            assert abs(field[y, x] - expected) < 1e-5, (x, y, field[y, x], expected)
+    print("   ✓ Distanzfeld korrekt")
+
+
+def test_soft_fog_keeps_hidden_tiles_covered():
+    """Weiche Ränder: Mitte verborgener Tiles voll deckend, aufgedeckte Mitte frei - in jedem Frame"""
+    fog = FogOfWar(10, 8)
+    fog.reveal_area(3, 2, 6, 5)
+    hidden = fog.get_hidden_mask()
+    tile_size = 16
+
+    layer = SoftFogLayer()
+    layer.set_mask(hidden, tile_size)
+    centers = np.arange(10) * tile_size + tile_size // 2, np.arange(8) * tile_size + tile_size // 2
+
+    for frame in (0, 50, 239):
+        alpha = np.asarray(layer.render(frame))[..., 3]
+        center_alpha = alpha[np.ix_(centers[1], centers[0])]
+        assert (center_alpha[hidden] == 255).all()
+        assert (center_alpha[~hidden] == 0).all()
+
+        # Übergang am Rand ist weich (Zwischenwerte vorhanden)
+        assert ((alpha > 0) & (alpha < 255)).any()
+
+    # Loop-Umbruch des Frame-Zählers: Frame 240 == Frame 0, die Wolken springen nicht
+    assert (np.asarray(layer.render(0)) == np.asarray(layer.render(LOOP_FRAMES))).all()
+    assert (np.asarray(layer.render(0)) != np.asarray(layer.render(1))).any()
+    print("   ✓ Weicher Nebel deckt verborgene Tiles ab")
+
+
+if __name__ == "__main__":
+    print("=== Test: Fog-of-War ===")
+    test_batched_reveal_matches_loop()
+    test_mask_queries()
+    test_distance_field()
+    test_soft_fog_keeps_hidden_tiles_covered()
+    print("\n✅ Alle Tests erfolgreich!")
@@ -0,0 +1,81 @@
+"""
+Test-Script: Frame-Pacing des Projektors
+Prüft uhrbasierte Animations-Frames, adaptive Render-Rate und FPS-Messung
+"""
+from frame_pacer import FramePacer, FPS_REPORT_SECONDS, MIN_FPS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_animation_follows_clock():
+    """Animations-Frame hängt nur an der Zeit - langsames Rendern überspringt Frames"""
+    clock = FakeClock()
+    pacer = FramePacer(animation_fps=30, frame_count=240, clock=clock)
+
+    assert pacer.animation_frame() == 0
+    clock.now += 0.5
+    assert pacer.animation_frame() == 15
+    clock.now += 8.0  # 255 Frames später -> Loop läuft weiter
+    assert pacer.animation_frame() == 255 % 240
+    print("   ✓ Animation folgt der Uhr")
+
+
+def test_interval_adapts_to_render_time():
+    """Im Budget bleibt die Ziel-Rate, langsame Frames strecken das Intervall (begrenzt)"""
+    clock = FakeClock()
+    pacer = FramePacer(target_fps=30, clock=clock)
+
+    for _ in range(20):
+        pacer.frame_rendered(0.010)
+    assert abs(pacer.interval - 1 / 30) < 1e-9
+
+    for _ in range(40):
+        pacer.frame_rendered(0.080)
+    assert 0.080 < pacer.interval <= 0.080 * 1.25 + 1e-6
+
+    for _ in range(40):
+        pacer.frame_rendered(5.0)
+    assert pacer.interval == 1.0 / MIN_FPS
+
+    for _ in range(60):
+        pacer.frame_rendered(0.005)
+    assert abs(pacer.interval - 1 / 30) < 1e-9
+    print("   ✓ Render-Rate passt sich an")
+
+
+def test_ticks_and_fps():
+    """Ticks im Intervall-Abstand, nach Verzug kein Nachholen; FPS pro Mess-Fenster"""
+    clock = FakeClock()
+    pacer = FramePacer(target_fps=20, clock=clock)
+
+    assert pacer.next_delay_ms() == 50
+    clock.now += 0.050
+    assert pacer.next_delay_ms() == 50
+
+    # Tk war 300 ms blockiert -> nächster Tick nicht sofort mehrfach hintereinander
+    clock.now += 0.300
+    delays = [pacer.next_delay_ms()]
+    clock.now += delays[0] / 1000
+    delays.append(pacer.next_delay_ms())
+    assert delays[1] >= 49
+
+    pacer.reset_window()
+    for _ in range(FPS_REPORT_SECONDS * 20 + 1):
+        clock.now += 0.05
+        pacer.frame_rendered(0.01)
+    assert abs(pacer.fps - 20) < 0.5
+    print(f"   ✓ Ticks und FPS-Messung ({pacer.fps:.1f} FPS)")
+
+
+if __name__ == "__main__":
+    print("=== Test: Frame-Pacing ===")
+    test_animation_follows_clock()
+    test_interval_adapts_to_render_time()
+    test_ticks_and_fps()
+    print("\n✅ Alle Tests erfolgreich!")
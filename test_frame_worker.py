@@ -0,0 +1,78 @@
+"""
+Test-Script: Render-Thread des Projektors
+Prüft Übergabe der Updates, "neuester Auftrag gewinnt" und wait_idle()
+"""
+import threading
+import time
+
+from frame_worker import FrameWorker
+
+
+def _wait(worker, timeout=5):
+    deadline = time.time() + timeout
+    while worker.busy():
+        assert time.time() < deadline, "Render-Thread hängt"
+        time.sleep(0.001)
+
+
+def test_updates_are_handed_over_in_order():
+    """Fertige Updates werden gesammelt, bis Tk sie abholt - nichts geht verloren"""
+    worker = FrameWorker()
+    try:
+        assert worker.take() is None
+        worker.submit(lambda: [("a", 1)])
+        _wait(worker)
+        worker.submit(lambda: [("b", 2)])
+        _wait(worker)
+
+        assert worker.take() == [("a", 1), ("b", 2)]
+        assert worker.take() is None
+
+        # Fehler im Auftrag beenden den Thread nicht
+        worker.submit(lambda: 1 / 0)
+        _wait(worker)
+        worker.submit(lambda: [("c", 3)])
+        _wait(worker)
+        assert worker.take() == [("c", 3)]
+    finally:
+        worker.stop()
+    print("   ✓ Updates in Reihenfolge übergeben")
+
+
+def test_latest_job_wins_and_wait_idle():
+    """Wartende Aufträge werden durch neuere ersetzt, wait_idle verwirft alles Offene"""
+    worker = FrameWorker()
+    started = threading.Event()
+    release = threading.Event()
+    ran = []
+
+    def slow():
+        started.set()
+        release.wait(5)
+        ran.append("slow")
+        return [("slow", 0)]
+
+    try:
+        worker.submit(slow)
+        assert started.wait(5)
+
+        # Während "slow" läuft: zwei neue Aufträge, nur der letzte wird ausgeführt
+        worker.submit(lambda: ran.append("old") or [("old", 1)])
+        worker.submit(lambda: ran.append("new") or [("new", 2)])
+        release.set()
+        _wait(worker)
+        assert ran == ["slow", "new"]
+
+        worker.submit(lambda: [("stale", 3)])
+        worker.wait_idle()
+        assert worker.take() is None and not worker.busy()
+    finally:
+        worker.stop()
+    print("   ✓ Neuester Auftrag gewinnt, wait_idle verwirft Offenes")
+
+
+if __name__ == "__main__":
+    print("=== Test: Render-Thread ===")
+    test_updates_are_handed_over_in_order()
+    test_latest_job_wins_and_wait_idle()
+    print("\n✅ Alle Tests erfolgreich!")
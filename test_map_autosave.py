@@ -0,0 +1,122 @@
+"""
+Test-Script: Autosave mit Journal
+Prüft Journal + Snapshot-Kompaktierung, Wiederherstellung nach Absturz (auch halbe Zeile) und atomares Schreiben
+"""
+import os
+import shutil
+import tempfile
+
+from map_autosave import MapAutosave
+from map_format import atomic_write, read_binary_map, write_binary_map
+
+
+def sample_map(width=12, height=8):
+    return {"width": width, "height": height, "tiles": [["grass"] * width for _ in range(height)],
+            "river_directions": {}}
+
+
+def crash(autosave):
+    """Absturz simulieren: Thread stoppen, aber nichts aufräumen"""
+    autosave.close(discard=False)
+
+
+def test_journal_and_recovery():
+    """Änderungen nach dem Snapshot kommen aus dem Journal, Kompaktierung leert es"""
+    folder = tempfile.mkdtemp()
+    try:
+        map_data = sample_map()
+        autosave = MapAutosave(folder, flush_interval=0.01)
+        autosave.snapshot(map_data)
+        for x in range(5):
+            map_data["tiles"][2][x] = "water"
+            map_data["river_directions"][f"{x},2"] = "right"
+            autosave.record(x, 2, "water", "right")
+        assert autosave.flush(5)
+        assert os.path.getsize(autosave.journal_path) > 0
+
+        # Snapshot kopiert: spätere Änderungen im Editor verändern ihn nicht
+        autosave.compact(map_data)
+        map_data["tiles"][0][0] = "mountain"
+        autosave.record(0, 0, "mountain")
+        autosave.compact(map_data)
+        autosave.compact(map_data)  # nichts geändert: kein neuer Snapshot
+        assert autosave.pending_edits == 0 and autosave.flush(5)
+        assert os.path.getsize(autosave.journal_path) == 0
+
+        map_data["tiles"][7][11] = "forest"
+        autosave.record(11, 7, "forest")
+        map_data["river_directions"].pop("4,2")
+        autosave.record(4, 2, "water", None)
+        crash(autosave)
+
+        restarted = MapAutosave(folder)
+        assert restarted.has_recovery()
+        recovered = restarted.recover()
+        assert recovered["tiles"] == map_data["tiles"]
+        assert recovered["river_directions"] == map_data["river_directions"]
+
+        # Sauber beendet: nichts mehr wiederherzustellen
+        restarted.close(discard=True)
+        assert not MapAutosave(folder).has_recovery()
+    finally:
+        shutil.rmtree(folder)
+    print("   ✓ Journal, Kompaktierung und Wiederherstellung")
+
+
+def test_torn_journal_and_background_save():
+    """Halb geschriebene letzte Zeile wird ignoriert, Speichern läuft im Schreib-Thread"""
+    folder = tempfile.mkdtemp()
+    try:
+        map_data = sample_map()
+        autosave = MapAutosave(folder, flush_interval=0.01)
+        autosave.snapshot(map_data)
+        autosave.record(1, 1, "snow")
+        crash(autosave)
+        with open(autosave.journal_path, 'a', encoding='utf-8') as f:
+            f.write('[2,1,"sn')
+
+        recovered = MapAutosave(folder).recover()
+        assert recovered["tiles"][1][1] == "snow" and recovered["tiles"][1][2] == "grass"
+
+        autosave = MapAutosave(folder, flush_interval=0.01)
+        target = os.path.join(folder, "gespeichert.ringmap")
+
+        future = autosave.save_as(recovered, lambda data: write_binary_map(data, target))
+        assert future.result(5) == target
+        assert read_binary_map(target)["tiles"] == recovered["tiles"]
+
+        failed = autosave.save_as(recovered, lambda data: 1 / 0)
+        assert isinstance(failed.exception(5), ZeroDivisionError)
+        autosave.close()
+    finally:
+        shutil.rmtree(folder)
+    print("   ✓ Halbe Journal-Zeile und Speichern im Hintergrund")
+
+
+def test_atomic_write_keeps_old_file():
+    """Fehler beim Schreiben: alte Datei unverändert, keine Temp-Datei übrig"""
+    folder = tempfile.mkdtemp()
+    try:
+        path = os.path.join(folder, "karte.json")
+        with atomic_write(path, 'w', encoding='utf-8') as f:
+            f.write("alt")
+        try:
+            with atomic_write(path, 'w', encoding='utf-8') as f:
+                f.write("halb")
+                raise RuntimeError("Absturz")
+        except RuntimeError:
+            pass
+        with open(path, encoding='utf-8') as f:
+            assert f.read() == "alt"
+        assert os.listdir(folder) == ["karte.json"]
+    finally:
+        shutil.rmtree(folder)
+    print("   ✓ Atomares Schreiben")
+
+
+if __name__ == "__main__":
+    print("=== Test: Autosave ===")
+    test_journal_and_recovery()
+    test_torn_journal_and_background_save()
+    test_atomic_write_keeps_old_file()
+    print("\n✅ Alle Tests erfolgreich!")
@@ -0,0 +1,98 @@
+"""
+Test-Script: Karten-Katalog
+Prüft, dass list_maps nur geänderte Dateien liest, Suche/Sortierung, Histogramm und Vorschaubilder
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from PIL import Image
+
+from map_catalog import CATALOG_FILE, THUMBNAIL_SIZE, MapCatalog
+from map_system import MapSystem
+
+
+def make_map(width, height, material="grass", river=0):
+    tiles = [[material] * width for _ in range(height)]
+    for x in range(river):
+        tiles[0][x] = "river"
+    return {"width": width, "height": height, "tiles": tiles}
+
+
+def count_reads(catalog):
+    """Zählt index_file-Aufrufe (= tatsächlich gelesene Karten)"""
+    reads = []
+    original = catalog.index_file
+    catalog.index_file = lambda filename, stat: reads.append(filename) or original(filename, stat)
+    return reads
+
+
+def test_revalidation_by_mtime_and_size():
+    """Gespeicherte Karten stehen sofort im Katalog, nur extern geänderte Dateien werden neu gelesen"""
+    folder = tempfile.mkdtemp()
+    try:
+        system = MapSystem(folder)
+        system.save_map(make_map(40, 20), "wiese")
+        system.save_map(make_map(10, 10, "water", river=4), "see.json")
+
+        reads = count_reads(system.catalog)
+        assert [name for name, _, _ in system.list_maps()] == ["see.json", "wiese.ringmap"]
+        assert reads == []
+
+        # Von außen kopierte und geänderte Dateien
+        shutil.copy(os.path.join(folder, "see.json"), os.path.join(folder, "kopie.json"))
+        time.sleep(0.01)
+        with open(os.path.join(folder, "see.json"), 'w', encoding='utf-8') as f:
+            json.dump(dict(make_map(12, 12, "forest"), created="2020-01-01"), f)
+        maps = {name: size for name, _, size in system.list_maps()}
+        assert sorted(reads) == ["kopie.json", "see.json"] and maps["see.json"] == "12x12"
+
+        # Neuer Prozess: Katalog von Disk, nichts wird gelesen
+        fresh = MapSystem(folder)
+        reads = count_reads(fresh.catalog)
+        fresh.list_maps()
+        assert reads == []
+
+        # Löschen entfernt Eintrag + Vorschaubild, defekter Katalog wird neu aufgebaut
+        thumb = fresh.catalog.thumbnail_path("wiese.ringmap")
+        assert fresh.delete_map("wiese.ringmap") and not os.path.exists(thumb)
+        with open(os.path.join(folder, CATALOG_FILE), 'w') as f:
+            f.write("{kaputt")
+        assert len(MapSystem(folder).list_maps()) == 2
+    finally:
+        shutil.rmtree(folder)
+    print("   ✓ Revalidierung über mtime + Größe")
+
+
+def test_search_histogram_thumbnail():
+    """Suche nach Name/Material, Sortierung, Histogramm und Vorschaubild"""
+    folder = tempfile.mkdtemp()
+    try:
+        colors = {"grass": (0, 255, 0), "river": (0, 0, 255)}
+        system = MapSystem(folder)
+        system.catalog = MapCatalog(folder, colors=colors)
+        system.save_map(make_map(200, 100, river=50), "gross_fluss")
+        system.save_map(make_map(8, 8), "klein")
+
+        entries = system.search_maps(sort_by="size")
+        assert [entry["filename"] for entry in entries] == ["gross_fluss.ringmap", "klein.ringmap"]
+        assert [entry["filename"] for entry in system.search_maps("KLEIN")] == ["klein.ringmap"]
+        assert [entry["filename"] for entry in system.search_maps(material="river")] == ["gross_fluss.ringmap"]
+        assert entries[0]["histogram"] == {"grass": 200 * 100 - 50, "river": 50}
+
+        big = Image.open(system.catalog.thumbnail_path("gross_fluss.ringmap"))
+        small = Image.open(system.catalog.thumbnail_path("klein.ringmap"))
+        assert big.size == (THUMBNAIL_SIZE, THUMBNAIL_SIZE // 2) and small.size == (THUMBNAIL_SIZE,) * 2
+        assert small.getpixel((0, 0)) == (0, 255, 0)
+    finally:
+        shutil.rmtree(folder)
+    print("   ✓ Suche, Histogramm und Vorschaubild")
+
+
+if __name__ == "__main__":
+    print("=== Test: Karten-Katalog ===")
+    test_revalidation_by_mtime_and_size()
+    test_search_histogram_thumbnail()
+    print("\n✅ Alle Tests erfolgreich!")
@@ -0,0 +1,73 @@
+"""
+Test-Script: Chunk-Cache der statischen Kartenebene
+Prüft Chunk-Aufteilung und dass Änderungen nur betroffene Chunks invalidieren
+"""
+from PIL import Image
+
+from map_chunk_cache import MapChunkCache
+from tile_grid import TileGrid
+
+
+def _fill(cache, tile_sizes, chunks):
+    for tile_size in tile_sizes:
+        for cx, cy in chunks:
+            cache.put(tile_size, cx, cy, Image.new('RGB', (8, 8)))
+
+
+def test_chunks_for_range():
+    """Tile-Bereiche werden auf die überdeckten Chunks abgebildet"""
+    cache = MapChunkCache(chunk_size=16)
+    assert cache.chunks_for_range((0, 0, 16, 16)) == [(0, 0)]
+    assert cache.chunks_for_range((15, 0, 17, 1)) == [(0, 0), (1, 0)]
+    assert cache.chunks_for_range((5, 5, 5, 9)) == []
+    assert cache.chunk_range(1, 1, 20, 40) == (16, 16, 20, 32)
+    print("   ✓ Chunk-Aufteilung korrekt")
+
+
+def test_sync_invalidates_only_changed_chunks():
+    """Tile-Änderung invalidiert nur ihren Chunk - in allen Zoom-Stufen"""
+    cache = MapChunkCache(chunk_size=16)
+    grid = TileGrid.from_map_data({"width": 48, "height": 48, "tiles": [["grass"] * 48 for _ in range(48)],
+                                   "river_directions": {}})
+    cache.sync(grid)
+
+    all_chunks = [(cx, cy) for cy in range(3) for cx in range(3)]
+    _fill(cache, (16, 32), all_chunks)
+
+    # Editor ändert in-place - Snapshot muss die Änderung trotzdem erkennen
+    grid.set(20, 20, "water")
+    assert cache.sync(grid) == 2
+    assert cache.get(16, 1, 1) is None and cache.get(32, 1, 1) is None
+    assert cache.get(16, 0, 0) is not None
+
+    # Village am Chunk-Rand: Rauch ragt in die Nachbar-Chunks
+    grid.set(15, 32, "village")
+    cache.sync(grid)
+    for chunk in ((0, 2), (1, 2), (0, 1), (1, 1)):
+        assert cache.get(16, *chunk) is None
+
+    # Neue Fluss-Richtung zählt auch als Änderung
+    grid.set_direction(40, 40, "up")
+    assert cache.sync(grid) == 2
+    assert cache.get(16, 2, 2) is None
+
+    # Neu geladene Karte (anderes Raster, andere Palette) gleicher Größe: nur Unterschiede
+    _fill(cache, (16,), all_chunks)
+    reloaded = TileGrid.from_map_data({"width": 48, "height": 48, "tiles": [list(row) for row in grid.tiles],
+                                       "river_directions": dict(grid.river_directions)})
+    reloaded.set(47, 0, "snow")
+    assert reloaded.palette != grid.palette and cache.sync(reloaded) == 2  # Chunk (2, 0) in beiden Zoom-Stufen
+    assert cache.get(16, 1, 1) is not None
+    assert cache.sync(reloaded) == 0
+
+    # Andere Kartengröße: alles weg
+    cache.sync(TileGrid.from_map_data({"width": 10, "height": 1, "tiles": [["grass"] * 10]}))
+    assert len(cache.cache) == 0
+    print("   ✓ Nur geänderte Chunks invalidiert")
+
+
+if __name__ == "__main__":
+    print("=== Test: Chunk-Cache ===")
+    test_chunks_for_range()
+    test_sync_invalidates_only_changed_chunks()
+    print("\n✅ Alle Tests erfolgreich!")
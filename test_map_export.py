@@ -0,0 +1,98 @@
+"""
+Test-Script: Offline-Export
+Prüft gestreamtes PNG, Kachel-Ordner und Animations-Export mit Worker-Prozessen
+"""
+import json
+import os
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+from fog_of_war import FogOfWar
+import map_export
+from map_export import export_animation, export_map_png, export_map_tiles, iter_animation_frames
+from render_engine import RenderEngine
+
+
+def sample_map(width=21, height=37):
+    materials = ["grass", "water", "forest", "village", "mountain", "sand"]
+    tiles = [[materials[(x * 7 + y * 3) % len(materials)] for x in range(width)] for y in range(height)]
+    return {"width": width, "height": height, "tiles": tiles, "river_directions": {"1,0": "down"}}
+
+
+def sample_fog(map_data):
+    fog = FogOfWar(map_data["width"], map_data["height"])
+    fog.reveal_positions([(5, 5), (10, 20), (15, 30), (3, 16)], 4)
+    return fog
+
+
+def test_streamed_png_matches_full_render():
+    """Streifenweise gestreamtes PNG == ein Render der ganzen Karte (auch mit weichem Nebel)"""
+    map_data = sample_map()
+    fog = sample_fog(map_data)
+    engine = RenderEngine()
+    engine.set_map(map_data)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for player_fog in (None, fog):
+            path = os.path.join(folder, "karte.png")
+            export_map_png(map_data, path, 16, player_fog, progress=None)
+            exported = np.asarray(Image.open(path))
+            assert (exported == engine.render_array(player_fog, None, 16, animate=False)).all()
+    print("   ✓ Gestreamtes PNG nahtlos")
+
+
+def test_tile_folder():
+    """Kacheln decken die Karte ab, Index beschreibt sie"""
+    map_data = sample_map()
+    with tempfile.TemporaryDirectory() as folder:
+        export_map_tiles(map_data, folder, 8, progress=None)
+        with open(os.path.join(folder, "index.json"), encoding='utf-8') as f:
+            index = json.load(f)
+        assert len(index["tiles"]) == 2 * 3 and index["image_size"] == [21 * 8, 37 * 8]
+
+        last = index["tiles"][-1]
+        x0, y0, x1, y1 = last["range"]
+        assert Image.open(os.path.join(folder, last["file"])).size == ((x1 - x0) * 8, (y1 - y0) * 8)
+    print("   ✓ Kachel-Ordner mit Index")
+
+
+def test_animation_frames_parallel():
+    """Frames aus dem Prozess-Pool in richtiger Reihenfolge, identisch zum Einzelprozess"""
+    map_data = sample_map()
+    fog = sample_fog(map_data)
+    view = (0, 0, 10, 10)
+
+    serial = [np.asarray(image) for image in
+              iter_animation_frames(map_data, fog, view, 8, 12, workers=1, progress=None)]
+    parallel = [np.asarray(image) for image in
+                iter_animation_frames(map_data, fog, view, 8, 12, workers=2, progress=None)]
+    assert len(serial) == 12 and all((a == b).all() for a, b in zip(serial, parallel))
+    assert not (serial[0] == serial[5]).all()  # Wolken-Drift/Animation bewegt sich
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "loop.gif")
+        export_animation(map_data, path, fog, view, 8, 6, workers=1, progress=None)
+        assert Image.open(path).n_frames == 6
+
+        # WebP/GIF halten alle Frames - zu große Loops werden vor dem Rendern abgelehnt
+        old_limit = map_export.PILLOW_ANIMATION_BYTES
+        map_export.PILLOW_ANIMATION_BYTES = 80 * 80 * 3 * 5
+        try:
+            path = os.path.join(folder, "loop.webp")
+            export_animation(map_data, path, fog, view, 8, 6, workers=1, progress=None)
+            assert False, "zu großer WebP-Loop muss abgelehnt werden"
+        except ValueError:
+            assert not os.path.exists(path)
+        finally:
+            map_export.PILLOW_ANIMATION_BYTES = old_limit
+    print("   ✓ Animations-Export parallel")
+
+
+if __name__ == "__main__":
+    print("=== Test: Karten-Export ===")
+    test_streamed_png_matches_full_render()
+    test_tile_folder()
+    test_animation_frames_parallel()
+    print("\n✅ Alle Tests erfolgreich!")
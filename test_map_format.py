@@ -0,0 +1,152 @@
+"""
+Test-Script: Binäres Karten-Format (.ringmap)
+Prüft Rundreise gegen JSON, mmap-Laden ohne Kopie (auch große Karten), große Paletten
+und die Konvertierung alter JSON-Karten
+"""
+import json
+import os
+import random
+import shutil
+import tempfile
+
+import numpy as np
+
+import map_format
+from map_format import (BINARY_EXTENSION, GRID_KEY, MapFormatError, is_binary_map, load_map_arrays, read_binary_map,
+                        read_header, write_binary_map)
+from map_system import MapSystem
+
+
+def sample_map(width=40, height=30, seed=3):
+    rng = random.Random(seed)
+    tiles = [[rng.choice(["grass", "water", "forest", "river", "mountain"]) for _ in range(width)]
+             for _ in range(height)]
+    river_directions = {f"{x},{y}": rng.choice(["up", "down", "left", "right", "up_right"])
+                        for y in range(height) for x in range(width) if tiles[y][x] == "river"}
+    return {"width": width, "height": height, "tiles": tiles, "river_directions": river_directions}
+
+
+def test_roundtrip_and_lazy_header():
+    """Binär gespeicherte Karte lädt identisch, Header allein reicht für die Kartenliste"""
+    folder = tempfile.mkdtemp()
+    try:
+        system = MapSystem(folder)
+        map_data = sample_map(41, 30)  # ungerade Breite -> Halb-Byte am Zeilenende
+        map_data["river_directions"]["999,0"] = "up"  # außerhalb der Karte - bleibt trotzdem erhalten
+
+        path = system.save_map(map_data, "karte")
+        assert path.endswith(BINARY_EXTENSION) and is_binary_map(path)
+        loaded = system.load_map("karte" + BINARY_EXTENSION)
+        assert loaded["tiles"] == map_data["tiles"]
+        assert loaded["river_directions"] == map_data["river_directions"]
+
+        json_path = system.save_map(map_data, "karte.json")
+        assert os.path.getsize(path) * 5 < os.path.getsize(json_path)
+
+        header = read_header(path)
+        assert header["width"] == 41 and header["sections"]["directions"]["shape"] == [30, 21]
+        names = {name for name, _, size in system.list_maps()}
+        assert names == {"karte" + BINARY_EXTENSION, "karte.json"}
+    finally:
+        shutil.rmtree(folder)
+    print("   ✓ Rundreise und Header-Liste")
+
+
+def test_mmap_and_large_palette():
+    """Unkomprimiert: Arrays als memmap - mehr als 256 Materialien: uint16"""
+    folder = tempfile.mkdtemp()
+    try:
+        map_data = sample_map(64, 64)
+        path = write_binary_map(map_data, os.path.join(folder, "roh.ringmap"), compress=False)
+        header, indices, directions = load_map_arrays(path, mmap=True)
+        assert isinstance(indices, np.memmap) and indices.dtype == np.uint8
+        assert header["palette"][indices[5, 7]] == map_data["tiles"][5][7]
+        del indices, directions
+
+        # Große Karte: Tiles auch mit compress=True roh - read_binary_map lädt sie per mmap ins Raster
+        old_limit = map_format.RAW_TILES_BYTES
+        map_format.RAW_TILES_BYTES = 64 * 64
+        try:
+            path = write_binary_map(map_data, os.path.join(folder, "gross.ringmap"))
+        finally:
+            map_format.RAW_TILES_BYTES = old_limit
+        sections = read_header(path)["sections"]
+        assert sections["tiles"]["codec"] == "raw" and sections["directions"]["codec"] == "zlib"
+        loaded = read_binary_map(path)
+        grid = loaded[GRID_KEY]
+        assert loaded["tiles"] == map_data["tiles"] and loaded["river_directions"] == map_data["river_directions"]
+        assert not isinstance(grid.materials, np.memmap) and grid.materials.flags.writeable
+
+        many = {"width": 30, "height": 30, "tiles": [[f"material_{y * 30 + x}" for x in range(30)] for y in range(30)]}
+        path = write_binary_map(many, os.path.join(folder, "viele.ringmap"))
+        _, indices, _ = load_map_arrays(path, mmap=False)
+        assert indices.dtype == np.uint16
+        assert read_binary_map(path)["tiles"] == many["tiles"]
+
+        # Unbekannte (neuere) Version wird abgelehnt
+        with open(path, 'r+b') as f:
+            f.seek(8)
+            f.write(b"\xff\x00")
+        try:
+            read_header(path)
+            assert False, "neuere Version muss abgelehnt werden"
+        except MapFormatError:
+            pass
+    finally:
+        shutil.rmtree(folder)
+    print("   ✓ mmap ohne Kopie und uint16-Palette")
+
+
+def test_upgrade_json_maps():
+    """Alte JSON-Karten (auch ohne river_directions) werden konvertiert und danach binär geladen"""
+    folder = tempfile.mkdtemp()
+    try:
+        system = MapSystem(folder)
+        old = sample_map(20, 10)
+        old.pop("river_directions")
+        with open(os.path.join(folder, "alt.json"), 'w', encoding='utf-8') as f:
+            json.dump(dict(old, version="1.0", created="2024-01-01T00:00:00"), f)
+        system.save_map(sample_map(), "neu.json")
+
+        # Standard: JSON bleibt erhalten
+        assert len(system.upgrade_all_maps()) == 2
+        assert os.path.exists(os.path.join(folder, "alt.json")) and os.path.exists(os.path.join(folder, "neu.json"))
+        # ... aber geprüfte .ringmap-Zwillinge verdecken sie in der Liste - bis die JSON-Datei sich ändert
+        assert sorted(name for name, _, _ in system.list_maps()) == ["alt" + BINARY_EXTENSION, "neu" + BINARY_EXTENSION]
+        stat = os.stat(os.path.join(folder, "alt.json"))
+        os.utime(os.path.join(folder, "alt.json"), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert "alt.json" in {entry["filename"] for entry in system.search_maps()}
+
+        # Vorhandene .ringmap mit anderem Inhalt wird NICHT überschrieben
+        system.save_map(sample_map(seed=5), "anders.json")
+        system.save_map(sample_map(seed=6), "anders" + BINARY_EXTENSION)
+        assert system.upgrade_map("anders.json") is None
+        assert system.load_map("anders" + BINARY_EXTENSION)["tiles"] == sample_map(seed=6)["tiles"]
+
+        upgraded = system.upgrade_all_maps(delete_json=True)
+        assert len(upgraded) == 2
+        assert sorted(name for name, _, _ in system.list_maps()) == \
+            ["alt" + BINARY_EXTENSION, "anders.json", "anders" + BINARY_EXTENSION, "neu" + BINARY_EXTENSION]
+
+        loaded = system.load_map("alt" + BINARY_EXTENSION)
+        assert loaded["tiles"] == old["tiles"] and loaded["river_directions"] == {}
+        assert loaded["created"] == "2024-01-01T00:00:00"
+
+        # Richtungen außerhalb der Karte / mit Leerzeichen im Schlüssel: Konvertierung trotzdem gültig
+        odd = sample_map(6, 4)
+        odd["river_directions"] = {"1, 1": "left", "9,9": "down", "kaputt": "up", "2,3": "right"}
+        system.save_map(odd, "schief.json")
+        assert system.upgrade_map("schief.json") is not None
+        loaded = system.load_map("schief" + BINARY_EXTENSION)
+        assert loaded["river_directions"]["1,1"] == "left" and loaded["river_directions"]["2,3"] == "right"
+    finally:
+        shutil.rmtree(folder)
+    print("   ✓ JSON-Karten konvertiert")
+
+
+if __name__ == "__main__":
+    print("=== Test: Binäres Karten-Format ===")
+    test_roundtrip_and_lazy_header()
+    test_mmap_and_large_palette()
+    test_upgrade_json_maps()
+    print("\n✅ Alle Tests erfolgreich!")
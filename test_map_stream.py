@@ -0,0 +1,172 @@
+"""
+Test-Script: Streaming-Laden großer Karten
+Prüft blockweises Lesen (JSON + .ringmap) gegen load_map und das Rendern einer noch ladenden Karte
+"""
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+
+import numpy as np
+
+from advanced_texture_renderer import AdvancedTextureRenderer
+from map_format import GRID_KEY, MapFormatError, decode_directions, iter_tile_blocks, read_header
+from map_stream import JsonStreamScanner, MapStreamReader, ProgressiveMapLoader
+from map_system import MapSystem
+from render_engine import BACKGROUND, RenderEngine
+from tile_grid import TileGrid
+
+
+def sample_map(width=23, height=45, seed=5):
+    rng = random.Random(seed)
+    tiles = [[rng.choice(["grass", "water", "forest", "mountain", "village"]) for _ in range(width)]
+             for _ in range(height)]
+    river_directions = {f"{x},{y}": "down" for y in range(height) for x in range(width) if tiles[y][x] == "water"}
+    return {"width": width, "height": height, "tiles": tiles, "river_directions": river_directions}
+
+
+def without_grid(map_data):
+    return {key: value for key, value in map_data.items() if key != GRID_KEY}
+
+
+def assert_same_grid(grid, expected):
+    """Gleiche Karte - Paletten dürfen sich unterscheiden"""
+    assert (np.array(grid.palette, dtype=object)[grid.materials] ==
+            np.array(expected.palette, dtype=object)[expected.materials]).all()
+    assert decode_directions(grid.direction_palette, grid.directions) == \
+        decode_directions(expected.direction_palette, expected.directions)
+
+
+def test_scanner_small_buffers():
+    """Werte, die über Puffergrenzen gehen (auch Zahlen), werden vollständig gelesen"""
+    text = '{"width": 12345, "tiles": [["grass", "water"], ["sand", "snow"]], "river_directions": {"1,1": "up"}}'
+    scanner = JsonStreamScanner(io.StringIO(text), read_chars=3)
+    scanner.expect("{")
+    assert scanner.value() == "width"
+    scanner.expect(":")
+    assert scanner.value() == 12345
+    scanner.expect(",")
+    assert scanner.value() == "tiles"
+    scanner.expect(":")
+    assert scanner.value() == [["grass", "water"], ["sand", "snow"]]
+    print("   ✓ Inkrementeller JSON-Leser")
+
+
+def test_stream_matches_load_map():
+    """Blöcke aus JSON und .ringmap ergeben dieselbe Karte wie load_map"""
+    folder = tempfile.mkdtemp()
+    try:
+        system = MapSystem(folder)
+        map_data = sample_map()
+        for name in ("karte.json", "karte.ringmap"):
+            path = system.save_map(map_data, name)
+            reader = MapStreamReader(path, chunk_rows=8).open()
+            assert (reader.width, reader.height) == (23, 45)
+
+            starts = []
+            tiles = []
+            for y0, rows in reader.chunks():
+                starts.append(y0)
+                tiles.extend(rows)
+            assert starts == [0, 8, 16, 24, 32, 40]
+            assert tiles == map_data["tiles"] and reader.river_directions == map_data["river_directions"]
+
+            loader = ProgressiveMapLoader(path)
+            streamed = loader.wait(10)
+            assert without_grid(streamed) == without_grid(system.load_map(name)) and loader.poll() == (45, True)
+
+            # Raster füllt der Lade-Thread - gleich wie aus den Listen kodiert, TileGrid.of() nimmt es direkt
+            grid = streamed[GRID_KEY]
+            assert TileGrid.of(streamed) is grid and grid.encoded_rows == 45
+            assert_same_grid(grid, TileGrid.from_map_data(without_grid(streamed)))
+
+        # Größe erst hinter den Tiles: wird gepuffert, Ergebnis gleich
+        path = os.path.join(folder, "umgekehrt.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"tiles": map_data["tiles"], "height": 45, "width": 23}, f)
+        assert MapStreamReader(path).read_all()["tiles"] == map_data["tiles"]
+    finally:
+        shutil.rmtree(folder)
+    print("   ✓ Stream == load_map (JSON und .ringmap)")
+
+
+def test_truncated_file():
+    """Abgeschnittene Datei: error gesetzt, Karte NIE fertig, loaded_rows bleibt beim letzten ganzen Block"""
+    folder = tempfile.mkdtemp()
+    try:
+        system = MapSystem(folder)
+        map_data = sample_map(60, 200)
+        for name in ("karte.json", "karte.ringmap"):
+            path = system.save_map(map_data, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            with open(path, 'wb') as f:
+                f.write(data[:len(data) * 2 // 3])
+
+        loader = system.load_map_progressive("karte.json")
+        assert loader.finished.wait(10)
+        loaded_rows, done = loader.poll()
+        assert isinstance(loader.error, ValueError) and not done and 0 < loaded_rows < 200
+        assert all(loader.map_data["tiles"][y] == map_data["tiles"][y] for y in range(loaded_rows))
+        try:
+            loader.wait(10)
+            assert False, "wait() muss den Lesefehler werfen"
+        except ValueError:
+            pass
+
+        # .ringmap: Fehler schon beim Öffnen bzw. beim Lesen der Blöcke (nicht still zu wenige Zeilen)
+        assert system.load_map_progressive("karte.ringmap") is None
+        assert system.load_map("karte.ringmap") is None
+        path = system.save_map(map_data, "raw.ringmap")
+        header = read_header(path)
+        with open(path, 'r+b') as f:
+            f.truncate(header["data_start"] + header["sections"]["tiles"]["size"] // 2)
+        try:
+            list(iter_tile_blocks(path, header, 16))
+            assert False, "Abgeschnittene Tiles müssen auffallen"
+        except MapFormatError:
+            pass
+    finally:
+        shutil.rmtree(folder)
+    print("   ✓ Abgeschnittene Datei")
+
+
+def test_render_while_loading():
+    """Noch fehlende Zeilen bleiben schwarz, nach dem Nachladen == vollständig geladene Karte"""
+    renderer = AdvancedTextureRenderer()
+    renderer.disk_cache.enabled = False
+    map_data = sample_map(20, 40)
+    view, tile_size = (0, 0, 20, 40), 16
+
+    partial = dict(map_data, tiles=[list(row) for row in map_data["tiles"][:16]] + [[] for _ in range(24)])
+    engine = RenderEngine(renderer)
+    engine.set_map(partial, loaded_rows=16)
+    image = engine.render_array(None, view, tile_size, animate=False)
+    assert (image[20 * tile_size:] == BACKGROUND).all()
+
+    # Zeilen außerhalb des Ausschnitts: kein Neuaufbau nötig
+    engine.render_array(None, (0, 0, 20, 8), tile_size, animate=False)
+    partial["tiles"][16:20] = [list(row) for row in map_data["tiles"][16:20]]
+    assert not engine.rows_loaded(20) and engine.loaded_rows == 20
+
+    partial["tiles"][20:] = [list(row) for row in map_data["tiles"][20:]]
+    engine.render_array(None, view, tile_size, animate=False)
+    assert engine.rows_loaded(40) and engine.loaded_rows is None
+    streamed = engine.render_array(None, view, tile_size, animate=False)
+
+    fresh = RenderEngine(renderer)
+    fresh.set_map(map_data)
+    assert np.array_equal(streamed, fresh.render_array(None, view, tile_size, animate=False))
+    assert sorted(engine.animated_positions) == sorted(fresh.animated_positions)
+    print("   ✓ Rendern während des Ladens")
+
+
+if __name__ == "__main__":
+    print("=== Test: Streaming-Laden ===")
+    test_scanner_small_buffers()
+    test_stream_matches_load_map()
+    test_truncated_file()
+    test_render_while_loading()
+    print("\n✅ Alle Tests erfolgreich!")
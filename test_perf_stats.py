@@ -0,0 +1,61 @@
+"""
+Test-Script: Laufzeit-Messung der Render-Stufen
+Prüft rollierendes Fenster, p50/p95 und die Berichtszeilen für Overlay/GM-Panel
+"""
+import threading
+
+from perf_stats import PerfStats, percentile
+
+
+def test_rolling_percentiles():
+    """p50/p95 über die letzten N Messwerte, ältere fallen heraus"""
+    stats = PerfStats(window=100)
+    for ms in range(1, 101):
+        stats.record("fog_composite", ms / 1000)
+
+    entry = stats.summary()["fog_composite"]
+    assert round(entry["p50"]) in (50, 51) and round(entry["p95"]) in (95, 96)
+    assert entry["count"] == 100 and round(entry["last"]) == 100
+
+    # 100 neue, schnelle Werte verdrängen die alten komplett
+    for _ in range(100):
+        stats.record("fog_composite", 0.002)
+    entry = stats.summary()["fog_composite"]
+    assert round(entry["p95"]) == 2 and entry["count"] == 200
+
+    assert percentile([], 0.5) == 0.0
+    print("   ✓ Rollierende p50/p95")
+
+
+def test_timer_threads_and_report():
+    """Messung aus mehreren Threads, Berichtszeilen enthalten Stufen und Cache-Zähler"""
+    stats = PerfStats()
+
+    def work():
+        for _ in range(200):
+            with stats.time("animated_paste"):
+                pass
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stats.summary()["animated_paste"]["count"] == 800
+
+    stats.record("custom_stage", 0.001)
+    lines = stats.report_lines({"hits": 9, "misses": 1, "hit_rate": 0.9}, fps=29.5)
+    text = "\n".join(lines)
+    assert "FPS" in lines[0] and "Animierte Tiles" in text and "custom_stage" in text
+    assert "9 Treffer / 1 Fehlschläge (90%)" in text
+
+    stats.reset()
+    assert stats.summary() == {}
+    print("   ✓ Thread-sichere Messung und Bericht")
+
+
+if __name__ == "__main__":
+    print("=== Test: Performance-Messung ===")
+    test_rolling_percentiles()
+    test_timer_threads_and_report()
+    print("\n✅ Alle Tests erfolgreich!")
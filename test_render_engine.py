@@ -0,0 +1,126 @@
+"""
+Test-Script: Headless Render-Engine
+Prüft Ausschnitt-Rendering ohne Tk und dass inkrementelle Frames einem Vollaufbau entsprechen
+"""
+import numpy as np
+
+from advanced_texture_renderer import AdvancedTextureRenderer
+from fog_of_war import FogOfWar
+from render_engine import RenderEngine, render_map_image
+
+
+WIDTH, HEIGHT, TILE_SIZE = 20, 16, 16
+
+
+def sample_map():
+    tiles = [["grass"] * WIDTH for _ in range(HEIGHT)]
+    for x, y, material in [(2, 3, "water"), (4, 11, "village"), (8, 1, "forest"),
+                           (5, 13, "village"), (3, 9, "village"), (12, 6, "water")]:
+        tiles[y][x] = material
+    return {"width": WIDTH, "height": HEIGHT, "tiles": tiles, "river_directions": {"12,6": "down"}}
+
+
+def test_render_view():
+    """Ausschnitt hat die richtige Größe, Nebel verdunkelt verborgene Tiles"""
+    fog = FogOfWar(WIDTH, HEIGHT)
+    fog.reveal_area(0, 0, 9, HEIGHT - 1)
+
+    image = render_map_image(sample_map(), fog, (0, 0, 20, 16), TILE_SIZE, fog_enabled=True)
+    assert image.size == (WIDTH * TILE_SIZE, HEIGHT * TILE_SIZE) and image.mode == 'RGB'
+
+    # Aufgedeckte Spalten unverändert, verborgene vom Nebel überdeckt
+    with_fog = np.asarray(image)
+    without_fog = np.asarray(render_map_image(sample_map(), None, (0, 0, 20, 16), TILE_SIZE))
+    assert (with_fog[:, :5 * TILE_SIZE] == without_fog[:, :5 * TILE_SIZE]).all()
+    assert (with_fog[:, -5 * TILE_SIZE:] != without_fog[:, -5 * TILE_SIZE:]).any(axis=2).mean() > 0.9
+    print("   ✓ Ausschnitt mit Nebel")
+
+
+def test_incremental_matches_full_frame():
+    """Animation + Fog-Änderungen per Dirty-Rects == kompletter Neuaufbau (alle Fog-Stile)"""
+    renderer = AdvancedTextureRenderer()
+    renderer.disk_cache.enabled = False
+    view = (5, 4, 14, 10)
+
+    for style in ("tiles", "soft"):
+        for fog_enabled in (True, False):
+            fog = FogOfWar(WIDTH, HEIGHT)
+            fog.revealed[3:12, 2:15] = True
+
+            engine = RenderEngine(renderer)
+            engine.set_map(sample_map())
+            engine.fog_style = style
+            engine.render(fog, view, TILE_SIZE, 7, fog_enabled)
+
+            for frame in (9, 10, 11):
+                fog.revealed[8:10, 6:9] = frame != 9
+                incremental = engine.render_array(fog, view, TILE_SIZE, frame, fog_enabled)
+
+            fresh = RenderEngine(renderer)
+            fresh.set_map(sample_map())
+            fresh.fog_style = style
+            assert (incremental == fresh.render_array(fog, view, TILE_SIZE, 11, fog_enabled)).all(), style
+
+    print("   ✓ Inkrementelle Frames == Vollaufbau")
+
+
+def test_static_fog_frame_stays_idle():
+    """Nebel an, nichts animiert: kein Frame-Upload, Schleife darf ruhen - Drift nur auf Wunsch und nur im Nebel"""
+    renderer = AdvancedTextureRenderer()
+    renderer.disk_cache.enabled = False
+    static_map = {"width": WIDTH, "height": HEIGHT, "river_directions": {},
+                  "tiles": [["grass" if x < 12 else "mountain" for x in range(WIDTH)] for _ in range(HEIGHT)]}
+    view = (0, 0, WIDTH, HEIGHT)
+    fog = FogOfWar(WIDTH, HEIGHT)
+    fog.revealed[:, :12] = True
+    hidden = fog.get_hidden_mask(*view)
+
+    engine = RenderEngine(renderer)
+    engine.set_map(static_map)
+    engine.render(fog, view, TILE_SIZE, 0, True, animate=False)
+    assert not engine.fog_drift and not engine.animation_needed(True)
+    for frame in (1, 2, 3):
+        assert engine.compose_next_frame(TILE_SIZE, frame, fog.revealed.copy(), hidden, False, True,
+                                         engine.fog_drifting(True)) == []
+
+    # Drift eingeschaltet: neu nur der Bereich mit Nebel, Ergebnis == Vollaufbau im selben Frame
+    engine.fog_drift = True
+    assert engine.animation_needed(True) and not engine.animation_needed(False)
+    updates = engine.compose_next_frame(TILE_SIZE, 40, fog.revealed.copy(), hidden, False, True,
+                                        engine.fog_drifting(True))
+    (image, box), = updates
+    assert box[0] > 8 * TILE_SIZE and box[2:] == (WIDTH * TILE_SIZE, HEIGHT * TILE_SIZE)
+
+    fresh = RenderEngine(renderer)
+    fresh.set_map(static_map)
+    fresh.fog_drift = True
+    expected = fresh.render_array(fog, view, TILE_SIZE, 40, True, animate=False)
+    assert (np.asarray(engine.frame_buffer) == expected).all()
+    assert (np.asarray(image) == expected[box[1]:box[3], box[0]:box[2]]).all()
+
+    # Nebel-Änderung: voller Frame als KOPIE (Render-Thread schreibt danach weiter in frame_buffer)
+    fog.revealed[:, 12:14] = True
+    (image, box), = engine.compose_next_frame(TILE_SIZE, 41, fog.revealed.copy(), fog.get_hidden_mask(*view),
+                                              False, True, engine.fog_drifting(True))
+    assert box == (0, 0, WIDTH * TILE_SIZE, HEIGHT * TILE_SIZE) and image is not engine.frame_buffer
+    assert (np.asarray(image) == np.asarray(engine.frame_buffer)).all()
+    print("   ✓ Statischer Nebel ohne Frame-Upload")
+
+
+def test_village_smoke_overlaps_view():
+    """Village unterhalb des Ausschnitts ragt mit dem Rauch hinein - wie im Vollbild"""
+    engine = RenderEngine()
+    engine.set_map(sample_map())
+    full = engine.render_array(None, None, TILE_SIZE, animate=False)
+    part = engine.render_array(None, (2, 5, 10, 10), TILE_SIZE, animate=False)
+    assert (part == full[5 * TILE_SIZE:10 * TILE_SIZE, 2 * TILE_SIZE:10 * TILE_SIZE]).all()
+    print("   ✓ Village-Overlap am Ausschnitt-Rand")
+
+
+if __name__ == "__main__":
+    print("=== Test: Render-Engine ===")
+    test_render_view()
+    test_incremental_matches_full_frame()
+    test_static_fog_frame_stays_idle()
+    test_village_smoke_overlaps_view()
+    print("\n✅ Alle Tests erfolgreich!")
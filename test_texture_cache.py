@@ -0,0 +1,166 @@
+"""
+Test-Script: Gemeinsamer LRU-Textur-Cache
+Prüft Byte-Budget, LRU-Verdrängung und Statistik-Zähler
+"""
+import os
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+from disk_texture_cache import DiskTextureStore
+from texture_cache import TextureCache, image_nbytes
+
+
+def _tile(size=64, mode='RGB'):
+    return Image.new(mode, (size, size))
+
+
+def test_byte_budget():
+    """Cache zählt echte Bild-Bytes und hält das Budget ein"""
+    assert image_nbytes(_tile(64)) == 64 * 64 * 3
+    assert image_nbytes(_tile(64, 'RGBA')) == 64 * 64 * 4
+
+    cache = TextureCache(budget_mb=1)
+    for i in range(200):
+        cache.put(i, _tile(64))
+
+    assert cache.current_bytes <= cache.budget_bytes
+    assert cache.evictions > 0
+    print(f"   ✓ {len(cache)} Einträge, {cache.current_bytes} Bytes, {cache.evictions} Verdrängungen")
+
+
+def test_lru_keeps_hot_entries():
+    """Häufig genutzte Tiles bleiben, selten genutzte werden verdrängt"""
+    tile_bytes = image_nbytes(_tile(64))
+    cache = TextureCache(budget_mb=tile_bytes * 3 / (1024 * 1024))
+
+    cache.put("grass_64", _tile(64))
+    cache.put("water_64_1_right", _tile(64))
+    cache.put("water_64_2_right", _tile(64))
+
+    # Gras ist heiß -> wird beim nächsten Einfügen NICHT verdrängt
+    assert cache.get("grass_64") is not None
+    cache.put("water_64_3_right", _tile(64))
+
+    assert cache.contains("grass_64")
+    assert not cache.contains("water_64_1_right")
+    print("   ✓ LRU behält heiße Tiles")
+
+
+def test_counters_and_namespaces():
+    """Treffer/Fehlschläge werden gezählt, Namensräume sind getrennt"""
+    cache = TextureCache(budget_mb=8)
+    advanced = cache.namespace("advanced")
+    legacy = cache.namespace("legacy")
+
+    advanced["grass_64"] = _tile(64)
+    assert legacy.get("grass_64") is None
+    assert advanced.get("grass_64") is not None
+    assert "grass_64" in advanced and "grass_64" not in legacy
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+    legacy["grass_64"] = _tile(32)
+    advanced.clear()
+    assert len(advanced) == 0 and len(legacy) == 1
+    print("   ✓ Zähler und Namensräume korrekt")
+
+
+def test_namespace_index_follows_evictions():
+    """keys()/len() eines Namensraums bleiben bei Einfügen, Verdrängen, del und clear korrekt"""
+    tile_bytes = image_nbytes(_tile(32))
+    cache = TextureCache(budget_mb=tile_bytes * 10 / (1024 * 1024))
+    cache.put(("fog", "vorher"), _tile(32))
+    fog = cache.namespace("fog")
+    advanced = cache.namespace("advanced")
+    assert fog.keys() == ["vorher"]
+
+    for i in range(12):
+        advanced[f"grass_{i}"] = _tile(32)
+        fog[f"fog_{i}"] = _tile(32)
+    del fog["fog_11"]
+
+    for view in (fog, advanced):
+        scanned = [key for namespace, key in cache.keys() if namespace == view.name]
+        assert sorted(view.keys()) == sorted(scanned) and len(view) == len(scanned)
+    assert len(fog) + len(advanced) == len(cache)
+
+    advanced.clear()
+    assert len(advanced) == 0 and len(fog) == len(cache)
+    cache.clear()
+    assert len(fog) == 0 and fog.keys() == []
+    print("   ✓ Namensraum-Index folgt Verdrängungen")
+
+
+def test_disk_store_roundtrip():
+    """Disk-Cache liefert identische Pixel und ist pro Generator-Version getrennt"""
+    with tempfile.TemporaryDirectory() as folder:
+        store = DiskTextureStore("v1", cache_folder=folder)
+        tile = Image.fromarray(np.random.default_rng(1).integers(0, 255, (32, 32, 3), dtype=np.uint8))
+
+        assert store.load("grass", 32, 0, "-") is None
+        assert store.save("grass", 32, 0, "-", tile)
+        store.save("water", 32, 0, "down-left", tile)
+
+        loaded = store.load("grass", 32, 0, "-")
+        assert (np.asarray(loaded) == np.asarray(tile)).all()
+        assert set(store.load_size(32)) == {("grass", "-"), ("water", "down-left")}
+
+        # Neue Generator-Version sieht die alten Einträge nicht
+        newer = DiskTextureStore("v2", cache_folder=folder)
+        assert newer.load("grass", 32, 0, "-") is None
+        newer.save("grass", 32, 0, "-", tile)
+        assert newer.purge_stale() == 1
+        assert not os.path.isdir(os.path.join(folder, "v1"))
+
+        assert newer.clear()
+        assert not os.path.isdir(folder)
+    print("   ✓ Disk-Cache Roundtrip und Versionierung")
+
+
+def test_disk_store_budget():
+    """Über dem Byte-Budget fliegen die am längsten nicht benutzten Einträge - load() zählt als Benutzung"""
+    with tempfile.TemporaryDirectory() as folder:
+        tile = Image.fromarray(np.zeros((32, 32, 3), dtype=np.uint8))
+        store = DiskTextureStore("v1", cache_folder=folder, budget_bytes=10 ** 9)
+        for frame in range(4):
+            store.save("water", 32, frame, "down", tile)
+        entry_bytes = store.usage // 4
+
+        # Alter festlegen: Frame 0 am ältesten, dann 1, 2, 3
+        for frame in range(4):
+            stamp = 1000000 + frame
+            os.utime(store._path("water", 32, frame, "down"), (stamp, stamp))
+        assert store.load("water", 32, 0, "down") is not None
+
+        store.budget_bytes = int(entry_bytes * 4.5)
+        store.save("water", 32, 4, "down", tile)
+        assert store.usage <= store.budget_bytes * 0.9
+        remaining = sorted(os.listdir(store.version_folder))
+        assert "water_32_0_down.npy" in remaining and "water_32_4_down.npy" in remaining
+        assert "water_32_1_down.npy" not in remaining and len(remaining) == 4
+        assert store.usage == store.folder_usage(store.version_folder)
+
+        # Ohne Ordner-Angabe: Umgebungsvariable (Tests schreiben nie nach ./texture_cache)
+        os.environ["RING_TEXTURE_CACHE"], previous = folder, os.environ.get("RING_TEXTURE_CACHE")
+        try:
+            assert DiskTextureStore("v1").version_folder == store.version_folder
+        finally:
+            if previous is None:
+                del os.environ["RING_TEXTURE_CACHE"]
+            else:
+                os.environ["RING_TEXTURE_CACHE"] = previous
+    print("   ✓ Disk-Cache Byte-Budget (LRU nach mtime)")
+
+
+if __name__ == "__main__":
+    print("=== Test: Textur-Cache ===")
+    test_byte_budget()
+    test_lru_keeps_hot_entries()
+    test_counters_and_namespaces()
+    test_namespace_index_follows_evictions()
+    test_disk_store_roundtrip()
+    test_disk_store_budget()
+    print("\n✅ Alle Tests erfolgreich!")
@@ -0,0 +1,58 @@
+"""
+Test-Script: Paralleles Vorwärmen des Textur-Caches
+Prüft die Auftrags-Sammlung und dass der Prozess-Pool pixelgleiche Texturen liefert
+"""
+import time
+
+import numpy as np
+
+from advanced_texture_renderer import AdvancedTextureRenderer
+from texture_prewarm import TexturePrewarmer, collect_texture_jobs, missing_texture_jobs
+from tile_grid import TileGrid
+
+
+def test_collect_distinct_jobs():
+    """Jede (Material, Größe, Richtung)-Kombination genau einmal, Richtung nur für Wasser"""
+    renderer = AdvancedTextureRenderer()
+    tiles = [["grass", "water", "water"],
+             ["forest", "water", "unknown"]]
+    directions = {"1,0": "down", "2,0": "down", "1,1": "up-left"}
+
+    grid = TileGrid.from_map_data({"width": 3, "height": 2, "tiles": tiles, "river_directions": directions})
+    jobs = collect_texture_jobs(renderer, grid, 32)
+    assert jobs == [("forest", 32, "right"), ("grass", 32, "right"),
+                    ("water", 32, "down"), ("water", 32, "up-left")]
+
+    renderer.texture_cache[renderer.texture_cache_key("grass", 32)] = renderer.render_grass(32, 0)
+    assert ("grass", 32, "right") not in missing_texture_jobs(renderer, jobs)
+    print("   ✓ Verschiedene Texturen korrekt gesammelt")
+
+
+def test_pool_fills_cache_with_identical_pixels():
+    """Im Prozess-Pool gerenderte Texturen landen pixelgleich im Speicher-Cache"""
+    renderer = AdvancedTextureRenderer()
+    renderer.texture_cache.clear()
+    jobs = [("grass", 24, "right"), ("village", 24, "right"), ("water", 24, "down-left"), ("snow", 24, "right")]
+
+    prewarmer = TexturePrewarmer(renderer, jobs, max_workers=2)
+    deadline = time.time() + 60
+    while not prewarmer.is_done():
+        assert time.time() < deadline, "Vorwärmen hängt"
+        done, total = prewarmer.poll()
+        assert 0 <= done <= total == len(jobs)
+        time.sleep(0.02)
+
+    assert prewarmer.completed == len(jobs) and prewarmer.failed == 0
+    for material, size, direction in jobs:
+        cached = renderer.texture_cache.get(renderer.texture_cache_key(material, size, 0, direction))
+        expected = renderer.generate_professional_texture(material, size, 0, direction)
+        assert cached.mode == expected.mode
+        assert (np.asarray(cached) == np.asarray(expected)).all(), material
+    print("   ✓ Prozess-Pool liefert identische Texturen")
+
+
+if __name__ == "__main__":
+    print("=== Test: Textur-Vorwärmen ===")
+    test_collect_distinct_jobs()
+    test_pool_fills_cache_with_identical_pixels()
+    print("\n✅ Alle Tests erfolgreich!")
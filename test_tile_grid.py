@@ -0,0 +1,127 @@
+"""
+Test-Script: Tile-Raster (TileGrid)
+Prüft Kodierung + Listen-Ansicht, vektorisierte Abfragen, Änderungs-Meldungen und die gemeinsame Nutzung in der Engine
+"""
+import os
+import random
+import shutil
+import tempfile
+
+import numpy as np
+
+from advanced_texture_renderer import AdvancedTextureRenderer
+from map_format import read_binary_map, write_binary_map
+from render_engine import RenderEngine
+from tile_grid import GRID_KEY, TileGrid
+
+
+def sample_map(width=20, height=12, seed=9):
+    rng = random.Random(seed)
+    tiles = [[rng.choice(["grass", "water", "forest", "mountain", "village"]) for _ in range(width)]
+             for _ in range(height)]
+    river_directions = {f"{x},{y}": "down" for y in range(height) for x in range(width) if tiles[y][x] == "water"}
+    return {"width": width, "height": height, "tiles": tiles, "river_directions": river_directions}
+
+
+def test_queries_match_lists():
+    """Histogramm, Positionen und animierte Tiles == Schleifen über die Listen"""
+    map_data = sample_map()
+    grid = TileGrid.from_map_data(map_data)
+    tiles = map_data["tiles"]
+    assert grid.materials.dtype == np.uint16 and grid.directions.dtype == np.uint8
+
+    histogram = {}
+    for row in tiles:
+        for material in row:
+            histogram[material] = histogram.get(material, 0) + 1
+    assert grid.histogram() == histogram
+
+    water = [(x, y) for y, row in enumerate(tiles) for x, material in enumerate(row) if material == "water"]
+    assert [tuple(p) for p in grid.positions("water").tolist()] == water
+    assert len(grid.positions("lava")) == 0
+    assert grid.mask({"water", "forest"}).sum() == histogram["water"] + histogram["forest"]
+
+    animated = [(x, y, m) for y, row in enumerate(tiles) for x, m in enumerate(row)
+                if m in ("water", "forest", "village")]
+    assert grid.animated_positions() == animated
+    assert grid.animated_positions({"custom_lava": {"frames": 4}}) == animated
+
+    x, y = water[0]
+    assert grid.get(x, y) == "water" and grid.direction(x, y) == "down"
+    print("   ✓ Abfragen == Listen")
+
+
+def test_changes_and_notifications():
+    """set()/set_direction() halten die Listen synchron und melden den geänderten Bereich"""
+    map_data = sample_map()
+    grid = TileGrid.from_map_data(map_data)
+    events = []
+    grid.subscribe(lambda g, region: events.append(region))
+
+    assert grid.set(3, 4, "custom_lava")  # neues Material: Palette wächst
+    assert not grid.set(3, 4, "custom_lava")  # unverändert: keine Meldung
+    assert grid.set_direction(3, 4, "up-left")
+    assert grid.set_direction(3, 4, None)
+    assert not grid.set(99, 0, "grass")
+    assert events == [(3, 4, 4, 5)] * 3 and grid.version == 3
+
+    assert map_data["tiles"][4][3] == "custom_lava" and "3,4" not in map_data["river_directions"]
+    assert grid.get(3, 4) == "custom_lava" and grid.histogram()["custom_lava"] == 1
+
+    # Mitgeführtes Raster wird wiederverwendet, ohne: neu kodiert
+    shared = grid.map_data()
+    assert TileGrid.of(shared) is grid
+    assert TileGrid.of(dict(map_data, tiles=[list(row) for row in map_data["tiles"]])) is not grid
+    print("   ✓ Änderungen und Meldungen")
+
+
+def test_engine_follows_grid():
+    """Editor ändert das Raster - Engine rendert nur betroffene Chunks, Ergebnis == neu aufgebaute Karte"""
+    renderer = AdvancedTextureRenderer()
+    renderer.disk_cache.enabled = False
+    map_data = sample_map(40, 36)
+    grid = TileGrid.from_map_data(map_data)
+    view, tile_size = (0, 0, 40, 36), 16
+
+    engine = RenderEngine(renderer)
+    engine.set_map(grid.map_data())
+    engine.render_array(None, view, tile_size, animate=False)
+
+    grid.set(2, 2, "water")
+    grid.set_direction(2, 2, "up")
+    grid.set(35, 30, "snow")
+    engine.set_map(grid.map_data())
+    rendered, total = engine.build_static_view(view, tile_size)
+    assert 0 < rendered < total
+    assert engine.build_static_view(view, tile_size)[0] == 0  # Version unverändert: kein Vergleich, nichts neu
+
+    fresh = RenderEngine(renderer)
+    fresh.set_map({key: value for key, value in map_data.items() if key != GRID_KEY})
+    assert np.array_equal(engine.render_array(None, view, tile_size, animate=False),
+                          fresh.render_array(None, view, tile_size, animate=False))
+    assert engine.animated_positions == fresh.animated_positions
+
+    # Mitgeführtes Raster wird nicht gespeichert, beim Laden aber direkt aus den Arrays gebaut
+    folder = tempfile.mkdtemp()
+    try:
+        path = write_binary_map(grid.map_data(), os.path.join(folder, "karte.ringmap"))
+        loaded = read_binary_map(path)
+        assert loaded["tiles"] == map_data["tiles"]
+        assert loaded["river_directions"] == map_data["river_directions"]
+        loaded_grid = loaded[GRID_KEY]
+        assert TileGrid.of(loaded) is loaded_grid and loaded_grid.tiles is loaded["tiles"]
+        assert loaded_grid.histogram() == grid.histogram()
+        assert loaded_grid.animated_positions() == grid.animated_positions()
+        assert loaded_grid.direction(2, 2) == "up" and loaded_grid.materials.flags.writeable
+        assert loaded_grid.set(0, 0, "snow") and loaded["tiles"][0][0] == "snow"
+    finally:
+        shutil.rmtree(folder)
+    print("   ✓ Engine folgt dem Raster")
+
+
+if __name__ == "__main__":
+    print("=== Test: Tile-Raster ===")
+    test_queries_match_lists()
+    test_changes_and_notifications()
+    test_engine_follows_grid()
+    print("\n✅ Alle Tests erfolgreich!")
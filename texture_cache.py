@@ -0,0 +1,216 @@
+"""
+Gemeinsamer Textur-Cache für "Der Eine Ring"
+LRU-Verdrängung mit Speicher-Budget in Megabyte (zählt echte Bild-Bytes)
+Wird von AdvancedTextureRenderer, TextureManager, FogTextureGenerator und Projektor geteilt
+"""
+import threading
+from collections import OrderedDict
+
+
+# Standard-Budget für den gemeinsamen Cache
+DEFAULT_BUDGET_MB = 256
+
+
+def image_nbytes(image):
+    """Speicherbedarf eines PIL Images in Bytes (Breite × Höhe × Kanäle)"""
+    if image is None:
+        return 0
+    width, height = image.size
+    return width * height * len(image.getbands())
+
+
+class TextureCache:
+    """
+    LRU-Cache für PIL Images mit Byte-Budget
+    Zählt Treffer, Fehlschläge und Verdrängungen
+    """
+
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB):
+        self._entries = OrderedDict()  # key -> (image, nbytes), älteste zuerst
+        self._namespaces = {}  # Name -> {Key: None} der Einträge (name, key) - keys()/len() ohne Durchlauf
+        self._lock = threading.RLock()
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.current_bytes = 0
+
+        # Statistik
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Holt ein Image und markiert es als zuletzt benutzt"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, image):
+        """Legt ein Image ab und verdrängt bei Bedarf die am längsten unbenutzten Einträge"""
+        nbytes = image_nbytes(image)
+
+        with self._lock:
+            self.remove(key)
+
+            # Größer als das gesamte Budget: gar nicht erst cachen
+            if nbytes > self.budget_bytes:
+                return image
+
+            self._entries[key] = (image, nbytes)
+            self.current_bytes += nbytes
+            namespace = self._namespace_of(key)
+            if namespace is not None:
+                namespace[key[1]] = None
+            self._evict()
+
+        return image
+
+    def remove(self, key):
+        """Entfernt einen Eintrag (ohne als Verdrängung zu zählen)"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.current_bytes -= entry[1]
+                self._forget(key)
+            return entry is not None
+
+    def contains(self, key):
+        """Prüft ob ein Key vorhanden ist (ohne Statistik und LRU-Update)"""
+        with self._lock:
+            return key in self._entries
+
+    def keys(self):
+        """Snapshot aller Keys (älteste zuerst)"""
+        with self._lock:
+            return list(self._entries.keys())
+
+    def clear(self):
+        """Leert den kompletten Cache"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            for namespace in self._namespaces.values():
+                namespace.clear()
+
+    def set_budget_mb(self, budget_mb):
+        """Ändert das Speicher-Budget und verdrängt sofort falls nötig"""
+        with self._lock:
+            self.budget_bytes = int(budget_mb * 1024 * 1024)
+            self._evict()
+
+    def _evict(self):
+        """Verdrängt LRU-Einträge bis das Budget eingehalten ist"""
+        while self.current_bytes > self.budget_bytes and self._entries:
+            key, (_, nbytes) = self._entries.popitem(last=False)
+            self.current_bytes -= nbytes
+            self.evictions += 1
+            self._forget(key)
+
+    def _namespace_of(self, key):
+        """Key-Verzeichnis des Namensraums eines Keys (name, key) - None bei anderen Keys"""
+        if isinstance(key, tuple) and len(key) == 2:
+            return self._namespaces.get(key[0])
+        return None
+
+    def _forget(self, key):
+        namespace = self._namespace_of(key)
+        if namespace is not None:
+            namespace.pop(key[1], None)
+
+    def stats(self):
+        """Statistik als Dict (für Debug-Ausgaben und GM-Panel)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def reset_stats(self):
+        """Setzt die Zähler zurück"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def namespace(self, name):
+        """Dict-ähnliche Sicht auf einen eigenen Key-Bereich dieses Caches"""
+        with self._lock:
+            if name not in self._namespaces:
+                # Einmalig: schon vorhandene Einträge dieses Namens übernehmen
+                self._namespaces[name] = {key[1]: None for key in self._entries
+                                          if isinstance(key, tuple) and len(key) == 2 and key[0] == name}
+        return TextureCacheView(self, name)
+
+    def namespace_keys(self, name):
+        """Snapshot der Keys eines Namensraums (Einfüge-Reihenfolge)"""
+        with self._lock:
+            return list(self._namespaces.get(name, ()))
+
+    def namespace_size(self, name):
+        with self._lock:
+            return len(self._namespaces.get(name, ()))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class TextureCacheView:
+    """
+    Namensraum im gemeinsamen TextureCache
+    Verhält sich wie ein dict, damit bestehender Code (in, [], del, keys, clear) weiter funktioniert
+    """
+
+    def __init__(self, cache, name):
+        self.cache = cache
+        self.name = name
+
+    def get(self, key, default=None):
+        return self.cache.get((self.name, key), default)
+
+    def put(self, key, image):
+        return self.cache.put((self.name, key), image)
+
+    def keys(self):
+        return self.cache.namespace_keys(self.name)
+
+    def clear(self):
+        """Leert nur diesen Namensraum"""
+        for key in self.keys():
+            self.cache.remove((self.name, key))
+
+    def stats(self):
+        return self.cache.stats()
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, image):
+        self.put(key, image)
+
+    def __delitem__(self, key):
+        if not self.cache.remove((self.name, key)):
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return self.cache.contains((self.name, key))
+
+    def __len__(self):
+        return self.cache.namespace_size(self.name)
+
+
+# Gemeinsame Instanz für alle Textur-Quellen
+shared_texture_cache = TextureCache()
@@ -8,6 +8,8 @@ from PIL import Image, ImageDraw, ImageFilter
 import random
 import math
 
+from texture_cache import shared_texture_cache
+
 # Import für Kompatibilität mit neuem System
 try:
     from advanced_texture_renderer import AdvancedTextureRenderer
@@ -19,7 +21,7 @@ class TextureManager:
     """Verwaltet und generiert Texturen für verschiedene Terrain-Typen"""
     
     def __init__(self):
-        self.texture_cache = {}
+        self.texture_cache = shared_texture_cache.namespace("legacy")
         
         # Nutze Advanced Renderer wenn verfügbar
         if _advanced_renderer:
@@ -64,10 +66,12 @@ class TextureManager:
         # Fallback: Alte Methode
         cache_key = f"{terrain_type}_{size}"
         
-        if cache_key not in self.texture_cache:
-            self.texture_cache[cache_key] = self.generate_texture(terrain_type, size)
+        texture = self.texture_cache.get(cache_key)
+        if texture is None:
+            texture = self.generate_texture(terrain_type, size)
+            self.texture_cache[cache_key] = texture
         
-        return self.texture_cache[cache_key]
+        return texture
     
     def generate_texture(self, terrain_type, size=64):
         """Generiert eine neue Textur für einen Terrain-Typ"""
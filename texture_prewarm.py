@@ -0,0 +1,115 @@
+"""
+Paralleles Vorwärmen des Textur-Caches für "Der Eine Ring"
+Sammelt die verschiedenen (Material, Größe, Richtung) einer Karte und rendert sie
+in einem Prozess-Pool auf allen Kernen - der Tk-Thread pollt nur noch das Ergebnis
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+
+# Unter so vielen fehlenden Texturen lohnt sich der Pool-Start nicht
+PREWARM_MIN_JOBS = 4
+
+# Renderer pro Worker-Prozess (einmal im Initializer erzeugt)
+_worker_renderer = None
+
+
+def collect_texture_jobs(renderer, grid, tile_size):
+    """
+    Alle verschiedenen statischen Texturen (Frame 0) einer Karte (TileGrid): [(material, size, direction)]
+    Nur prozedurale Basis-Materialien - importierte und Custom-Materialien sind billig
+    Über Palette + Histogramm statt über alle Tiles - Richtungen nur für Wasser
+    """
+    jobs = set()
+    for material in grid.histogram():
+        if material not in renderer.base_materials or material in renderer.custom_textures:
+            continue
+        if renderer.base_materials[material].get("texture_path"):
+            continue
+        if material != "water":
+            jobs.add((material, tile_size, "right"))
+            continue
+        codes = np.unique(grid.directions[grid.materials == grid.index[material]])
+        for code in codes.tolist():
+            direction = grid.direction_palette[code - 1] if code else "right"
+            jobs.add((material, tile_size, direction))
+    return sorted(jobs)
+
+
+def missing_texture_jobs(renderer, jobs):
+    """Nur Texturen, die noch nicht im Speicher-Cache liegen"""
+    return [job for job in jobs
+            if renderer.texture_cache_key(job[0], job[1], 0, job[2]) not in renderer.texture_cache]
+
+
+def _init_worker():
+    global _worker_renderer
+    from advanced_texture_renderer import AdvancedTextureRenderer
+    _worker_renderer = AdvancedTextureRenderer()
+
+
+def _render_job(job):
+    """Läuft im Worker: rendert (über den Disk-Cache) und schickt nur den Pixel-Puffer zurück"""
+    material, size, direction = job
+    texture = _worker_renderer.render_texture(material, size, 0, direction)
+    return job, texture.mode, texture.size, texture.tobytes()
+
+
+class TexturePrewarmer:
+    """
+    Rendert fehlende Texturen im Hintergrund-Pool
+    poll() aus dem UI-Thread übernimmt fertige Ergebnisse in den Cache und liefert den Fortschritt
+    """
+
+    def __init__(self, renderer, jobs, max_workers=None):
+        self.renderer = renderer
+        self.total = len(jobs)
+        self.completed = 0
+        self.failed = 0
+
+        # spawn: gleiches Verhalten unter Windows und Linux, kein fork() eines Tk-Prozesses mit Threads
+        self.executor = ProcessPoolExecutor(
+            max_workers=min(max_workers or os.cpu_count() or 1, max(1, self.total)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+        self.futures = [self.executor.submit(_render_job, job) for job in jobs]
+
+    def poll(self):
+        """Übernimmt fertige Texturen in den Cache - gibt (fertig, gesamt) zurück, blockiert nie"""
+        pending = []
+        for future in self.futures:
+            if not future.done():
+                pending.append(future)
+                continue
+
+            try:
+                (material, size, direction), mode, image_size, pixels = future.result()
+            except Exception as e:
+                # Fehlende Texturen werden später einfach im UI-Thread gerendert
+                print(f"Textur-Vorwärmen fehlgeschlagen: {e}")
+                self.failed += 1
+                continue
+
+            cache_key = self.renderer.texture_cache_key(material, size, 0, direction)
+            self.renderer.texture_cache[cache_key] = Image.frombytes(mode, image_size, pixels)
+            self.completed += 1
+
+        self.futures = pending
+        if not pending:
+            self.shutdown()
+        return self.completed + self.failed, self.total
+
+    def is_done(self):
+        return not self.futures
+
+    def shutdown(self):
+        """Pool beenden - offene Aufträge werden verworfen"""
+        for future in self.futures:
+            future.cancel()
+        self.futures = []
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,267 @@
+"""
+Tile-Raster für "Der Eine Ring"
+Eine Karte als NumPy-Arrays: uint16-Material-Indizes + uint8-Fluss-Richtungen, je mit Palette
+Gemeinsames Modell für Editor, Projektor/Render-Engine und GM-Panel - Abfragen (Positionen, Histogramm,
+animierte Tiles) laufen vektorisiert statt über verschachtelte Listen
+
+Die Listen in map_data["tiles"] / map_data["river_directions"] bleiben als dekodierte Ansicht erhalten
+(Dateiformate, Tk-Zeichencode) - TileGrid.set() hält beide synchron. Änderungen also IMMER über das Raster
+"""
+import numpy as np
+
+from map_format import DEFAULT_MATERIAL, GRID_KEY, encode_directions, encode_tiles
+
+
+# Materialien mit Animations-Frames
+ANIMATED_MATERIALS = frozenset({'water', 'forest', 'snow', 'animated_forest', 'animated_grass', 'village'})
+
+
+def is_animated_material(material, custom_materials=None):
+    """Animiert: feste Liste oder Custom-Material mit mehreren Frames"""
+    if material in ANIMATED_MATERIALS:
+        return True
+    if material.startswith('custom_') and custom_materials:
+        custom_info = custom_materials.get(material)
+        return bool(custom_info and custom_info.get('frames', 0) > 1)
+    return False
+
+
+def palette_lut(old_palette, new_index, missing):
+    """Alte Palette -> Indizes einer anderen (fehlende Einträge: missing) - zum Vergleichen zweier Raster"""
+    return np.array([new_index.get(entry, missing) for entry in old_palette] or [missing], dtype=np.int64)
+
+
+class TileGrid:
+    """
+    Karte als Arrays
+    materials[y, x]: Index in palette, directions[y, x]: 0 = keine Richtung, sonst Index+1 in direction_palette
+    version zählt jede Änderung, subscribe() meldet sie als Bereich (x0, y0, x1, y1) - Ende exklusiv
+    """
+
+    def __init__(self, width, height, palette=None, materials=None, direction_palette=None, directions=None):
+        self.width = width
+        self.height = height
+        self.palette = list(palette) if palette else [DEFAULT_MATERIAL]
+        self.index = {material: i for i, material in enumerate(self.palette)}
+        self.materials = materials.astype(np.uint16) if materials is not None else \
+            np.zeros((height, width), dtype=np.uint16)
+        self.direction_palette = list(direction_palette or [])
+        self.direction_index = {direction: i + 1 for i, direction in enumerate(self.direction_palette)}
+        # Mehr als 255 verschiedene Richtungen gibt es praktisch nicht - dann eben uint16
+        self.directions = directions if directions is not None else np.zeros((height, width), dtype=np.uint8)
+
+        # Dekodierte Ansicht (gleiche Objekte wie in map_data) - None bei Rastern ohne map_data
+        self.tiles = None
+        self.river_directions = None
+        self.encoded_rows = height  # Streaming: Zeilen ab hier sind im Array noch nicht gesetzt
+
+        self.version = 0
+        self.listeners = []
+
+    @classmethod
+    def from_map_data(cls, map_data, loaded_rows=None):
+        """
+        Raster aus map_data (Listen werden einmal kodiert und als Ansicht mitgeführt)
+        loaded_rows: Karte wird noch gestreamt - Zeilen ab hier kodiert erst load_rows()
+        """
+        width = map_data.get("width", 50)
+        height = map_data.get("height", 50)
+        tiles = map_data.get("tiles") or [[DEFAULT_MATERIAL] * width for _ in range(height)]
+        river_directions = map_data.get("river_directions", {})
+
+        palette, materials = encode_tiles(tiles, width, height)
+        direction_palette, directions, _ = encode_directions(river_directions, width, height)
+        grid = cls(width, height, palette, materials, direction_palette, directions)
+        grid.tiles = tiles
+        grid.river_directions = river_directions
+        if loaded_rows is not None:
+            grid.encoded_rows = min(loaded_rows, height)
+        return grid
+
+    @classmethod
+    def from_arrays(cls, palette, materials, direction_palette, directions, tiles, river_directions):
+        """
+        Raster direkt aus den Arrays einer .ringmap (gleiche Kodierung wie in der Datei) - ohne Umweg
+        über die Listen; tiles/river_directions sind nur noch die dekodierte Ansicht dazu
+        """
+        height, width = materials.shape
+        # Kopien: Datei-Arrays sind read-only (mmap / frombuffer), das Raster wird bearbeitet
+        grid = cls(width, height, palette, np.array(materials, dtype=np.uint16),
+                   direction_palette, np.array(directions))
+        grid.tiles = tiles
+        grid.river_directions = river_directions
+        return grid
+
+    @classmethod
+    def of(cls, map_data, loaded_rows=None):
+        """Das mitgeführte Raster (Editor, geladene .ringmap, Stream) - sonst ein neues aus den Listen"""
+        grid = map_data.get(GRID_KEY)
+        if grid is not None and grid.tiles is map_data.get("tiles"):
+            return grid
+        return cls.from_map_data(map_data, loaded_rows)
+
+    def map_data(self):
+        """map_data-Dict (Listen + Raster) für Projektor, Speichern usw."""
+        return {
+            "width": self.width,
+            "height": self.height,
+            "tiles": self.tiles,
+            "river_directions": self.river_directions,
+            GRID_KEY: self
+        }
+
+    def material_id(self, material):
+        """Palettenindex - neue Materialien werden angehängt"""
+        index = self.index.get(material)
+        if index is None:
+            index = len(self.palette)
+            if index > np.iinfo(np.uint16).max:
+                raise ValueError("Zu viele Materialien für ein Raster")
+            self.palette.append(material)
+            self.index[material] = index
+        return index
+
+    def direction_id(self, direction):
+        if direction is None:
+            return 0
+        index = self.direction_index.get(direction)
+        if index is None:
+            index = len(self.direction_palette) + 1
+            if index > np.iinfo(self.directions.dtype).max:
+                self.directions = self.directions.astype(np.uint16)
+            self.direction_palette.append(direction)
+            self.direction_index[direction] = index
+        return index
+
+    # ---- Einzel-Tiles ----
+
+    def get(self, x, y):
+        return self.palette[self.materials[y, x]]
+
+    def direction(self, x, y):
+        """Fluss-Richtung oder None"""
+        value = self.directions[y, x]
+        return self.direction_palette[value - 1] if value else None
+
+    def set(self, x, y, material):
+        """Material setzen - True wenn sich etwas geändert hat"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        index = self.material_id(material)
+        if self.materials[y, x] == index:
+            return False
+        self.materials[y, x] = index
+        if self.tiles is not None:
+            self.tiles[y][x] = material
+        self.changed((x, y, x + 1, y + 1))
+        return True
+
+    def set_direction(self, x, y, direction):
+        """Fluss-Richtung setzen (None = entfernen) - True wenn sich etwas geändert hat"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        index = self.direction_id(direction)
+        if self.directions[y, x] == index:
+            return False
+        self.directions[y, x] = index
+        if self.river_directions is not None:
+            if direction is None:
+                self.river_directions.pop(f"{x},{y}", None)
+            else:
+                self.river_directions[f"{x},{y}"] = direction
+        self.changed((x, y, x + 1, y + 1))
+        return True
+
+    # ---- Streaming (map_stream.py) ----
+    # Der Lade-Thread füllt die Arrays (store_rows/encode_rows, ohne Meldung),
+    # der Tk-Thread übernimmt sie per load_rows()/loading_finished() und meldet die Änderung
+
+    def store_rows(self, y0, indices):
+        """Lade-Thread: Index-Block einer .ringmap (Palette = Datei-Palette des Rasters) übernehmen"""
+        y1 = y0 + len(indices)
+        self.materials[y0:y1] = indices
+        self.encoded_rows = max(self.encoded_rows, y1)
+
+    def encode_rows(self, y0, y1):
+        """Zeilen y0..y1 aus der Listen-Ansicht kodieren (JSON-Streaming) - ohne Meldung"""
+        y1 = min(y1, self.height)
+        if y1 <= y0 or self.tiles is None:
+            return
+        palette, block = encode_tiles(self.tiles[y0:y1], self.width, y1 - y0)
+        lut = np.array([self.material_id(material) for material in palette], dtype=np.uint16)
+        self.materials[y0:y1] = lut[block]
+        self.encoded_rows = max(self.encoded_rows, y1)
+
+    def load_rows(self, y0, y1):
+        """Tk-Thread: Zeilen y0..y1 sind nachgeladen - noch nicht kodierte übernehmen, Änderung melden"""
+        y1 = min(y1, self.height)
+        if y1 <= y0:
+            return
+        if self.encoded_rows < y1:
+            self.encode_rows(max(y0, self.encoded_rows), y1)
+        self.changed((0, y0, self.width, y1))
+
+    def loading_finished(self):
+        """Tk-Thread: Streaming fertig (bei JSON stehen erst jetzt die Richtungen fest) - alles melden"""
+        self.changed((0, 0, self.width, self.height))
+
+    def load_directions(self):
+        """Richtungen neu aus der Listen-Ansicht (JSON-Streaming: erst am Ende bekannt)"""
+        if self.river_directions is None:
+            return
+        palette, directions, _ = encode_directions(self.river_directions, self.width, self.height)
+        self.direction_palette = palette
+        self.direction_index = {direction: i + 1 for i, direction in enumerate(palette)}
+        self.directions = directions
+
+    # ---- Änderungs-Meldungen ----
+
+    def subscribe(self, callback):
+        """callback(grid, (x0, y0, x1, y1)) nach jeder Änderung"""
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def changed(self, region):
+        self.version += 1
+        for callback in list(self.listeners):
+            callback(self, region)
+
+    # ---- Vektorisierte Abfragen ----
+
+    def mask(self, materials):
+        """Bool-Array: Tiles aus einer Menge von Materialien"""
+        lut = np.array([material in materials for material in self.palette], dtype=bool)
+        return lut[self.materials]
+
+    def positions(self, material):
+        """Alle Tiles eines Materials als Array [[x, y], ...] (zeilenweise)"""
+        index = self.index.get(material)
+        if index is None:
+            return np.empty((0, 2), dtype=np.int64)
+        ys, xs = np.nonzero(self.materials == index)
+        return np.column_stack((xs, ys))
+
+    def histogram(self):
+        """{material: Anzahl} - nur vorkommende Materialien"""
+        counts = np.bincount(self.materials.ravel(), minlength=len(self.palette))
+        return {material: int(count) for material, count in zip(self.palette, counts.tolist()) if count}
+
+    def animated_mask(self, custom_materials=None):
+        lut = np.array([is_animated_material(material, custom_materials) for material in self.palette],
+                       dtype=bool)
+        return lut[self.materials]
+
+    def animated_positions(self, custom_materials=None, y0=0, y1=None):
+        """Animierte Tiles als [(x, y, material)] (zeilenweise) - optional nur die Zeilen y0..y1"""
+        lut = np.array([is_animated_material(material, custom_materials) for material in self.palette],
+                       dtype=bool)
+        if not lut.any():
+            return []
+        ys, xs = np.nonzero(lut[self.materials[y0:y1]])
+        palette = self.palette
+        values = self.materials[ys + y0, xs].tolist()
+        return [(x, y, palette[value]) for x, y, value in zip(xs.tolist(), (ys + y0).tolist(), values)]